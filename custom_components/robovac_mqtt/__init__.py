@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
 import logging
 import random
 import string
@@ -14,6 +17,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_when_setup
 
@@ -26,6 +30,13 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import EufyCleanCoordinator
+from .entity import signal_coordinator_added
+from .login_cache import (
+    async_load_login_cache,
+    async_remove_login_cache,
+    async_save_login_cache,
+    login_cache_usable,
+)
 
 PLATFORMS: list[Platform] = [
     Platform.VACUUM,
@@ -45,6 +56,14 @@ _FRONTEND_DIR = Path(__file__).parent / "frontend"
 # `zone-clean-card` alias, so older dashboards keep working after the rename.
 _CARD_FILENAME = "eufy-clean-card.js"
 _CARD_URL_PATH = f"/{DOMAIN}/{_CARD_FILENAME}"
+# Retry interval for revalidating a warm-start login while the cloud is down.
+_REVALIDATE_RETRY = 600
+# Devices are initialized concurrently, this many at a time, each bounded by
+# _INIT_TIMEOUT seconds; failures retry in the background with backoff.
+_INIT_CONCURRENCY = 4
+_INIT_TIMEOUT = 45
+_INIT_RETRY_MIN = 30
+_INIT_RETRY_MAX = 600
 
 
 async def _async_register_frontend_card(hass: HomeAssistant) -> None:
@@ -112,22 +131,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
 
-    # Generate OpenUDID (consistent per session)
-    openudid = "".join(random.choices(string.hexdigits, k=32))
+    # A warm-start cache from the last successful login lets setup skip the
+    # cloud round trips; it is revalidated in the background. An unusable one
+    # still says which login strategy and Tuya region won for this account.
+    cached = await async_load_login_cache(hass, entry)
+    cache = cached if cached is not None and login_cache_usable(cached) else None
+
+    # Generate OpenUDID (consistent per session; the cached one with the cache)
+    openudid = (cache or {}).get("openudid") or "".join(
+        random.choices(string.hexdigits, k=32)
+    )
 
     # Initialize Login Controller
     session = async_get_clientsession(hass)
     eufy_login = EufyLogin(username, password, openudid, websession=session)
-    try:
-        await eufy_login.init()
-    except EufyLoginError as e:
-        raise ConfigEntryAuthFailed(f"Invalid Eufy credentials: {e}") from e
-    except (aiohttp.ClientError, TimeoutError, OSError) as e:
-        raise ConfigEntryNotReady(f"Cannot reach Eufy servers: {e}") from e
-    except Exception as e:
-        raise ConfigEntryNotReady(f"Unexpected setup error: {e}") from e
+    if cache is not None:
+        eufy_login.restore_state(cache)
+        eufy_login.login_state = "cached"
+        _LOGGER.debug("Starting from cached login and device list; revalidating")
+        entry.async_create_background_task(
+            hass,
+            _async_revalidate_login(hass, entry, eufy_login),
+            f"{DOMAIN}_revalidate_login_{entry.entry_id}",
+        )
+    else:
+        if cached is not None:
+            eufy_login.apply_preferences(cached)
+        try:
+            await eufy_login.init()
+        except EufyLoginError as e:
+            await async_remove_login_cache(hass, entry)
+            raise ConfigEntryAuthFailed(f"Invalid Eufy credentials: {e}") from e
+        except (aiohttp.ClientError, TimeoutError, OSError) as e:
+            raise ConfigEntryNotReady(f"Cannot reach Eufy servers: {e}") from e
+        except Exception as e:
+            raise ConfigEntryNotReady(f"Unexpected setup error: {e}") from e
+        await async_save_login_cache(hass, entry, eufy_login.export_state())
 
     coordinators = []
+    pending: list[tuple[str, functools.partial[EufyCleanCoordinator]]] = []
 
     # Get Devices and create coordinators
     # eufy_login.mqtt_devices populated by init/getDevices
@@ -194,35 +236,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             device_id,
         )
 
-        coordinator = EufyCleanCoordinator(hass, eufy_login, device_info, config_entry=entry)
-        try:
-            await coordinator.initialize()
+        pending.append(
+            (
+                device_id,
+                functools.partial(
+                    EufyCleanCoordinator, hass, eufy_login, device_info, config_entry=entry
+                ),
+            )
+        )
 
-            # Migrate segments from config entry data to per-device Store.
-            # Only migrate if the store is empty and we have a single device
-            # to avoid overwriting newer data or assigning to wrong device.
-            if last_seen := entry.data.get("last_seen_segments"):
-                if is_multi_device:
-                    _LOGGER.info(
-                        "Skipping migration of last seen segments for %s due to multi-device setup",
-                        device_id,
-                    )
-                elif not coordinator.last_seen_segments:
-                    await coordinator.async_save_segments(last_seen)
-                    _LOGGER.info(
-                        "Migrated last seen segments for %s to persistent storage",
-                        device_id,
-                    )
+    # One slow or unreachable dock must not hold up the other robots: connect
+    # them concurrently, each with its own timeout.
+    semaphore = asyncio.Semaphore(_INIT_CONCURRENCY)
+    candidates = [make() for _, make in pending]
+    results = await asyncio.gather(
+        *(_async_init_coordinator(c, semaphore) for c in candidates),
+        return_exceptions=True,
+    )
+    retrying: list[tuple[str, functools.partial[EufyCleanCoordinator]]] = []
+    for (device_id, make), coordinator, result in zip(pending, candidates, results):
+        if isinstance(result, BaseException):
+            _LOGGER.warning(
+                "Failed to initialize coordinator for %s: %s",
+                device_id,
+                result or type(result).__name__,
+            )
+            await _async_discard_coordinator(coordinator)
+            retrying.append((device_id, make))
+            continue
 
-            coordinators.append(coordinator)
-        except Exception as e:
-            _LOGGER.warning("Failed to initialize coordinator for %s: %s", device_id, e)
+        # Migrate segments from config entry data to per-device Store.
+        # Only migrate if the store is empty and we have a single device
+        # to avoid overwriting newer data or assigning to wrong device.
+        if last_seen := entry.data.get("last_seen_segments"):
+            if is_multi_device:
+                _LOGGER.info(
+                    "Skipping migration of last seen segments for %s due to multi-device setup",
+                    device_id,
+                )
+            elif not coordinator.last_seen_segments:
+                await coordinator.async_save_segments(last_seen)
+                _LOGGER.info(
+                    "Migrated last seen segments for %s to persistent storage",
+                    device_id,
+                )
+
+        coordinators.append(coordinator)
 
     if not coordinators:
         raise ConfigEntryNotReady("No Eufy Clean devices could be initialized")
 
     # Check for orphaned devices and log warnings
     current_device_ids = {c.device_id for c in coordinators}
+    current_device_ids.update(device_id for device_id, _ in retrying)
     device_registry = dr.async_get(hass)
     registry_devices = dr.async_entries_for_config_entry(
         device_registry, entry.entry_id
@@ -243,7 +309,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {"coordinators": coordinators}
+    hass.data[DOMAIN][entry.entry_id] = {
+        "coordinators": coordinators,
+        "login": eufy_login,
+    }
 
     # Clean up migrated data from config entry (skip for multi-device to avoid
     # deleting data that was intentionally not migrated)
@@ -261,9 +330,118 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Started once the platforms are listening for late coordinators.
+    for device_id, make in retrying:
+        entry.async_create_background_task(
+            hass,
+            _async_retry_device(hass, entry, device_id, make),
+            f"{DOMAIN}_retry_{device_id}",
+        )
+
     return True
 
 
+async def _async_init_coordinator(
+    coordinator: EufyCleanCoordinator, semaphore: asyncio.Semaphore
+) -> None:
+    """``coordinator.initialize()`` within the concurrency bound and timeout."""
+    async with semaphore, asyncio.timeout(_INIT_TIMEOUT):
+        await coordinator.initialize()
+
+
+async def _async_discard_coordinator(coordinator: EufyCleanCoordinator) -> None:
+    """Tear down a coordinator whose initialization failed or timed out.
+
+    Its pending storage writes are flushed now rather than left armed, so they
+    cannot land on top of a later coordinator for the same device.
+    """
+    coordinator.async_shutdown_timers()
+    with contextlib.suppress(Exception):
+        await coordinator.async_flush_storage()
+    if coordinator.client:
+        with contextlib.suppress(Exception):
+            await coordinator.client.disconnect()
+
+
+async def _async_retry_device(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_id: str,
+    make: functools.partial[EufyCleanCoordinator],
+) -> None:
+    """Keep trying a device that failed setup; add it to the entry once it answers.
+
+    The coordinator that answered joins the running entry and each platform
+    adds its entities (see ``async_add_coordinator_entities``), so the devices
+    that are already running are left alone.
+    """
+    delay = _INIT_RETRY_MIN
+    while True:
+        await asyncio.sleep(delay)
+        coordinator = make()
+        try:
+            await _async_init_coordinator(coordinator, asyncio.Semaphore(1))
+        except asyncio.CancelledError:
+            await _async_discard_coordinator(coordinator)
+            raise
+        except Exception as e:  # noqa: BLE001 - retried with backoff
+            await _async_discard_coordinator(coordinator)
+            delay = min(delay * 2, _INIT_RETRY_MAX)
+            _LOGGER.debug("Device %s still unavailable (%s); retry in %d s", device_id, e, delay)
+            continue
+        _LOGGER.info("Device %s is reachable again; adding it", device_id)
+        hass.data[DOMAIN][entry.entry_id]["coordinators"].append(coordinator)
+        async_dispatcher_send(hass, signal_coordinator_added(entry.entry_id), coordinator)
+        return
+
+
+async def _async_revalidate_login(
+    hass: HomeAssistant, entry: ConfigEntry, eufy_login: EufyLogin
+) -> None:
+    """Log in afresh behind a warm start and refresh the cache.
+
+    Bad credentials drop the cache and start reauth. While the cloud is
+    unreachable the entry keeps running on the cached MQTT certificate
+    (``login_state`` "degraded") and retries every ``_REVALIDATE_RETRY``
+    seconds. A changed device list reloads the entry to pick it up.
+    """
+    while True:
+        fresh = EufyLogin(
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_PASSWORD],
+            eufy_login.openudid,
+            websession=async_get_clientsession(hass),
+        )
+        fresh.apply_preferences(eufy_login.export_state())
+        try:
+            await fresh.init()
+            break
+        except EufyLoginError as e:
+            _LOGGER.warning("Cached Eufy login rejected: %s", e)
+            await async_remove_login_cache(hass, entry)
+            entry.async_start_reauth(hass)
+            return
+        except Exception as e:  # noqa: BLE001 - any failure keeps the cache
+            eufy_login.login_state = "degraded"
+            _LOGGER.warning(
+                "Eufy cloud unreachable (%s); running on cached credentials, "
+                "retrying in %d s",
+                e,
+                _REVALIDATE_RETRY,
+            )
+        await asyncio.sleep(_REVALIDATE_RETRY)
+
+    state = fresh.export_state()
+    await async_save_login_cache(hass, entry, state)
+    devices_changed = fresh.device_signature() != eufy_login.device_signature()
+    eufy_login.restore_state(state)
+    eufy_login.login_state = "online"
+    _LOGGER.debug("Cached Eufy login revalidated")
+    if devices_changed and (fresh.mqtt_devices or fresh.cloud_devices):
+        _LOGGER.info("Eufy device list changed since the cached login; reloading")
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -273,6 +451,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if data and "coordinators" in data:
             for coordinator in data["coordinators"]:
                 coordinator.async_shutdown_timers()
+                await coordinator.async_flush_storage()
                 if coordinator.client:
                     await coordinator.client.disconnect()
 
@@ -281,6 +460,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the warm-start login cache of a removed entry."""
+    await async_remove_login_cache(hass, entry)
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+from collections.abc import Callable
 from typing import Any
 
 from ..const import DPS_MAP, EUFY_CLEAN_DEVICES, SCALAR_DPS, TUYA_PRODUCT_MODELS
-from ..utils import is_protobuf_dps_value
+from ..utils import is_protobuf_dps_value, log_timing
 from .http import EufyHTTPClient
 from .tuya_cloud import TuyaCloudClient, TuyaCloudError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Cloud coordinators polling within this many seconds of one device listing
+# are answered from it instead of starting another.
+_CLOUD_POLL_SHARE_WINDOW = 5.0
+
 
 def _is_scalar_state_value(value: Any) -> bool:
     """Is DPS 15 a scalar (G50) status — i.e. numeric, not a Tuya status string?
@@ -50,20 +57,134 @@ class EufyLogin:
         self.eufy_api_devices: list[dict[str, Any]] = []
         self.tuya_client: TuyaCloudClient | None = None
         self._eufy_user_id: str | None = None
+        # Tuya region that accepted the last login; tried alone first.
+        self.preferred_tuya_region: str | None = None
+        # "online" after a live login; "cached" while running on a restored
+        # warm-start state, "degraded" once revalidating it failed.
+        self.login_state = "online"
+        # Seconds per discovery request of the last init(), for the debug log.
+        self.discovery_timings: dict[str, float] = {}
+        # Shared Tuya cloud poll: last listing's DPS per devId, when it was
+        # taken, the listing in flight and who is waiting on it, and the
+        # coordinators that get every listing's DPS pushed to them.
+        self._cloud_dps: dict[str, dict[str, Any]] = {}
+        self._cloud_dps_at = 0.0
+        self._cloud_poll: asyncio.Task | None = None
+        self._cloud_poll_waiters: set[str] = set()
+        self._cloud_listeners: dict[str, Callable[[dict[str, Any]], None]] = {}
+        self.cloud_polls = 0
 
     async def init(self):
+        """Log in, then discover Eufy (AIOT) and Tuya Cloud devices concurrently.
+
+        Only the login is a prerequisite: the Eufy device lists and the Tuya
+        login + device list run side by side and are merged at the end
+        (``getCloudDevices`` needs the final MQTT device list).
+        """
         _LOGGER.debug("EufyLogin.init() starting: HTTP login + device discovery")
-        await self.login({"mqtt": True})
-        await self.getDevices()
+        self.discovery_timings = {}
+        start = time.perf_counter()
+        await self._timed("Eufy login", self.login({"mqtt": True}))
 
-        # Attempt Tuya Cloud login for legacy cloud devices
+        tuya = asyncio.ensure_future(self._discover_tuya())
         try:
-            await self.tuya_login()
-            await self.getCloudDevices()
+            await self.getDevices()
+        except BaseException:
+            tuya.cancel()
+            raise
+        if (tuya_devices := await tuya) is not None:
+            try:
+                await self.getCloudDevices(tuya_devices)
+            except Exception as e:  # noqa: BLE001 - Tuya must not cost the Eufy devices
+                _LOGGER.warning("Failed to add Tuya Cloud devices: %s", e)
+
+        _LOGGER.debug(
+            "Cloud discovery took %.0f ms wall-clock for %.0f ms of requests",
+            (time.perf_counter() - start) * 1000,
+            sum(self.discovery_timings.values()) * 1000,
+        )
+
+    def _timed(self, label: str, awaitable: Any) -> Any:
+        return log_timing(_LOGGER, label, awaitable, self.discovery_timings)
+
+    async def _discover_tuya(self) -> list[dict[str, Any]] | None:
+        """Tuya Cloud login and device list (None when unavailable)."""
+        try:
+            await self._timed("Tuya login", self.tuya_login())
         except Exception as e:
             _LOGGER.warning(
                 "Tuya Cloud login failed; legacy cloud devices will be unavailable: %s", e
             )
+            return None
+        if not self.tuya_client:
+            return None
+        try:
+            return await self._timed("Tuya device list", self.tuya_client.get_device_list())
+        except Exception as e:  # noqa: BLE001 - Tuya must not cost the Eufy devices
+            _LOGGER.warning("Failed to fetch Tuya Cloud device list: %s", e)
+            return None
+
+    def export_state(self) -> dict[str, Any]:
+        """Session tokens, MQTT credentials, Tuya session and discovered devices.
+
+        JSON-safe snapshot for the warm-start cache; the password is not part
+        of it. :meth:`restore_state` is the inverse.
+        """
+        tuya = self.tuya_client
+        return {
+            "openudid": self.openudid,
+            "session": self.eufyApi.session,
+            "user_info": self.eufyApi.user_info,
+            "mqtt_credentials": self.mqtt_credentials,
+            "eufy_user_id": self._eufy_user_id,
+            "tuya": {
+                "region": tuya.region,
+                "endpoint": tuya.endpoint,
+                "sid": tuya.sid,
+                "device_id": tuya._device_id,
+            }
+            if tuya
+            else None,
+            "mqtt_devices": self.mqtt_devices,
+            "cloud_devices": self.cloud_devices,
+            "login_strategy": self.eufyApi.preferred_login,
+            "tuya_region": self.preferred_tuya_region,
+        }
+
+    def apply_preferences(self, state: dict[str, Any]) -> None:
+        """Adopt the login strategy and Tuya region that won for this account."""
+        self.eufyApi.preferred_login = state.get("login_strategy")
+        self.preferred_tuya_region = state.get("tuya_region")
+
+    def restore_state(self, state: dict[str, Any]) -> None:
+        """Adopt an :meth:`export_state` snapshot instead of logging in."""
+        self.apply_preferences(state)
+        self.eufyApi.session = state.get("session")
+        self.eufyApi.user_info = state.get("user_info")
+        self.mqtt_credentials = state.get("mqtt_credentials")
+        self._eufy_user_id = state.get("eufy_user_id")
+        self.tuya_client = None
+        if tuya := state.get("tuya"):
+            client = TuyaCloudClient(tuya["region"], websession=self._websession)
+            client.endpoint = tuya["endpoint"]
+            client.sid = tuya["sid"]
+            client._device_id = tuya["device_id"]
+            self.tuya_client = client
+        self.mqtt_devices = list(state.get("mqtt_devices") or [])
+        self.cloud_devices = list(state.get("cloud_devices") or [])
+
+    def device_signature(self) -> list[tuple[str, str, bool, str, str]]:
+        """What decides which coordinators setup creates, per discovered device."""
+        return sorted(
+            (
+                d["deviceId"],
+                d.get("apiType", ""),
+                bool(d.get("mqtt")),
+                d.get("deviceModel") or "",
+                d.get("local_key") or "",
+            )
+            for d in self.mqtt_devices + self.cloud_devices
+        )
 
     async def login(self, config: dict):
         eufyLogin = None
@@ -91,36 +212,60 @@ class EufyLogin:
     async def tuya_login(self) -> None:
         """Attempt Tuya Cloud login using Eufy user_id.
 
-        Tries EU region first, falls back to US.
+        The regions are raced and EU is preferred over US; the one that worked
+        last time (``preferred_tuya_region``) is tried alone first.
         """
         if not self._eufy_user_id:
             _LOGGER.debug("No Eufy user_id available; skipping Tuya Cloud login")
             return
 
-        # Try EU first
-        try:
-            client = TuyaCloudClient("EU", websession=self._websession)
-            await client.login(self._eufy_user_id)
-            self.tuya_client = client
-            _LOGGER.debug("Tuya Cloud login successful (EU)")
-            return
-        except TuyaCloudError as e:
-            _LOGGER.debug("Tuya Cloud EU login failed: %s", e)
-
-        # Fall back to US
+        regions = ["EU", "US"]
+        if self.preferred_tuya_region in regions:
+            regions.remove(self.preferred_tuya_region)
+            try:
+                await self._race_tuya_regions([self.preferred_tuya_region])
+                return
+            except TuyaCloudError as e:
+                _LOGGER.debug(
+                    "Tuya Cloud %s login failed: %s", self.preferred_tuya_region, e
+                )
+        await self._race_tuya_regions(regions)
+
+    async def _race_tuya_regions(self, regions: list[str]) -> None:
+        """Log in to all ``regions`` at once; the first in order that succeeds
+        wins and the rest are cancelled. Raises the last error if none do."""
+        clients = [TuyaCloudClient(r, websession=self._websession) for r in regions]
+        tasks = [
+            asyncio.ensure_future(client.login(self._eufy_user_id or ""))
+            for client in clients
+        ]
+        error: TuyaCloudError | None = None
         try:
-            client = TuyaCloudClient("US", websession=self._websession)
-            await client.login(self._eufy_user_id)
-            self.tuya_client = client
-            _LOGGER.debug("Tuya Cloud login successful (US)")
-        except TuyaCloudError as e:
-            _LOGGER.debug("Tuya Cloud US login failed: %s", e)
-            raise
+            for client, task in zip(clients, tasks):
+                try:
+                    await task
+                except TuyaCloudError as e:
+                    _LOGGER.debug("Tuya Cloud %s login failed: %s", client.region, e)
+                    error = e
+                    continue
+                self.tuya_client = client
+                self.preferred_tuya_region = client.region
+                _LOGGER.debug("Tuya Cloud login successful (%s)", client.region)
+                return
+        finally:
+            for task in tasks:
+                task.cancel()
+        if error is not None:
+            raise error
 
     async def getDevices(self) -> None:
-        self.eufy_api_devices = await self.eufyApi.get_cloud_device_list()
+        # Independent requests (session token vs user_center token): run both.
+        devices: list[dict[str, Any]]
+        self.eufy_api_devices, devices = await asyncio.gather(
+            self._timed("Eufy cloud device list", self.eufyApi.get_cloud_device_list()),
+            self._timed("Eufy AIOT device list", self.eufyApi.get_device_list()),
+        )
         _LOGGER.debug("Eufy API returned %d devices from cloud list", len(self.eufy_api_devices))
-        devices = await self.eufyApi.get_device_list()
         # Unified-app (v2) accounts often return an empty AIOT device list even
         # though the cloud device list has entries. Reconstruct minimal AIOT
         # entries from the cloud list so findModel (via aiot/v2 metadata) and
@@ -160,9 +305,13 @@ class EufyLogin:
             [(d["deviceName"], d["apiType"]) for d in self.mqtt_devices],
         )
 
-    async def getCloudDevices(self) -> None:
+    async def getCloudDevices(
+        self, tuya_devices: list[dict[str, Any]] | None = None
+    ) -> None:
         """Fetch devices from Tuya Cloud and add those not already in MQTT list.
 
+        ``tuya_devices`` is an already fetched Tuya device list (see ``init``).
+
         Per device the Tuya cloud returns ``localKey`` and the last-known
         ``ip``. The local key is the credential needed to talk the Tuya v3
         protocol on port 6668; the ``ip`` is the public address the dock used
@@ -170,14 +319,14 @@ class EufyLogin:
         normally supplies the LAN address through the integration's options
         (handled in __init__.py).
         """
-        if not self.tuya_client:
-            return
-
-        try:
-            tuya_devices = await self.tuya_client.get_device_list()
-        except TuyaCloudError as e:
-            _LOGGER.warning("Failed to fetch Tuya Cloud device list: %s", e)
-            return
+        if tuya_devices is None:
+            if not self.tuya_client:
+                return
+            try:
+                tuya_devices = await self.tuya_client.get_device_list()
+            except TuyaCloudError as e:
+                _LOGGER.warning("Failed to fetch Tuya Cloud device list: %s", e)
+                return
 
         # MQTT devices split by whether they are confirmed (real AIOT dps) or
         # just reconstructed placeholders (the AIOT list was empty). A real Tuya
@@ -304,34 +453,76 @@ class EufyLogin:
     async def getCloudDevice(self, device_id: str) -> dict[str, Any] | None:
         """Poll a cloud device's DPS via Tuya Cloud API.
 
+        All cloud devices of the account come from one shared listing: a poll
+        within ``_CLOUD_POLL_SHARE_WINDOW`` of the last listing is answered
+        from it, concurrent polls join the listing in flight, and every
+        listing is pushed to the other subscribed devices (see
+        :meth:`subscribe_cloud_device`), which keeps their polls in step.
         On failure, attempts re-login and retries once.
         """
         if not self.tuya_client:
             _LOGGER.warning("Cannot poll cloud device: no Tuya client")
             return None
 
-        try:
-            result = await self.tuya_client.get_device(device_id)
-            _LOGGER.debug(
-                "Cloud device %s poll: %s",
-                device_id,
-                f"{len(result)} DPS keys" if result else "not found",
-            )
-            return result
-        except TuyaCloudError as e:
-            _LOGGER.debug("Cloud device %s poll failed: %s; attempting re-login", device_id, e)
-            self.tuya_client.sid = None
+        if time.monotonic() - self._cloud_dps_at >= _CLOUD_POLL_SHARE_WINDOW:
+            if self._cloud_poll is None:
+                self._cloud_poll = asyncio.ensure_future(self._async_poll_cloud())
+            self._cloud_poll_waiters.add(device_id)
             try:
-                await self.tuya_login()
-                return await self.tuya_client.get_device(device_id)
-            except Exception as retry_err:
+                await asyncio.shield(self._cloud_poll)
+            except Exception as err:
                 _LOGGER.warning(
                     "Failed to poll cloud device %s after re-login: %s",
                     device_id,
-                    retry_err,
+                    err,
                 )
                 return None
 
+        result = self._cloud_dps.get(device_id)
+        _LOGGER.debug(
+            "Cloud device %s poll: %s",
+            device_id,
+            f"{len(result)} DPS keys" if result else "not found",
+        )
+        return result
+
+    def subscribe_cloud_device(
+        self, device_id: str, callback: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Receive the device's DPS from listings other devices triggered."""
+        self._cloud_listeners[device_id] = callback
+
+        def unsubscribe() -> None:
+            if self._cloud_listeners.get(device_id) is callback:
+                del self._cloud_listeners[device_id]
+
+        return unsubscribe
+
+    async def _async_poll_cloud(self) -> None:
+        """One account-wide device listing, shared by every cloud device."""
+        try:
+            try:
+                devices = await self.tuya_client.get_device_list()  # type: ignore[union-attr]
+            except TuyaCloudError as e:
+                _LOGGER.debug("Cloud poll failed: %s; attempting re-login", e)
+                self.tuya_client.sid = None  # type: ignore[union-attr]
+                await self.tuya_login()
+                devices = await self.tuya_client.get_device_list()  # type: ignore[union-attr]
+            self.cloud_polls += 1
+            self._cloud_dps = {
+                d["devId"]: self._coerce_dps(d.get("dps"))
+                for d in devices
+                if d.get("devId")
+            }
+            self._cloud_dps_at = time.monotonic()
+            waiters = self._cloud_poll_waiters
+        finally:
+            self._cloud_poll = None
+            self._cloud_poll_waiters = set()
+        for device_id, listener in list(self._cloud_listeners.items()):
+            if device_id not in waiters and (dps := self._cloud_dps.get(device_id)):
+                listener(dps)
+
     async def sendCloudCommand(
         self, device_id: str, dps: dict[str, Any]
     ) -> None:
@@ -355,6 +546,7 @@ class EufyLogin:
                 raise EufyLoginError(
                     f"Failed to send cloud command to {device_id}: {retry_err}"
                 ) from retry_err
+        self._cloud_dps_at = 0.0  # the shared listing predates the command
 
     async def getMqttDevice(self, deviceId: str):
         devices = await self.eufyApi.get_device_list()
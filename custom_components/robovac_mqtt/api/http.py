@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 from typing import Any
@@ -15,6 +16,7 @@ from ..const import (
     EUFY_API_MQTT_INFO,
     EUFY_API_USER_INFO,
 )
+from ..utils import log_timing
 
 _REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
 
@@ -57,6 +59,8 @@ class EufyHTTPClient:
         self._websession = websession
         self.session: dict[str, Any] | None = None
         self.user_info: dict[str, Any] | None = None
+        # Label of the _LOGIN_CONFIGS entry that won the last login.
+        self.preferred_login: str | None = None
 
     async def login(self, validate_only: bool = False) -> dict[str, Any]:
         """Log in, preferring a credential set whose token yields a user_center id.
@@ -67,50 +71,116 @@ class EufyHTTPClient:
         token authenticates but returns no user_center (issues #121/#124/#131).
         So rather than use the FIRST login that returns an access_token, try each
         and prefer one whose token actually yields a ``user_center_id``. Fall
-        back to any working token — the Tuya cloud path only needs the eufy
+        back to any working token — the Tuya cloud/local path only needs the eufy
         ``user_id``.
+
+        The credential sets are raced (login plus user info each) and judged in
+        ``_LOGIN_CONFIGS`` order, so the answer is the same as trying them one
+        by one but costs the slowest needed attempt, not their sum. The set
+        that won is kept in ``preferred_login`` and tried alone first next time.
         """
-        fallback_session: dict[str, Any] | None = None
-        for config in _LOGIN_CONFIGS:
-            session = await self._attempt_login(config)
-            if not session:
-                continue
-            self.session = session
-            if validate_only:
-                _LOGGER.info("Login (validate) successful via %s", config["label"])
-                return {"session": session}
-
-            user = await self.get_user_info()  # sets self.user_info
-            if user and user.get("user_center_id"):
-                _LOGGER.info(
-                    "Login successful via %s (user_center available)",
-                    config["label"],
+        configs = list(_LOGIN_CONFIGS)
+        preferred = [c for c in configs if c["label"] == self.preferred_login]
+        best = None
+        error: BaseException | None = None
+        if preferred:
+            configs.remove(preferred[0])
+            try:
+                best = await self._race_logins(preferred, validate_only)
+            except (aiohttp.ClientError, TimeoutError) as err:
+                # Only raised once the other credential sets failed too.
+                _LOGGER.debug(
+                    "Login via %s failed (%s); trying the others",
+                    preferred[0]["label"], err,
                 )
-                mqtt = await self.get_mqtt_credentials()
-                return {"session": session, "user": user, "mqtt": mqtt}
-
-            _LOGGER.debug(
-                "Login via %s yielded no user_center; keeping as fallback and "
-                "trying the next credential set",
-                config["label"],
-            )
-            if fallback_session is None:
-                fallback_session = session
-
-        if fallback_session is not None:
-            # No login produced a user_center id (e.g. user_center_info returns
-            # 401 for this account). Use the fallback so the Tuya cloud/local
-            # path can still discover the device via the eufy user_id.
+                error = err
+        if best is None or not (validate_only or best[2]):
+            try:
+                rest = await self._race_logins(configs, validate_only)
+            except (aiohttp.ClientError, TimeoutError):
+                if best is None:
+                    raise
+                rest = None
+            if rest is not None and (best is None or validate_only or rest[2]):
+                best = rest
+        if best is None and error is not None:
+            raise error
+
+        if best is None:
+            _LOGGER.error("All login attempts failed.")
+            return {}
+
+        config, session, user = best
+        self.session = session
+        self.preferred_login = config["label"]
+        if validate_only:
+            _LOGGER.info("Login (validate) successful via %s", config["label"])
+            return {"session": session}
+
+        if user:
+            self.user_info = user
             _LOGGER.info(
-                "No user_center from any login; using fallback session "
-                "(Tuya cloud/local discovery only)"
+                "Login successful via %s (user_center available)",
+                config["label"],
             )
-            self.session = fallback_session
-            self.user_info = None
-            return {"session": fallback_session, "user": None, "mqtt": None}
-
-        _LOGGER.error("All login attempts failed.")
-        return {}
+            mqtt = await self.get_mqtt_credentials()
+            return {"session": session, "user": user, "mqtt": mqtt}
+
+        # No login produced a user_center id (e.g. user_center_info returns
+        # 401 for this account). Use the fallback so the Tuya cloud/local
+        # path can still discover the device via the eufy user_id.
+        _LOGGER.info(
+            "No user_center from any login; using fallback session "
+            "(Tuya cloud/local discovery only)"
+        )
+        self.user_info = None
+        return {"session": session, "user": None, "mqtt": None}
+
+    async def _race_logins(
+        self, configs: list[dict[str, str]], validate_only: bool
+    ) -> tuple[dict[str, str], dict[str, Any], dict[str, Any] | None] | None:
+        """Run the credential sets concurrently; pick the first in order that
+        yields a user_center (any session when ``validate_only``), else the
+        first working session. Attempts still running are cancelled."""
+        tasks = [
+            asyncio.ensure_future(self._login_candidate(config, validate_only))
+            for config in configs
+        ]
+        fallback = None
+        error: BaseException | None = None
+        try:
+            for config, task in zip(configs, tasks):
+                try:
+                    result = await task
+                except (aiohttp.ClientError, TimeoutError) as err:
+                    error = error or err
+                    continue
+                if result is None:
+                    continue
+                session, user = result
+                if validate_only or user:
+                    return config, session, user
+                _LOGGER.debug(
+                    "Login via %s yielded no user_center; keeping as fallback",
+                    config["label"],
+                )
+                fallback = fallback or (config, session, None)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if fallback is None and error is not None:
+            raise error
+        return fallback
+
+    async def _login_candidate(
+        self, config: dict[str, str], validate_only: bool
+    ) -> tuple[dict[str, Any], dict[str, Any] | None] | None:
+        """One credential set: its session and, unless validating, user info."""
+        session = await self._attempt_login(config)
+        if not session or validate_only:
+            return (session, None) if session else None
+        user = await self.get_user_info(session)
+        return session, user if user and user.get("user_center_id") else None
 
     async def _attempt_login(
         self, config: dict[str, str]
@@ -161,11 +231,20 @@ class EufyHTTPClient:
             )
             return None
 
-    async def get_user_info(self) -> dict[str, Any] | None:
-        """Get User details."""
-        if not self.session:
+    async def get_user_info(
+        self, login_session: dict[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        """Get User details.
+
+        For an explicit ``login_session`` (a login candidate) the result is
+        only returned; otherwise it also becomes ``self.user_info``.
+        """
+        own = login_session is None
+        login_session = self.session if own else login_session
+        if not login_session:
             return None
 
+        user_info = None
         session = self._websession
         async with session.get(
             EUFY_API_USER_INFO,
@@ -174,7 +253,7 @@ class EufyHTTPClient:
                 "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
                 "user-agent": "EufyHome-Android-3.1.3-753",
                 "category": "Home",
-                "token": self.session["access_token"],
+                "token": login_session["access_token"],
                 "openudid": self.openudid,
                 "clienttype": "2",
             },
@@ -183,19 +262,18 @@ class EufyHTTPClient:
                 user_info = await response.json()
                 if user_info is None or not user_info.get("user_center_id"):
                     _LOGGER.error("No user_center_id found")
-                    self.user_info = None
-                    return None
-
-                # Generate GToken
-                user_info["gtoken"] = hashlib.md5(
-                    user_info["user_center_id"].encode()
-                ).hexdigest()
-                self.user_info = user_info
-                return self.user_info
-
-            _LOGGER.error("get user center info failed")
-            self.user_info = None
-            return None
+                    user_info = None
+                else:
+                    # Generate GToken
+                    user_info["gtoken"] = hashlib.md5(
+                        user_info["user_center_id"].encode()
+                    ).hexdigest()
+            else:
+                _LOGGER.error("get user center info failed")
+
+        if own:
+            self.user_info = user_info
+        return user_info
 
     async def get_device_list(self) -> list[dict[str, Any]]:
         """Get list of devices."""
@@ -233,21 +311,24 @@ class EufyHTTPClient:
             _LOGGER.error("Cannot get cloud device list: no session")
             return []
 
-        # Try the legacy api.eufylife.com endpoint first.
-        devices = await self._get_cloud_device_list_legacy()
-        if devices:
-            _LOGGER.debug(
-                "Cloud device list (legacy) returned %d device(s)", len(devices)
-            )
-            return devices
-
-        # Fallback: the home-api endpoint (unified Eufy app).
-        devices = await self._get_home_device_list()
-        if devices:
-            _LOGGER.debug(
-                "Cloud device list (home-api) returned %d device(s)", len(devices)
-            )
-            return devices
+        # Both endpoints are queried at once; the legacy api.eufylife.com list
+        # wins when it has devices, else the home-api one (unified Eufy app).
+        results = await asyncio.gather(
+            log_timing(_LOGGER, "Cloud device list (legacy)", self._get_cloud_device_list_legacy()),
+            log_timing(_LOGGER, "Cloud device list (home-api)", self._get_home_device_list()),
+            return_exceptions=True,
+        )
+        for label, devices in zip(("legacy", "home-api"), results):
+            if isinstance(devices, BaseException):
+                continue
+            if devices:
+                _LOGGER.debug(
+                    "Cloud device list (%s) returned %d device(s)", label, len(devices)
+                )
+                return devices
+        for error in results:
+            if isinstance(error, BaseException):
+                raise error
 
         _LOGGER.debug("Cloud device list: both endpoints returned 0 devices")
         return []
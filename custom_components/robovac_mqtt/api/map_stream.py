@@ -1,17 +1,30 @@
 """Parse biz/ MQTT protocol-41 map stream messages and render PNG."""
 from __future__ import annotations
 
+import functools
+import hashlib
 import io
 import json
 import logging
+import math
+import struct
+import sys
+import threading
+from array import array
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
-from ..proto.cloud import stream_pb2
+from ..proto.cloud import clean_record_pb2, stream_pb2
 from ..utils import decode_varint
 
+try:
+    from lz4 import block as lz4_block
+except ImportError:  # pragma: no cover - optional native accelerator
+    lz4_block = None
+
 _LOGGER = logging.getLogger(__name__)
 
 # 2bpp pixel value → RGB (fallback when RoomOutline not available)
@@ -35,6 +48,39 @@ _ROOM_PALETTE: list[tuple[int, int, int]] = [
     (160, 200, 180),
 ]
 
+# PathPoint.flags: bits 0-3 point type, bit 4 break, bit 5 show trajectory
+PATH_TYPE_MASK = 0x0F
+PATH_BREAK = 0x10
+PATH_SHOW_TRAJECTORY = 0x20
+PATH_SWEEP = 0
+PATH_MOP = 1
+PATH_SWEEP_MOP = 2
+PATH_HIDE = 15
+
+# Static-layer colours: restricted zones and room label boxes
+_BAN_MOP_COLOR = (255, 165, 0)
+_ZONE_COLOR = (220, 50, 50)
+_LABEL_COLOR = (30, 30, 30)
+_LABEL_BG = (255, 255, 255)
+
+# Overlay colours: dock house, robot marker (googly / dot), badge ring
+_DOCK_FILL = (255, 215, 0)
+_DOCK_EDGE = (100, 75, 0)
+_ROBOT_EDGE = (160, 70, 0)
+_ROBOT_FILL = (255, 140, 0)
+_DOT_EDGE = (20, 20, 20)
+_DOT_FILL = (55, 55, 55)
+_EYE_WHITE = (255, 255, 255)
+_DARK = (20, 20, 20)
+_BADGE_RING = (30, 30, 30)
+
+# Trail point type → RGB; other types (navigation, go-charge, ...) draw as sweep
+_TRAIL_COLORS: dict[int, tuple[int, int, int]] = {
+    PATH_SWEEP: (255, 140, 0),
+    PATH_MOP: (30, 144, 255),
+    PATH_SWEEP_MOP: (0, 180, 160),
+}
+
 # Room scene type → fallback label when room.name is empty
 _ROOM_SCENE_NAMES: dict[int, str] = {
     1: "STUDY", 2: "BEDROOM", 3: "RESTROOM", 4: "KITCHEN",
@@ -87,14 +133,45 @@ _HOUSE_FILL: frozenset[tuple[int, int]] = frozenset([
 _HOUSE_DOOR: tuple[tuple[int, int], ...] = (
     (-1,2),(0,2),(1,2),(-1,3),(0,3),(1,3),
 )
+_HOUSE_BORDER: frozenset[tuple[int, int]] = frozenset(
+    (ox + ddx, oy + ddy)
+    for ox, oy in _HOUSE_FILL
+    for ddx in (-1, 0, 1)
+    for ddy in (-1, 0, 1)
+    if (ox + ddx, oy + ddy) not in _HOUSE_FILL
+)
+
+# Flat colour table indexed by _pixel_indices(): 0-3 are the 2bpp lidar values
+# (_PIXEL_COLORS), _ROOM_BASE + n is _ROOM_PALETTE[n].
+_ROOM_BASE = len(_PIXEL_COLORS)
+_COLORS: list[tuple[int, int, int]] = [_PIXEL_COLORS[pv] for pv in range(_ROOM_BASE)] + _ROOM_PALETTE
+_COLOR_TABLE = np.array(_COLORS, dtype=np.uint8)
+
+# Indexed ("palette") output: the grid indices above are palette indices
+# as-is, followed by every overlay colour so label tiles pasted onto the map
+# share the map's palette.
+_PALETTE: list[tuple[int, int, int]] = _COLORS + [
+    *_TRAIL_COLORS.values(), _BAN_MOP_COLOR, _ZONE_COLOR, _LABEL_COLOR, _LABEL_BG,
+    _DOCK_FILL, _DOCK_EDGE, _ROBOT_EDGE, _ROBOT_FILL, _DOT_EDGE, _DOT_FILL,
+    _EYE_WHITE, _DARK, _BADGE_RING, *(color for color, _ in _STATUS_BADGE.values()),
+]
+_PALETTE_BYTES = bytes(v for color in _PALETTE for v in color)
+_PALETTE_INDEX: dict[tuple[int, int, int], int] = {}
+for _i, _color in enumerate(_PALETTE):
+    _PALETTE_INDEX.setdefault(_color, _i)
 
 _MAX_PNG_PX = 512
 
+# LANCZOS reaches 3 source pixels either side of an output pixel, which is
+# under 4 output pixels at any downscale: growing a dirty box by this much
+# re-samples every output pixel a change can reach.
+_RESAMPLE_MARGIN = 4
+
 
 @dataclass
 class MapData:
     """Decoded map pixel data from a Map or MapBackup proto."""
-    raw_pixels: bytes
+    raw_pixels: bytes | bytearray
     width: int
     height: int
     origin_x: int = 0
@@ -109,6 +186,9 @@ class MapData:
     virtual_walls: list[tuple[tuple[int, int], tuple[int, int]]] = field(default_factory=list)
     forbidden_zones: list[list[tuple[int, int]]] = field(default_factory=list)
     ban_mop_zones: list[list[tuple[int, int]]] = field(default_factory=list)
+    # Map.Frame.P: pixels are a block to patch onto the cached map (see
+    # apply_map_patch), positioned by this frame's own width/height/origin.
+    incremental: bool = False
 
     def room_id_at_normalized(self, nx: float, ny: float) -> int:
         """Return the room id under a normalized point on the *rendered* map image.
@@ -153,6 +233,20 @@ def _hex_to_proto_bytes(hex_data: str) -> bytes:
 
 
 def _lz4_block_decompress(data: bytes, uncompressed_size: int) -> bytes:
+    """Decompress a raw LZ4 block, using the ``lz4`` C extension when installed.
+
+    The native decoder is strict about end-of-block rules some firmware frames
+    do not follow, so anything it rejects is retried with the pure-Python one.
+    """
+    if lz4_block is not None and uncompressed_size > 0:
+        try:
+            return lz4_block.decompress(data, uncompressed_size=uncompressed_size)
+        except lz4_block.LZ4BlockError:
+            pass
+    return _lz4_block_decompress_py(data, uncompressed_size)
+
+
+def _lz4_block_decompress_py(data: bytes, uncompressed_size: int) -> bytes:
     output = bytearray()
     pos = 0
     n = len(data)
@@ -165,7 +259,7 @@ def _lz4_block_decompress(data: bytes, uncompressed_size: int) -> bytes:
                 lit_len += extra
                 if extra != 255:
                     break
-        output.extend(data[pos: pos + lit_len]); pos += lit_len
+        output += data[pos: pos + lit_len]; pos += lit_len
         if pos >= n:
             break
         offset = data[pos] | (data[pos + 1] << 8); pos += 2
@@ -177,8 +271,14 @@ def _lz4_block_decompress(data: bytes, uncompressed_size: int) -> bytes:
                 if extra != 255:
                     break
         match_start = len(output) - offset
-        for i in range(match_len):
-            output.append(output[match_start + i])
+        if offset == 0 or match_start < 0:
+            raise ValueError(f"LZ4 match offset {offset} outside {len(output)}-byte window")
+        # An overlapping match (offset < match_len) repeats the last `offset`
+        # bytes; copying the already-written run doubles it each pass.
+        while match_len > 0:
+            chunk = min(match_len, len(output) - match_start)
+            output += output[match_start: match_start + chunk]
+            match_len -= chunk
     return bytes(output)
 
 
@@ -190,6 +290,554 @@ def _quad_points(q: Any) -> list[tuple[int, int]]:
     return [(q.p0.x, q.p0.y), (q.p1.x, q.p1.y), (q.p2.x, q.p2.y), (q.p3.x, q.p3.y)]
 
 
+# ---------------------------------------------------------------------------
+# Pixel pipeline
+# ---------------------------------------------------------------------------
+
+def _unpack_bytes(raw: bytes | bytearray, b0: int, b1: int) -> np.ndarray:
+    """Unpack packed bytes ``b0:b1`` into a flat run of 2bpp values (LSB first).
+
+    Bytes past the end of ``raw`` (truncated frame) read as 0 / UNKNOWN.
+    """
+    packed = np.zeros(b1 - b0, dtype=np.uint8)
+    avail = max(0, min(len(raw), b1) - b0)
+    if avail:
+        packed[:avail] = np.frombuffer(raw, dtype=np.uint8, count=avail, offset=b0)
+    pv = np.empty((packed.size, 4), dtype=np.uint8)
+    for slot in range(4):
+        pv[:, slot] = (packed >> (slot * 2)) & 3
+    return pv.reshape(-1)
+
+
+def _unpack_2bpp(
+    raw: bytes | bytearray, width: int, height: int, y0: int = 0, y1: int | None = None
+) -> np.ndarray:
+    """Unpack rows ``y0:y1`` of a 2bpp map into a (rows, width) uint8 grid.
+
+    Only the bytes covering the requested rows are touched.
+    """
+    y1 = height if y1 is None else y1
+    first, last = y0 * width, y1 * width
+    b0 = first >> 2
+    flat = _unpack_bytes(raw, b0, (last + 3) >> 2)
+    skip = first - b0 * 4
+    return flat[skip:skip + last - first].reshape(y1 - y0, width)
+
+
+def _pack_2bpp(pixels: np.ndarray) -> bytes:
+    """Inverse of ``_unpack_2bpp`` for a flat run whose length is a multiple of 4."""
+    quads = pixels.reshape(-1, 4)
+    return (quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6).tobytes()
+
+
+def _room_grid(map_data: MapData) -> np.ndarray | None:
+    """Return the room-mask bytes aligned onto the map grid, or None.
+
+    The RoomOutline has its own origin; the offset is applied as one slice copy
+    so grid pixel ``(x, y)`` reads ``room_pixels[(y - dy) * w + (x - dx)]``
+    (0 outside the outline).
+    """
+    room_px = map_data.room_pixels
+    ro_w, ro_h = map_data.room_outline_width, map_data.room_outline_height
+    if room_px is None or not ro_w or not ro_h:
+        return None
+    width, height = map_data.width, map_data.height
+    res = map_data.resolution or 5
+    ro_dx = round((map_data.origin_x - map_data.room_outline_origin_x) / res)
+    ro_dy = round((map_data.origin_y - map_data.room_outline_origin_y) / res)
+
+    flat = np.zeros(ro_w * ro_h, dtype=np.uint8)
+    avail = min(len(room_px), flat.size)
+    flat[:avail] = np.frombuffer(room_px, dtype=np.uint8, count=avail)
+    outline = flat.reshape(ro_h, ro_w)
+
+    grid = np.zeros((height, width), dtype=np.uint8)
+    x0, x1 = max(0, ro_dx), min(width, ro_dx + ro_w)
+    y0, y1 = max(0, ro_dy), min(height, ro_dy + ro_h)
+    if x0 < x1 and y0 < y1:
+        grid[y0:y1, x0:x1] = outline[y0 - ro_dy:y1 - ro_dy, x0 - ro_dx:x1 - ro_dx]
+    return grid
+
+
+def _colorize(pv: np.ndarray, rooms: np.ndarray | None) -> np.ndarray:
+    """Map 2bpp values (+ aligned room mask) to ``_COLOR_TABLE`` indices."""
+    if rooms is None:
+        return pv
+    rid = rooms >> 2
+    sub_type = rooms & 3
+    palette_slots = len(_ROOM_PALETTE) - 1
+    room_color = _ROOM_BASE + 1 + (rid.astype(np.int16) - 1) % palette_slots
+    use_room = (rid > 0) & ((sub_type == 0) | (pv >= 2))
+    return np.where(use_room, room_color, pv).astype(np.uint8)
+
+
+def _room_centroids(
+    rooms: np.ndarray | None, room_names: dict[int, str]
+) -> dict[int, list[int]]:
+    """Return ``{rid: [sum_src_x, sum_src_y, count]}`` for named rooms.
+
+    Ordered by each room's first pixel in row-major scan order (label draw order).
+    """
+    src_centroids: dict[int, list[int]] = {}
+    if rooms is None or not room_names:
+        return src_centroids
+    rid = rooms >> 2
+    named = (rid > 0) & np.isin(rid, np.fromiter(room_names, dtype=np.int64))
+    ys, xs = np.nonzero(named)  # row-major, like the scan the labels came from
+    if ys.size:
+        ids = rid[ys, xs]
+        counts = np.bincount(ids)
+        sum_x = np.bincount(ids, weights=xs)
+        sum_y = np.bincount(ids, weights=ys)
+        present, first = np.unique(ids, return_index=True)
+        for r in present[np.argsort(first)].tolist():
+            src_centroids[r] = [int(sum_x[r]), int(sum_y[r]), int(counts[r])]
+    return src_centroids
+
+
+def _pixel_indices(
+    map_data: MapData,
+) -> tuple[np.ndarray, dict[int, list[int]]]:
+    """Colour the map grid as ``_COLOR_TABLE`` indices and locate room labels.
+
+    Returns the (height, width) index grid in source orientation (not yet
+    Y-flipped) and the named-room centroids from ``_room_centroids``.
+    """
+    pv = _unpack_2bpp(map_data.raw_pixels, map_data.width, map_data.height)
+    rooms = _room_grid(map_data)
+    return _colorize(pv, rooms), _room_centroids(rooms, map_data.room_names)
+
+
+def apply_map_patch(
+    base: MapData, patch: MapData
+) -> tuple[int, int, int, int] | None:
+    """Write an incremental (P-frame) map onto ``base.raw_pixels``.
+
+    The patch's MapInfo places its pixel block on the base grid. Returns the
+    dirty ``(x0, y0, x1, y1)`` rectangle in source grid pixels, or None when
+    the patch does not line up with / fit inside the base (caller should then
+    treat it as a full frame). Only the rows covered by the patch are
+    unpacked and rewritten, on a copy of the packed grid that then replaces
+    ``base.raw_pixels``: a render thread still reading the previous buffer
+    never sees a half-written grid.
+    """
+    res = base.resolution or 5
+    if (patch.resolution or 5) != res:
+        return None
+    x0, rem_x = divmod(patch.origin_x - base.origin_x, res)
+    y0, rem_y = divmod(patch.origin_y - base.origin_y, res)
+    x1, y1 = x0 + patch.width, y0 + patch.height
+    if rem_x or rem_y:
+        return None
+    if x0 < 0 or y0 < 0 or x1 > base.width or y1 > base.height:
+        return None
+
+    width = base.width
+    size = (base.width * base.height + 3) // 4
+    buf = bytearray(size)  # zero-filled past a truncated base
+    buf[:len(base.raw_pixels)] = base.raw_pixels[:size]
+
+    # Rewrite whole bytes: widen the row band to 4-pixel boundaries.
+    first, last = y0 * width, y1 * width
+    b0, b1 = first >> 2, (last + 3) >> 2
+    flat = _unpack_bytes(buf, b0, b1)
+    band = flat[first - b0 * 4:last - b0 * 4].reshape(y1 - y0, width)
+    band[:, x0:x1] = _unpack_2bpp(patch.raw_pixels, patch.width, patch.height)
+    buf[b0:b1] = _pack_2bpp(flat)
+    base.raw_pixels = buf
+    return x0, y0, x1, y1
+
+
+# ---------------------------------------------------------------------------
+# Overlay assets (built once, shared by every render)
+# ---------------------------------------------------------------------------
+
+# Sprite canvases are (2 * _SPRITE_ANCHOR + 1) px square, centred on the anchor.
+_SPRITE_ANCHOR = 8
+
+
+def _new_image(size: tuple[int, int], color: tuple[int, int, int], palette: bool) -> Image.Image:
+    """Blank RGB image, or indexed image on ``_PALETTE`` in palette mode."""
+    if not palette:
+        return Image.new("RGB", size, color)
+    img = Image.new("P", size, _PALETTE_INDEX[color])
+    img.putpalette(_PALETTE_BYTES)
+    return img
+
+
+@functools.lru_cache(maxsize=1)
+def _label_font() -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    try:
+        return ImageFont.load_default(size=9)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=256)
+def _label_tile(label: str, palette: bool) -> tuple[Image.Image, int, int]:
+    """Room name tile (white box + text) and the measured text width/height."""
+    font = _label_font()
+    left, top, right, bottom = (int(v) for v in font.getbbox(label))
+    tw = right - left
+    th = bottom - top
+    size: tuple[int, int] = (tw // 2 * 2 + 5, th // 2 * 2 + 3)
+    tile = _new_image(size, _LABEL_BG, palette)
+    ImageDraw.Draw(tile).text(
+        (2 - left, 1 - top), label, fill=_LABEL_COLOR, font=font
+    )
+    return tile, tw, th
+
+
+@functools.lru_cache(maxsize=None)
+def _overlay_sprite(kind: str, palette: bool) -> tuple[Image.Image, Image.Image]:
+    """Pre-rasterised overlay and its paste mask, centred on ``_SPRITE_ANCHOR``.
+
+    ``kind`` is ``"dock"``, a robot style (``"googly"`` / ``"dot"``) or a
+    ``_STATUS_BADGE`` name (centred on the badge, not the robot).
+    """
+    c = _SPRITE_ANCHOR
+    sprite = Image.new("RGBA", (2 * c + 1, 2 * c + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+
+    def _circle(dx: float, dy: float, r: float, color: tuple[int, int, int]) -> None:
+        cx, cy = c + dx, c + dy
+        if r < 1.0:
+            draw.point((round(cx), round(cy)), fill=(*color, 255))
+        else:
+            draw.ellipse([(cx - r, cy - r), (cx + r, cy + r)], fill=(*color, 255))
+
+    def _points(offsets: Any, color: tuple[int, int, int]) -> None:
+        draw.point([(c + ox, c + oy) for ox, oy in offsets], fill=(*color, 255))
+
+    if kind == "dock":
+        _points(_HOUSE_BORDER, _DOCK_EDGE)
+        _points(_HOUSE_FILL, _DOCK_FILL)
+        _points(_HOUSE_DOOR, _DOCK_EDGE)
+    elif kind == "dot":
+        _circle(0, 0, 5.0, _DOT_EDGE)
+        _circle(0, 0, 4.0, _DOT_FILL)
+    elif kind == "googly":
+        _circle(0, 0, 5.0, _ROBOT_EDGE)
+        _circle(0, 0, 4.0, _ROBOT_FILL)
+        for ex, ey in ((-1, -1), (2, -1)):
+            _circle(ex, ey, 1.5, _EYE_WHITE)
+            _circle(ex, ey, 0.6, _DARK)
+    else:
+        badge_color, icon_offsets = _STATUS_BADGE[kind]
+        _circle(0, 0, 6.0, _BADGE_RING)
+        _circle(0, 0, 5.0, badge_color)
+        _points(icon_offsets, _DARK)
+
+    mask = sprite.getchannel("A")
+    if not palette:
+        return sprite, mask
+    rgba = np.asarray(sprite)
+    indices = np.zeros(rgba.shape[:2], dtype=np.uint8)
+    opaque = rgba[..., 3] > 0
+    for color in {tuple(px) for px in rgba[opaque][:, :3].tolist()}:
+        indices[opaque & (rgba[..., :3] == color).all(axis=-1)] = _PALETTE_INDEX[color]
+    indexed = Image.fromarray(indices, "L")
+    indexed.putpalette(_PALETTE_BYTES)
+    return indexed, mask
+
+
+class MapBaseLayer:
+    """Cached, already-scaled static layer for one ``MapData``.
+
+    Holds everything that only changes with a new map frame: the scaled floor
+    with restricted zones drawn on it, plus pre-rendered room label tiles that
+    ``render_map_png`` pastes over the trail. A pose-only render is then a copy,
+    a few overlays and the encode.
+
+    Built in full on first ``refresh``. P-frames mark the source rectangle they
+    touched via ``invalidate`` (event loop, cheap); the next ``refresh``
+    (executor) re-colours and re-samples only that box. A re-sampled box can
+    differ from a full re-render by one colour step, as LANCZOS weights round
+    slightly differently on a sub-box.
+
+    With ``palette`` the layer is an indexed (``P``) image on ``_PALETTE``,
+    scaled nearest-neighbour: a third of the memory, exact patches, and a
+    much smaller, faster PNG encode, at the cost of unsmoothed edges.
+    """
+
+    def __init__(
+        self, map_data: MapData, max_px: int = _MAX_PNG_PX, palette: bool = False
+    ) -> None:
+        self.map_data = map_data
+        self.max_px = max_px
+        self.palette = palette
+        self._resample = Image.Resampling.NEAREST if palette else Image.Resampling.LANCZOS
+        width, height = map_data.width, map_data.height
+        self.scale = min(max_px / max(width, height), 1.0)
+        self.size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        self.centroids: dict[int, list[int]] = {}
+        self._rooms: np.ndarray | None = None
+        self._source: Image.Image | None = None  # full resolution, Y-flipped
+        self._image: Image.Image | None = None  # scaled to self.size
+        self._static: Image.Image | None = None  # _image + restricted zones
+        self.labels: list[tuple[tuple[int, int], Image.Image]] = []
+        self._dirty: tuple[int, int, int, int] | None = None
+        self._dirty_lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    def matches(self, map_data: MapData, max_px: int, palette: bool = False) -> bool:
+        """Whether this layer renders ``map_data`` at ``max_px`` in this mode."""
+        return (
+            self.map_data is map_data and self.max_px == max_px and self.palette == palette
+        )
+
+    def invalidate(self, rect: tuple[int, int, int, int]) -> None:
+        """Mark source grid rectangle ``(x0, y0, x1, y1)`` as changed."""
+        with self._dirty_lock:
+            if self._dirty is not None:
+                rect = (
+                    min(rect[0], self._dirty[0]), min(rect[1], self._dirty[1]),
+                    max(rect[2], self._dirty[2]), max(rect[3], self._dirty[3]),
+                )
+            self._dirty = rect
+
+    def refresh(self) -> Image.Image:
+        """Bring the layer up to date and return a copy to draw overlays on."""
+        with self._render_lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, None
+            if self._static is None:
+                self._build()
+            elif dirty is not None:
+                self._patch(*dirty)
+            assert self._static is not None
+            return self._static.copy()
+
+    def to_out(self, mx: int, my: int) -> tuple[int, int]:
+        """Map pixel → output pixel (Y-flip baked in)."""
+        return round(mx * self.scale), round((self.map_data.height - 1 - my) * self.scale)
+
+    def world_to_out(self, wx: int, wy: int) -> tuple[int, int]:
+        """World cm → output pixel."""
+        md = self.map_data
+        res = md.resolution or 5
+        return self.to_out(round((wx - md.origin_x) / res), round((wy - md.origin_y) / res))
+
+    def _grid_image(self, indices: np.ndarray) -> Image.Image:
+        """``_COLOR_TABLE`` index grid → RGB image, or indexed image in palette mode."""
+        if not self.palette:
+            return Image.fromarray(_COLOR_TABLE[indices], "RGB")
+        img = Image.fromarray(np.ascontiguousarray(indices), "L")
+        img.putpalette(_PALETTE_BYTES)
+        return img
+
+    def _build(self) -> None:
+        md = self.map_data
+        self._rooms = _room_grid(md)
+        self.centroids = _room_centroids(self._rooms, md.room_names)
+        pv = _unpack_2bpp(md.raw_pixels, md.width, md.height)
+        self._source = self._grid_image(_colorize(pv, self._rooms)[::-1])
+        if self.scale < 1.0:
+            self._image = self._source.resize(self.size, self._resample)
+        else:
+            self._image = self._source
+        self._static = self._image.copy()
+        self._draw_zones()
+        self.labels = self._render_labels()
+
+    def _patch(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        assert self._source is not None
+        assert self._image is not None
+        assert self._static is not None
+        md = self.map_data
+        width, height = md.width, md.height
+        pv = _unpack_2bpp(md.raw_pixels, width, height, y0, y1)[:, x0:x1]
+        rooms = None if self._rooms is None else self._rooms[y0:y1, x0:x1]
+        tile = self._grid_image(_colorize(pv, rooms)[::-1])
+        top = height - y1  # Y-flip: source row y is image row height - 1 - y
+        self._source.paste(tile, (x0, top))
+        if self._image is self._source:
+            self._static.paste(self._source.crop((x0, top, x1, height - y0)), (x0, top))
+            self._draw_zones()
+            return
+        sx, sy = self.size[0] / width, self.size[1] / height
+        ox0 = max(0, math.floor(x0 * sx) - _RESAMPLE_MARGIN)
+        ox1 = min(self.size[0], math.ceil(x1 * sx) + _RESAMPLE_MARGIN)
+        oy0 = max(0, math.floor(top * sy) - _RESAMPLE_MARGIN)
+        oy1 = min(self.size[1], math.ceil((height - y0) * sy) + _RESAMPLE_MARGIN)
+        region = self._source.resize(
+            (ox1 - ox0, oy1 - oy0),
+            self._resample,
+            box=(ox0 / sx, oy0 / sy, ox1 / sx, oy1 / sy),
+        )
+        self._image.paste(region, (ox0, oy0))
+        self._static.paste(region, (ox0, oy0))
+        # Zone outlines are cheap and idempotent; redraw them all over the box.
+        self._draw_zones()
+
+    def _draw_zones(self) -> None:
+        assert self._static is not None
+        md = self.map_data
+        draw = ImageDraw.Draw(self._static)
+        for zone in md.ban_mop_zones:
+            pts = [self.world_to_out(p[0], p[1]) for p in zone]
+            if len(pts) >= 2:
+                draw.polygon(pts, outline=_BAN_MOP_COLOR)
+        for zone in md.forbidden_zones:
+            pts = [self.world_to_out(p[0], p[1]) for p in zone]
+            if len(pts) >= 2:
+                draw.polygon(pts, outline=_ZONE_COLOR)
+        for wall in md.virtual_walls:
+            draw.line(
+                [self.world_to_out(*wall[0]), self.world_to_out(*wall[1])],
+                fill=_ZONE_COLOR,
+            )
+
+    def _render_labels(self) -> list[tuple[tuple[int, int], Image.Image]]:
+        """Room name tiles (white box + text) keyed by their top-left corner."""
+        if not self.centroids:
+            return []
+        labels = []
+        for rid, vals in self.centroids.items():
+            if vals[2] == 0:
+                continue
+            label = self.map_data.room_names[rid].upper()
+            if not label:
+                continue
+            ox, oy = self.to_out(vals[0] // vals[2], vals[1] // vals[2])
+            tile, tw, th = _label_tile(label, self.palette)
+            labels.append(((ox - tw // 2 - 2, oy - th // 2 - 1), tile))
+        return labels
+
+
+# ---------------------------------------------------------------------------
+# Cleaning trail
+# ---------------------------------------------------------------------------
+
+class TrailBuffer:
+    """Compact cleaning trail: packed map-pixel points plus ``PathPoint`` flags.
+
+    Each point costs five bytes (``x | y << 16`` in an ``array('I')`` and the
+    low ``PathPoint.flags`` bits in an ``array('B')``) instead of a tuple per
+    point. ``PATH_BREAK`` starts a new polyline and the point type selects the
+    trail colour. Beyond ``max_points`` the oldest half is dropped.
+    """
+
+    def __init__(self, max_points: int = 50_000) -> None:
+        self.max_points = max_points
+        self._xy = array("I")
+        self._flags = array("B")
+        self._base = 0  # running index of _xy[0] (points dropped since clear)
+
+    def __len__(self) -> int:
+        return len(self._xy)
+
+    def append(self, x: int, y: int, flags: int = PATH_SWEEP) -> None:
+        """Append a map-pixel point; the first point always starts a segment."""
+        if len(self._xy) >= self.max_points:
+            del self._xy[: self.max_points // 2]
+            del self._flags[: self.max_points // 2]
+            self._base += self.max_points // 2
+            self._flags[0] |= PATH_BREAK
+        if not self._xy:
+            flags |= PATH_BREAK
+        self._xy.append(x | y << 16)
+        self._flags.append(flags & (PATH_TYPE_MASK | PATH_BREAK))
+
+    def clear(self) -> None:
+        del self._xy[:]
+        del self._flags[:]
+        self._base = 0
+
+    @property
+    def end(self) -> int:
+        """Points appended since the last clear, including dropped ones."""
+        return self._base + len(self._xy)
+
+    def last(self) -> tuple[int, int] | None:
+        if not self._xy:
+            return None
+        v = self._xy[-1]
+        return v & 0xFFFF, v >> 16
+
+    def copy(self) -> TrailBuffer:
+        """Snapshot for hand-off to the render thread."""
+        other = TrailBuffer(self.max_points)
+        other._xy = array("I", self._xy)
+        other._flags = array("B", self._flags)
+        other._base = self._base
+        return other
+
+    def segments(self) -> list[tuple[int, list[tuple[int, int]]]]:
+        """Split into ``(point_type, points)`` polylines at breaks and type changes.
+
+        A type change shares its first point with the previous polyline so the
+        drawn trail stays connected.
+        """
+        out: list[tuple[int, list[tuple[int, int]]]] = []
+        pts: list[tuple[int, int]] = []
+        kind = -1
+        for v, f in zip(self._xy, self._flags):
+            p = (v & 0xFFFF, v >> 16)
+            t = f & PATH_TYPE_MASK
+            if f & PATH_BREAK or t != kind:
+                prev = pts[-1] if pts and not f & PATH_BREAK else None
+                pts = [prev] if prev else []
+                kind = t
+                out.append((kind, pts))
+            pts.append(p)
+        return out
+
+    def to_list(self) -> list[list[int]]:
+        """JSON-friendly ``[[x, y, flags], ...]`` for persistence."""
+        return [[v & 0xFFFF, v >> 16, f] for v, f in zip(self._xy, self._flags)]
+
+    @classmethod
+    def from_list(cls, points: list[list[int]]) -> TrailBuffer:
+        """Inverse of :meth:`to_list`; also accepts legacy ``[x, y]`` pairs."""
+        trail = cls()
+        for p in points:
+            trail.append(p[0], p[1], p[2] if len(p) > 2 else PATH_SWEEP)
+        return trail
+
+    def to_bytes(self) -> bytes:
+        """Packed points (little-endian ``uint32``) followed by the flag bytes."""
+        xy = array("I", self._xy)
+        if sys.byteorder != "little":
+            xy.byteswap()
+        return xy.tobytes() + self._flags.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> TrailBuffer:
+        """Inverse of :meth:`to_bytes`."""
+        count = len(data) // 5
+        trail = cls()
+        trail._xy.frombytes(data[: count * 4])
+        if sys.byteorder != "little":
+            trail._xy.byteswap()
+        trail._flags.frombytes(data[count * 4 : count * 5])
+        return trail
+
+    def pack_since(self, start: int) -> bytes:
+        """Points from running index ``start`` (see :attr:`end`) as 5-byte
+        records: little-endian ``uint32`` point then the flag byte.
+
+        Unlike :meth:`to_bytes` the records are interleaved, so batches can be
+        appended to a log and a torn tail only loses its last record.
+        """
+        first = max(0, start - self._base)
+        xy = array("I", self._xy[first:])
+        if sys.byteorder != "little":
+            xy.byteswap()
+        n = len(xy)
+        out = bytearray(5 * n)
+        packed = xy.tobytes()
+        for i in range(4):
+            out[i::5] = packed[i::4]
+        out[4::5] = self._flags[first:].tobytes()
+        return bytes(out)
+
+    def extend_packed(self, data: bytes) -> None:
+        """Append :meth:`pack_since` records (an incomplete last one is ignored)."""
+        for v, f in struct.iter_unpack("<IB", data[: len(data) // 5 * 5]):
+            self.append(v & 0xFFFF, v >> 16, f)
+
+
 # ---------------------------------------------------------------------------
 # Main render
 # ---------------------------------------------------------------------------
@@ -197,223 +845,80 @@ def _quad_points(q: Any) -> list[tuple[int, int]]:
 def render_map_png(
     map_data: MapData,
     robot_pixel: tuple[int, int] | None = None,
-    robot_trail: list[tuple[int, int]] | None = None,
+    robot_trail: TrailBuffer | None = None,
     dock_pixel: tuple[int, int] | None = None,
     robot_status: str | None = None,
     max_px: int = _MAX_PNG_PX,
     robot_style: str = "googly",
+    base: MapBaseLayer | None = None,
+    palette: bool = False,
 ) -> bytes:
     """Render a PNG from MapData using Pillow.
 
     Pipeline:
-    1. Build flat color list from map pixels (room palette + lidar fallback).
-    2. putdata() into PIL Image, Y-flip, LANCZOS scale.
-    3. Draw restricted zones, room labels, dock icon, trail, robot marker.
-    4. Encode to PNG bytes via img.save().
+    1. Static layer (``MapBaseLayer``): palette-coloured grid, Y-flip, LANCZOS
+       scale, restricted zones and room label tiles.
+    2. Overlays on a copy of it: dock icon, trail, label tiles, robot marker
+       (dock and robot are cached sprites, see ``_overlay_sprite``).
+    3. Encode to PNG bytes via img.save().
+
+    Step 1 comes from ``base`` when it is a layer for this map and size, so
+    only its dirty region is recomputed; otherwise a throwaway layer is built.
+    ``palette`` renders and encodes an indexed PNG (see ``MapBaseLayer``).
     """
     width, height = map_data.width, map_data.height
     if width * height > 4000 * 4000:
         raise ValueError(f"Map dimensions {width}x{height} exceed safety limit (max 4000x4000)")
-    res = map_data.resolution or 5
-    room_px = map_data.room_pixels
 
     # ------------------------------------------------------------------
-    # Step 1 — build pixel color list + accumulate room centroids
+    # Steps 1-3 — static layer: floor, restricted zones, label tiles
     # ------------------------------------------------------------------
-    _ro_w = _ro_h = _ro_dx = _ro_dy = 0
-    raw = map_data.raw_pixels
-    colors: list[tuple[int, int, int]] = []
-    # rid → [sum_src_x, sum_src_y, count]  (source pixel space)
-    src_centroids: dict[int, list[int]] = {}
-    _has_room_names = bool(room_px is not None and map_data.room_outline_width and map_data.room_names)
-
-    if room_px is not None and map_data.room_outline_width and map_data.room_outline_height:
-        _ro_w = map_data.room_outline_width
-        _ro_h = map_data.room_outline_height
-        _ro_dx = round((map_data.origin_x - map_data.room_outline_origin_x) / res)
-        _ro_dy = round((map_data.origin_y - map_data.room_outline_origin_y) / res)
-        palette_len = len(_ROOM_PALETTE)
-        for py in range(height):
-            for px_x in range(width):
-                i = py * width + px_x
-                byte_pos = i >> 2
-                bit_pos = (i & 3) * 2
-                pv = (raw[byte_pos] >> bit_pos) & 3 if byte_pos < len(raw) else 0
-                rx, ry = px_x - _ro_dx, py - _ro_dy
-                if 0 <= rx < _ro_w and 0 <= ry < _ro_h:
-                    rpx = room_px[ry * _ro_w + rx]
-                    rid = rpx >> 2
-                    sub_type = rpx & 3
-                else:
-                    rid = sub_type = 0
-                if rid > 0:
-                    if sub_type == 0 or pv in (2, 3):
-                        color = _ROOM_PALETTE[1 + (rid - 1) % (palette_len - 1)]
-                    else:
-                        color = _PIXEL_COLORS.get(pv, (30, 30, 30))
-                else:
-                    color = _PIXEL_COLORS.get(pv, (30, 30, 30))
-                colors.append(color)
-                if _has_room_names and rid > 0 and rid in map_data.room_names:
-                    if rid not in src_centroids:
-                        src_centroids[rid] = [0, 0, 0]
-                    src_centroids[rid][0] += px_x
-                    src_centroids[rid][1] += py
-                    src_centroids[rid][2] += 1
-    else:
-        for i in range(width * height):
-            byte_pos = i >> 2
-            bit_pos = (i & 3) * 2
-            pv = (raw[byte_pos] >> bit_pos) & 3 if byte_pos < len(raw) else 0
-            colors.append(_PIXEL_COLORS.get(pv, (30, 30, 30)))
-
-    # ------------------------------------------------------------------
-    # Step 2 — create PIL image, Y-flip, scale
-    # ------------------------------------------------------------------
-    img: Image.Image = Image.new("RGB", (width, height))
-    img.putdata(colors)
-    img = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-
-    scale = min(max_px / max(width, height), 1.0)
-    out_w = max(1, round(width * scale))
-    out_h = max(1, round(height * scale))
-    if scale < 1.0:
-        img = img.resize((out_w, out_h), Image.Resampling.LANCZOS)
+    if base is None or not base.matches(map_data, max_px, palette):
+        base = MapBaseLayer(map_data, max_px, palette)
+    img: Image.Image = base.refresh()
+    out_w, out_h = base.size
+    _to_out = base.to_out
 
     draw = ImageDraw.Draw(img)
 
-    # Map pixel → output pixel (Y-flip baked in)
-    def _to_out(mx: int, my: int) -> tuple[int, int]:
-        return round(mx * scale), round((height - 1 - my) * scale)
-
-    # World cm → output pixel
-    def _world_to_out(wx: int, wy: int) -> tuple[int, int]:
-        return _to_out(
-            round((wx - map_data.origin_x) / res),
-            round((wy - map_data.origin_y) / res),
-        )
-
-    # Filled circle helper
-    def _circle(cx: float, cy: float, r: float, color: tuple[int, int, int]) -> None:
-        if r < 1.0:
-            draw.point((round(cx), round(cy)), fill=color)
-        else:
-            draw.ellipse([(cx - r, cy - r), (cx + r, cy + r)], fill=color)
-
-    # ------------------------------------------------------------------
-    # Step 3 — restricted zones
-    # ------------------------------------------------------------------
-    _BAN_MOP_COLOR = (255, 165, 0)
-    _ZONE_COLOR = (220, 50, 50)
-
-    for zone in map_data.ban_mop_zones:
-        pts = [_world_to_out(p[0], p[1]) for p in zone]
-        if len(pts) >= 2:
-            draw.polygon(pts, outline=_BAN_MOP_COLOR)
-
-    for zone in map_data.forbidden_zones:
-        pts = [_world_to_out(p[0], p[1]) for p in zone]
-        if len(pts) >= 2:
-            draw.polygon(pts, outline=_ZONE_COLOR)
-
-    for wall in map_data.virtual_walls:
-        draw.line(
-            [_world_to_out(wall[0][0], wall[0][1]), _world_to_out(wall[1][0], wall[1][1])],
-            fill=_ZONE_COLOR,
-        )
+    def _paste_sprite(kind: str, x: int, y: int) -> None:
+        sprite, mask = _overlay_sprite(kind, base.palette)
+        img.paste(sprite, (x - _SPRITE_ANCHOR, y - _SPRITE_ANCHOR), mask)
 
     # ------------------------------------------------------------------
     # Step 4 — dock icon (pixel-art house)
     # (labels drawn after trail in step 6 so they render on top)
     # ------------------------------------------------------------------
     if dock_pixel is not None:
-        dx, dy = _to_out(dock_pixel[0], dock_pixel[1])
-        _house_border = {
-            (nx, ny)
-            for ox, oy in _HOUSE_FILL
-            for nx, ny in ((ox + ddx, oy + ddy) for ddx in (-1, 0, 1) for ddy in (-1, 0, 1))
-            if (nx, ny) not in _HOUSE_FILL
-        }
-        for ox, oy in _house_border:
-            bpx, bpy = dx + ox, dy + oy
-            if 0 <= bpx < out_w and 0 <= bpy < out_h:
-                draw.point((bpx, bpy), fill=(100, 75, 0))
-        for ox, oy in _HOUSE_FILL:
-            bpx, bpy = dx + ox, dy + oy
-            if 0 <= bpx < out_w and 0 <= bpy < out_h:
-                draw.point((bpx, bpy), fill=(255, 215, 0))
-        for ox, oy in _HOUSE_DOOR:
-            bpx, bpy = dx + ox, dy + oy
-            if 0 <= bpx < out_w and 0 <= bpy < out_h:
-                draw.point((bpx, bpy), fill=(100, 75, 0))
+        _paste_sprite("dock", *_to_out(dock_pixel[0], dock_pixel[1]))
 
     # ------------------------------------------------------------------
     # Step 5 — cleaning trail
     # ------------------------------------------------------------------
-    _TRAIL = (255, 140, 0)
-    _MAX_TRAIL_JUMP_SQ = 400 * 400
     if robot_trail:
-        raw_pts = list(robot_trail)
-        out_pts = [_to_out(tx, ty) for tx, ty in raw_pts]
-        for i in range(len(raw_pts) - 1):
-            ddx = raw_pts[i + 1][0] - raw_pts[i][0]
-            ddy = raw_pts[i + 1][1] - raw_pts[i][1]
-            if ddx * ddx + ddy * ddy <= _MAX_TRAIL_JUMP_SQ:
-                draw.line([out_pts[i], out_pts[i + 1]], fill=_TRAIL)
+        for kind, pts in robot_trail.segments():
+            color = _TRAIL_COLORS.get(kind, _TRAIL_COLORS[PATH_SWEEP])
+            out_pts = [_to_out(tx, ty) for tx, ty in pts]
+            if len(out_pts) > 1:
+                draw.line(out_pts, fill=color)
         ox, oy = out_pts[-1]
         if 0 <= ox < out_w and 0 <= oy < out_h:
-            draw.point((ox, oy), fill=_TRAIL)
+            draw.point((ox, oy), fill=color)
 
     # ------------------------------------------------------------------
     # Step 6 — room name labels (after trail so labels render on top)
     # ------------------------------------------------------------------
-    if src_centroids:
-        try:
-            font: ImageFont.ImageFont | ImageFont.FreeTypeFont = ImageFont.load_default(size=9)
-        except TypeError:
-            font = ImageFont.load_default()
-        _LABEL_COLOR = (30, 30, 30)
-        _LABEL_BG = (255, 255, 255)
-        for rid, vals in src_centroids.items():
-            if vals[2] == 0:
-                continue
-            label = map_data.room_names[rid].upper()
-            if not label:
-                continue
-            ox, oy = _to_out(vals[0] // vals[2], vals[1] // vals[2])
-            bbox = draw.textbbox((0, 0), label, font=font)
-            tw = bbox[2] - bbox[0]
-            th = bbox[3] - bbox[1]
-            draw.rectangle(
-                [(ox - tw // 2 - 2, oy - th // 2 - 1), (ox + tw // 2 + 2, oy + th // 2 + 1)],
-                fill=_LABEL_BG,
-            )
-            draw.text((ox - tw // 2 - bbox[0], oy - th // 2 - bbox[1]), label, fill=_LABEL_COLOR, font=font)
+    for pos, tile in base.labels:
+        img.paste(tile, pos)
 
     # ------------------------------------------------------------------
     # Step 7 — robot marker + status badge
     # ------------------------------------------------------------------
     if robot_pixel is not None:
         orx, ory = _to_out(robot_pixel[0], robot_pixel[1])
-        if robot_style == "dot":
-            _circle(orx, ory, 5.0, (20, 20, 20))
-            _circle(orx, ory, 4.0, (55, 55, 55))
-        else:  # "googly" (default)
-            _circle(orx, ory, 5.0, (160, 70, 0))
-            _circle(orx, ory, 4.0, (255, 140, 0))
-            for ex, ey in ((-1, -1), (2, -1)):
-                _circle(orx + ex, ory + ey, 1.5, (255, 255, 255))
-                _circle(orx + ex, ory + ey, 0.6, (20, 20, 20))
-
+        _paste_sprite("dot" if robot_style == "dot" else "googly", orx, ory)
         if robot_status and robot_status in _STATUS_BADGE:
-            badge_color, icon_offsets = _STATUS_BADGE[robot_status]
-            bx, by = orx + 6, ory - 6
-            _circle(bx, by, 6.0, (30, 30, 30))
-            _circle(bx, by, 5.0, badge_color)
-            for ox2, oy2 in icon_offsets:
-                bpx, bpy = bx + ox2, by + oy2
-                if 0 <= bpx < out_w and 0 <= bpy < out_h:
-                    draw.point((bpx, bpy), fill=(20, 20, 20))
+            _paste_sprite(robot_status, orx + 6, ory - 6)
 
     # ------------------------------------------------------------------
     # Step 8 — encode PNG
@@ -427,10 +932,57 @@ def render_map_png(
 # Protocol parsing
 # ---------------------------------------------------------------------------
 
-def try_extract_map_data(hex_data: str) -> MapData | None:
+def _room_outline_fields(ro: Any) -> dict[str, Any]:
+    """MapData room-mask fields from a ``RoomOutline`` ({} when it has no pixels)."""
+    if not (ro.pixels and ro.pixel_size and ro.width and ro.height):
+        return {}
+    rp = ro.pixels
+    if len(rp) != ro.pixel_size:
+        rp = _lz4_block_decompress(rp, ro.pixel_size)
+    _LOGGER.debug("RoomOutline decoded: %dx%d origin=(%d,%d)", ro.width, ro.height, ro.origin.x, ro.origin.y)
+    return {
+        "room_pixels": rp,
+        "room_outline_width": ro.width,
+        "room_outline_height": ro.height,
+        "room_outline_origin_x": ro.origin.x,
+        "room_outline_origin_y": ro.origin.y,
+    }
+
+
+def _room_params_fields(params: Any) -> dict[str, Any]:
+    """MapData ``room_names`` from ``RoomParams`` (scene-type fallback labels)."""
+    room_names: dict[int, str] = {}
+    for room in params.rooms:
+        name = room.name.strip()
+        if not name:
+            name = _ROOM_SCENE_NAMES.get(room.scene.type, f"ROOM {room.id}")
+        room_names[room.id] = name
+    _LOGGER.debug("RoomParams room_names: %s", room_names)
+    return {"room_names": room_names}
+
+
+def _restricted_zone_fields(rz: Any) -> dict[str, Any]:
+    """MapData wall / no-go / no-mop fields from a ``RestrictedZone``."""
+    virtual_walls = [((w.p0.x, w.p0.y), (w.p1.x, w.p1.y)) for w in rz.virtual_walls]
+    forbidden_zones = [_quad_points(zone) for zone in rz.forbidden_zones]
+    ban_mop_zones = [_quad_points(zone) for zone in rz.ban_mop_zones]
+    _LOGGER.debug(
+        "RestrictedZone: %d walls, %d forbidden, %d ban-mop",
+        len(virtual_walls), len(forbidden_zones), len(ban_mop_zones),
+    )
+    return {
+        "virtual_walls": virtual_walls,
+        "forbidden_zones": forbidden_zones,
+        "ban_mop_zones": ban_mop_zones,
+    }
+
+
+def try_extract_map_data(hex_data: str, backup_first: bool = True) -> MapData | None:
     """Try to extract MapData from biz/ channel hex data.
 
-    Attempts MapBackup first (map-edit snapshot), then plain Map (cleaning stream).
+    Attempts MapBackup first (map-edit snapshot), then plain Map (cleaning stream);
+    ``backup_first=False`` reverses that for frames known to be on the Map channel.
+    A plain Map sent as a P-frame comes back with ``incremental=True``.
     """
     try:
         proto_bytes = _hex_to_proto_bytes(hex_data)
@@ -438,58 +990,36 @@ def try_extract_map_data(hex_data: str) -> MapData | None:
         return None
 
     map_msg = None
-    room_pixels: bytes | None = None
-    ro_width = ro_height = ro_origin_x = ro_origin_y = 0
-    room_names: dict[int, str] = {}
-    virtual_walls: list[tuple[tuple[int, int], tuple[int, int]]] = []
-    forbidden_zones: list[list[tuple[int, int]]] = []
-    ban_mop_zones: list[list[tuple[int, int]]] = []
+    incremental = False
+    extra: dict[str, Any] = {}
 
-    try:
-        backup = stream_pb2.MapBackup().FromString(proto_bytes)
-        if backup.map.pixels and backup.map.pixel_size:
-            map_msg = backup.map
-
-            ro = backup.rooms
-            if ro.pixels and ro.pixel_size and ro.width and ro.height:
-                rp = ro.pixels
-                if len(rp) != ro.pixel_size:
-                    rp = _lz4_block_decompress(rp, ro.pixel_size)
-                room_pixels = rp
-                ro_width, ro_height = ro.width, ro.height
-                ro_origin_x, ro_origin_y = ro.origin.x, ro.origin.y
-                _LOGGER.debug("RoomOutline decoded: %dx%d origin=(%d,%d)", ro_width, ro_height, ro_origin_x, ro_origin_y)
-
-            for room in backup.room_params.rooms:
-                name = room.name.strip()
-                if not name:
-                    name = _ROOM_SCENE_NAMES.get(room.scene.type, f"ROOM {room.id}")
-                room_names[room.id] = name
-            _LOGGER.debug("RoomParams room_names: %s", room_names)
-
-            rz = backup.restricted_zone
-            for wall in rz.virtual_walls:
-                virtual_walls.append(((wall.p0.x, wall.p0.y), (wall.p1.x, wall.p1.y)))
-            for zone in rz.forbidden_zones:
-                forbidden_zones.append(_quad_points(zone))
-            for zone in rz.ban_mop_zones:
-                ban_mop_zones.append(_quad_points(zone))
-
-            _LOGGER.debug(
-                "RestrictedZone: %d walls, %d forbidden, %d ban-mop",
-                len(virtual_walls), len(forbidden_zones), len(ban_mop_zones),
-            )
-    except Exception:
-        pass
+    def _as_backup() -> None:
+        nonlocal map_msg
+        try:
+            backup = stream_pb2.MapBackup().FromString(proto_bytes)
+            if backup.map.pixels and backup.map.pixel_size:
+                map_msg = backup.map
+                extra.update(_room_outline_fields(backup.rooms))
+                extra.update(_room_params_fields(backup.room_params))
+                extra.update(_restricted_zone_fields(backup.restricted_zone))
+        except Exception:
+            pass
 
-    if map_msg is None:
+    def _as_map() -> None:
+        nonlocal map_msg, incremental
         try:
             m = stream_pb2.Map().FromString(proto_bytes)
             if m.pixels and m.pixel_size:
                 map_msg = m
+                incremental = m.frame == stream_pb2.Map.P
         except Exception:
             pass
 
+    for attempt in (_as_backup, _as_map) if backup_first else (_as_map, _as_backup):
+        attempt()
+        if map_msg is not None:
+            break
+
     if map_msg is None or not map_msg.info.width or not map_msg.info.height:
         return None
 
@@ -502,9 +1032,10 @@ def try_extract_map_data(hex_data: str) -> MapData | None:
             return None
 
     _LOGGER.debug(
-        "Map decoded: %dx%d id=%d res=%d origin=(%d,%d)",
+        "Map decoded: %dx%d id=%d res=%d origin=(%d,%d) frame=%s",
         map_msg.info.width, map_msg.info.height, map_msg.id,
         map_msg.info.resolution, map_msg.info.origin.x, map_msg.info.origin.y,
+        "P" if incremental else "I",
     )
 
     return MapData(
@@ -514,18 +1045,61 @@ def try_extract_map_data(hex_data: str) -> MapData | None:
         origin_x=map_msg.info.origin.x,
         origin_y=map_msg.info.origin.y,
         resolution=map_msg.info.resolution or 5,
-        room_pixels=room_pixels,
-        room_outline_width=ro_width,
-        room_outline_height=ro_height,
-        room_outline_origin_x=ro_origin_x,
-        room_outline_origin_y=ro_origin_y,
-        room_names=room_names,
-        virtual_walls=virtual_walls,
-        forbidden_zones=forbidden_zones,
-        ban_mop_zones=ban_mop_zones,
+        incremental=incremental,
+        **extra,
     )
 
 
+_MAP_FIELD_DECODERS: dict[str, tuple[Any, Any]] = {
+    "room_outline": (stream_pb2.RoomOutline, _room_outline_fields),
+    "room_params": (stream_pb2.RoomParams, _room_params_fields),
+    "restricted_zone": (stream_pb2.RestrictedZone, _restricted_zone_fields),
+}
+
+
+def try_extract_map_fields(kind: str, hex_data: str) -> dict[str, Any] | None:
+    """Decode a routed room_outline / room_params / restricted_zone frame.
+
+    Returns the MapData field overrides it carries (for ``dataclasses.replace``),
+    or None if ``kind`` is not one of those channels or the frame is empty.
+    """
+    decoder = _MAP_FIELD_DECODERS.get(kind)
+    if decoder is None:
+        return None
+    message_cls, to_fields = decoder
+    try:
+        proto_bytes = _hex_to_proto_bytes(hex_data)
+        return to_fields(message_cls().FromString(proto_bytes)) or None
+    except Exception as exc:
+        _LOGGER.debug("biz/ %s frame failed to decode: %s", kind, exc)
+        return None
+
+
+def try_extract_channel_table(hex_data: str) -> dict[int, str] | None:
+    """Extract ``{channel_id: kind}`` from a biz/ ``Metadata`` frame, or None.
+
+    ``kind`` is the ``Metadata.ChanIds`` field name (``map_data``,
+    ``dynamic_data``, ``room_outline``, ...). Other small frames can parse as
+    Metadata without raising, so only a table naming at least two distinct
+    channels is accepted.
+    """
+    try:
+        proto_bytes = _hex_to_proto_bytes(hex_data)
+        meta = stream_pb2.Metadata().FromString(proto_bytes)
+    except Exception:
+        return None
+    if not meta.HasField("chan_ids"):
+        return None
+    table = {
+        value: fd.name
+        for fd, value in meta.chan_ids.ListFields()
+        if isinstance(value, int) and 0 < value <= 0xFFFF
+    }
+    if len(table) < 2 or len(table) != len(meta.chan_ids.ListFields()):
+        return None
+    return table
+
+
 def try_extract_map_description(hex_data: str) -> tuple[int, str] | None:
     """Extract ``(map_id, name)`` from a biz/ ``MapDescription`` frame, or None.
 
@@ -550,6 +1124,33 @@ def try_extract_map_description(hex_data: str) -> tuple[int, str] | None:
     return None
 
 
+def try_extract_path_points(hex_data: str) -> list[tuple[int, int, int]] | None:
+    """Decode a biz/ ``Path`` frame into ``(x_cm, y_cm, flags)`` points, or None.
+
+    ``Metadata.ChanIds.path`` names a ``message Path`` that ``stream.proto`` does
+    not define; the clean-record ``PathData`` wrapper (``repeated PathPoint``)
+    matches the incremental frames. ``xy`` packs two signed 16-bit coordinates
+    in the same world frame as ``DynamicData`` poses.
+    """
+    try:
+        proto_bytes = _hex_to_proto_bytes(hex_data)
+        path = clean_record_pb2.CleanRecordData.PathData().FromString(proto_bytes)
+    except Exception:
+        return None
+    if not path.points:
+        return None
+    points = []
+    for pt in path.points:
+        x = pt.xy & 0xFFFF
+        y = (pt.xy >> 16) & 0xFFFF
+        points.append((
+            x - 0x10000 if x & 0x8000 else x,
+            y - 0x10000 if y & 0x8000 else y,
+            pt.flags,
+        ))
+    return points
+
+
 def try_decode_as_dynamic_data(hex_data: str) -> tuple[int, int, int] | None:
     """Decode channel as DynamicData robot pose. Returns (x_cm, y_cm, theta_crad) or None."""
     try:
@@ -563,6 +1164,100 @@ def try_decode_as_dynamic_data(hex_data: str) -> tuple[int, int, int] | None:
     return None
 
 
+@dataclass
+class BizFrame:
+    """One decoded biz/ frame, ready to be applied on the event loop.
+
+    ``kind`` is ``channels`` (Metadata table), ``map_description``, ``map``
+    (Map / MapBackup), ``repeat`` (unchanged resend, ``value`` = the skipped
+    kind) or a ``Metadata.ChanIds`` name (``dynamic_data``, ``path``, routed
+    map fields). ``fingerprint`` is set for frames that replace map state.
+    """
+
+    channel_id: int
+    kind: str
+    value: Any = None
+    fingerprint: int | None = None
+
+
+def payload_fingerprint(hex_data: str) -> int:
+    """64-bit digest of a frame's hex payload.
+
+    Stable across processes (unlike the salted ``hash()`` of a str), since
+    frames are decoded both on the event loop and in map worker processes.
+    """
+    digest = hashlib.blake2b(hex_data.encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def decode_biz_frame(
+    payload: bytes,
+    channels: dict[int, str],
+    map_chan_id: int | None = None,
+    fingerprints: dict[str, int] | None = None,
+) -> BizFrame | None:
+    """Parse and decode one biz/ payload; pure, so it can run off the event loop.
+
+    ``channels`` is the learned channel table, ``map_chan_id`` the last channel
+    a map arrived on and ``fingerprints`` the :func:`payload_fingerprint` of
+    the hex payload last applied per kind (a match is returned as ``repeat``
+    without decoding).
+    Without a channel table the frame kind is guessed by size and trial decode.
+    """
+    result = parse_biz_protocol41(payload)
+    if result is None:
+        return None
+    channel_id, hex_data = result
+    fingerprints = fingerprints or {}
+
+    def _unless_repeat(kind: str, decode: Any) -> BizFrame | None:
+        fingerprint = payload_fingerprint(hex_data)
+        if fingerprints.get(kind) == fingerprint:
+            return BizFrame(channel_id, "repeat", kind)
+        value = decode()
+        return None if value is None else BizFrame(channel_id, kind, value, fingerprint)
+
+    # Once the device has announced its channel table (Metadata.ChanIds),
+    # each frame goes straight to the decoder for its channel.
+    if (kind := channels.get(channel_id)) is not None:
+        value: Any
+        if kind == "dynamic_data":
+            value = try_decode_as_dynamic_data(hex_data)
+        elif kind == "path":
+            value = try_extract_path_points(hex_data)
+        elif kind == "map_data":
+            return _unless_repeat("map", lambda: try_extract_map_data(hex_data, backup_first=False))
+        else:
+            return _unless_repeat(kind, lambda: try_extract_map_fields(kind, hex_data))
+        return None if value is None else BizFrame(channel_id, kind, value)
+
+    if len(hex_data) < 200:
+        if (table := try_extract_channel_table(hex_data)) is not None:
+            return BizFrame(channel_id, "channels", table)
+
+    # Map discovery: a small single-shot MapDescription frame carries the
+    # active map's id + friendly name (delivered on a map switch).
+    if (desc := try_extract_map_description(hex_data)) is not None:
+        return BizFrame(channel_id, "map_description", desc)
+
+    if channels:
+        # Off-table channels only carry one-shot snapshots (MapBackup).
+        return _unless_repeat("map", lambda: try_extract_map_data(hex_data))
+
+    # No channel table yet — fall back to guessing by size and trial decode.
+    # Small channels (<200 hex chars = ~100 bytes): try as robot pose (DynamicData).
+    if len(hex_data) < 200:
+        pose = try_decode_as_dynamic_data(hex_data)
+        return None if pose is None else BizFrame(channel_id, "dynamic_data", pose)
+
+    # Large channels: try as map data.
+    # Always attempt for: the cached map channel, unknown channel, or any >15 KB channel
+    # (map arrives on a different channel during cleaning vs. map editing).
+    if map_chan_id is None or channel_id == map_chan_id or len(hex_data) > 15000:
+        return _unless_repeat("map", lambda: try_extract_map_data(hex_data))
+    return None
+
+
 def parse_biz_protocol41(payload: bytes) -> tuple[int, str] | None:
     """Parse a biz/ MQTT message. Returns (channel_id, hex_data) or None."""
     try:
@@ -8,6 +8,7 @@ Uses HMAC-SHA256 request signing and RSA-encrypted loginEx flow.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -87,6 +88,8 @@ class TuyaCloudClient:
         self.region = region
         self.endpoint = TUYA_REGIONS.get(region, TUYA_REGIONS["EU"])
         self.sid: str | None = None
+        # groupIds from tuya.m.location.list, cached for the session.
+        self._group_ids: list[str] | None = None
         # Match upstream JS: randomize('a0', 44) — 44-char lowercase alphanumeric
         self._device_id = "".join(
             random.choices(string.ascii_lowercase + string.digits, k=44)
@@ -213,24 +216,27 @@ class TuyaCloudClient:
         return body.get("result")
 
     async def get_device_list(self) -> list[dict[str, Any]]:
-        """Fetch all devices from Tuya Cloud (groups + shared)."""
-        groups = await self.request("tuya.m.location.list")
-        all_devices: list[dict[str, Any]] = []
+        """Fetch all devices from Tuya Cloud (groups + shared).
 
-        for group in groups or []:
-            gid = group.get("groupId")
-            if not gid:
-                continue
+        The group (home) ids are fetched once per session and cached; the
+        group and shared device lists are requested concurrently.
+        """
+        if self._group_ids is None:
+            groups = await self.request("tuya.m.location.list")
+            # Upstream only processes the first group
+            self._group_ids = [g["groupId"] for g in groups or [] if g.get("groupId")][:1]
+
+        requests = [
+            self.request("tuya.m.my.group.device.list", gid=gid) for gid in self._group_ids
+        ]
+        # Shared devices are account-level, not group-scoped
+        requests.append(self.request("tuya.m.my.shared.device.list"))
+        *group_devices, shared = await asyncio.gather(*requests)
 
-            devices = await self.request(
-                "tuya.m.my.group.device.list", gid=gid
-            )
+        all_devices: list[dict[str, Any]] = []
+        for gid, devices in zip(self._group_ids, group_devices):
             all_devices.extend(devices or [])
             _LOGGER.debug("Tuya group %s: %d devices", gid, len(devices or []))
-            break  # Upstream only processes first group
-
-        # Shared devices are account-level, not group-scoped
-        shared = await self.request("tuya.m.my.shared.device.list")
         all_devices.extend(shared or [])
 
         _LOGGER.debug("Tuya get_device_list: total %d devices", len(all_devices))
@@ -9,12 +9,12 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator, VacuumState
+from .entity import async_add_coordinator_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,25 +28,26 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Setup binary sensor entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding binary sensors for %s", coordinator.device_name)
-
-        entities.append(
-            RoboVacBinarySensor(
-                coordinator,
-                "charging",
-                "Charging",
-                lambda s: s.charging,
-                device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding binary sensors for %s", coordinator.device_name)
+
+            entities.append(
+                RoboVacBinarySensor(
+                    coordinator,
+                    "charging",
+                    "Charging",
+                    lambda s: s.charging,
+                    device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
+                )
             )
-        )
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 class RoboVacBinarySensor(CoordinatorEntity[EufyCleanCoordinator], BinarySensorEntity):
@@ -7,13 +7,17 @@ from typing import Any
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator
-from .entity import API_TYPE_NOVEL, API_TYPE_SCALAR, filter_supported_entities
+from .entity import (
+    API_TYPE_NOVEL,
+    API_TYPE_SCALAR,
+    async_add_coordinator_entities,
+    filter_supported_entities,
+)
 from .proto.cloud.consumable_pb2 import ConsumableRequest
 
 _LOGGER = logging.getLogger(__name__)
@@ -85,91 +89,92 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Setup button entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding buttons for %s", coordinator.device_name)
-
-        # Dock and accessory buttons require protobuf DPS (173/168) and are not
-        # available on legacy (Tuya Cloud plain-value) devices.
-        if coordinator.api_type == "legacy":
-            continue
-
-        buttons = [
-            # Vacuum control buttons — mirrors the Eufy app's main screen controls.
-            RoboVacButton(coordinator, "Start Cleaning", "_start_cleaning", "start_auto"),
-            RoboVacButton(coordinator, "Pause", "_pause", "pause"),
-            RoboVacButton(coordinator, "Return to Base", "_return_to_base", "return_to_base"),
-            # Station buttons (wash/dry/dust) — scalar (Tuya) devices like the
-            # G50 are vacuum-only and have no station.
-            RoboVacButton(
-                coordinator,
-                "Dry Mop",
-                "_dry_mop",
-                "go_dry",
-                supported_api_types=(API_TYPE_NOVEL,),
-            ),
-            RoboVacButton(
-                coordinator,
-                "Wash Mop",
-                "_wash_mop",
-                "go_selfcleaning",
-                supported_api_types=(API_TYPE_NOVEL,),
-            ),
-            RoboVacButton(
-                coordinator,
-                "Empty Dust Bin",
-                "_empty_dust_bin",
-                "collect_dust",
-                supported_api_types=(API_TYPE_NOVEL,),
-            ),
-            RoboVacButton(
-                coordinator,
-                "Stop Dry Mop",
-                "_stop_dry_mop",
-                "stop_dry",
-                supported_api_types=(API_TYPE_NOVEL,),
-            ),
-            # Detangle roller brush — scalar/Tuya devices only (DPS 153).
-            RoboVacButton(
-                coordinator,
-                "Detangle Roller Brush",
-                "_detangle_brush",
-                "detangle_brush",
-                "mdi:broom",
-                category=EntityCategory.CONFIG,
-                supported_api_types=(API_TYPE_SCALAR,),
-            ),
-        ]
-
-        for (
-            name,
-            suffix,
-            reset_type,
-            icon,
-            scalar_key,
-            supported,
-        ) in _ACCESSORY_RESET_BUTTONS:
-            buttons.append(
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding buttons for %s", coordinator.device_name)
+
+            # Dock and accessory buttons require protobuf DPS (173/168) and are not
+            # available on legacy (Tuya Cloud plain-value) devices.
+            if coordinator.api_type == "legacy":
+                continue
+
+            buttons = [
+                # Vacuum control buttons — mirrors the Eufy app's main screen controls.
+                RoboVacButton(coordinator, "Start Cleaning", "_start_cleaning", "start_auto"),
+                RoboVacButton(coordinator, "Pause", "_pause", "pause"),
+                RoboVacButton(coordinator, "Return to Base", "_return_to_base", "return_to_base"),
+                # Station buttons (wash/dry/dust) — scalar (Tuya) devices like the
+                # G50 are vacuum-only and have no station.
                 RoboVacButton(
                     coordinator,
-                    name,
-                    suffix,
-                    "reset_accessory",
-                    icon,
+                    "Dry Mop",
+                    "_dry_mop",
+                    "go_dry",
+                    supported_api_types=(API_TYPE_NOVEL,),
+                ),
+                RoboVacButton(
+                    coordinator,
+                    "Wash Mop",
+                    "_wash_mop",
+                    "go_selfcleaning",
+                    supported_api_types=(API_TYPE_NOVEL,),
+                ),
+                RoboVacButton(
+                    coordinator,
+                    "Empty Dust Bin",
+                    "_empty_dust_bin",
+                    "collect_dust",
+                    supported_api_types=(API_TYPE_NOVEL,),
+                ),
+                RoboVacButton(
+                    coordinator,
+                    "Stop Dry Mop",
+                    "_stop_dry_mop",
+                    "stop_dry",
+                    supported_api_types=(API_TYPE_NOVEL,),
+                ),
+                # Detangle roller brush — scalar/Tuya devices only (DPS 153).
+                RoboVacButton(
+                    coordinator,
+                    "Detangle Roller Brush",
+                    "_detangle_brush",
+                    "detangle_brush",
+                    "mdi:broom",
                     category=EntityCategory.CONFIG,
-                    supported_api_types=supported,
-                    reset_type=reset_type,
-                    scalar_key=scalar_key,
+                    supported_api_types=(API_TYPE_SCALAR,),
+                ),
+            ]
+
+            for (
+                name,
+                suffix,
+                reset_type,
+                icon,
+                scalar_key,
+                supported,
+            ) in _ACCESSORY_RESET_BUTTONS:
+                buttons.append(
+                    RoboVacButton(
+                        coordinator,
+                        name,
+                        suffix,
+                        "reset_accessory",
+                        icon,
+                        category=EntityCategory.CONFIG,
+                        supported_api_types=supported,
+                        reset_type=reset_type,
+                        scalar_key=scalar_key,
+                    )
                 )
-            )
 
-        entities.extend(filter_supported_entities(coordinator, buttons))
+            entities.extend(filter_supported_entities(coordinator, buttons))
+
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 class RoboVacButton(CoordinatorEntity[EufyCleanCoordinator], ButtonEntity):
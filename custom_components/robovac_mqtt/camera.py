@@ -1,21 +1,32 @@
 """Camera platform for Eufy robot vacuum floor map."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
-from homeassistant.components.camera import Camera
+from aiohttp import web
+from homeassistant.components.camera import CONTENT_TYPE_MULTIPART, Camera
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_MAP_MAX_FPS, DEFAULT_MAP_MAX_FPS, DOMAIN
 from .coordinator import EufyCleanCoordinator
-from .entity import API_TYPE_NOVEL, filter_supported_entities
+from .entity import (
+    API_TYPE_NOVEL,
+    async_add_coordinator_entities,
+    filter_supported_entities,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# An idle stream re-sends its last frame this often, so a viewer that has
+# gone away is noticed (the write fails) even when the map never changes.
+_STREAM_KEEPALIVE = 30.0
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -23,12 +34,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Eufy map camera entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-    entities = []
-    for coordinator in coordinators:
-        entities.extend(filter_supported_entities(coordinator, [EufyMapCamera(coordinator)]))
-    async_add_entities(entities)
+    max_fps = float(config_entry.options.get(CONF_MAP_MAX_FPS, DEFAULT_MAP_MAX_FPS))
+
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+        for coordinator in coordinators:
+            entities.extend(
+                filter_supported_entities(coordinator, [EufyMapCamera(coordinator, max_fps)])
+            )
+        async_add_entities(entities)
+
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 class EufyMapCamera(CoordinatorEntity[EufyCleanCoordinator], Camera):
@@ -39,25 +56,76 @@ class EufyMapCamera(CoordinatorEntity[EufyCleanCoordinator], Camera):
     _attr_name = "Map"
     _attr_content_type = "image/png"
 
-    def __init__(self, coordinator: EufyCleanCoordinator) -> None:
+    def __init__(
+        self, coordinator: EufyCleanCoordinator, max_fps: float = DEFAULT_MAP_MAX_FPS
+    ) -> None:
         CoordinatorEntity.__init__(self, coordinator)
         Camera.__init__(self)
         self._attr_unique_id = f"{coordinator.device_id}_map"
         self._attr_device_info = coordinator.device_info
+        self._attr_frame_interval = 1 / max_fps if max_fps > 0 else 0.0
+        self._signal = f"{DOMAIN}_{coordinator.device_id}_map_updated"
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
-        return self.coordinator.map_image
+        return await self.coordinator.async_get_map_image(width, height)
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Push a frame whenever the map is re-rendered, at most once per frame_interval.
+
+        Nothing is fetched or sent while the map does not change, apart from
+        a keepalive copy of the last frame every ``_STREAM_KEEPALIVE`` seconds.
+        """
+        updated = asyncio.Event()
+
+        @callback
+        def _wake() -> None:
+            updated.set()
+
+        unsub = async_dispatcher_connect(self.hass, self._signal, _wake)
+        release_viewer = self.coordinator.async_add_map_viewer()
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
+        try:
+            await response.prepare(request)
+            last_image: bytes | None = None
+            while True:
+                sent = time.monotonic()
+                updated.clear()
+                image = await self.coordinator.async_get_map_image()
+                if image:
+                    # Chrome shows the n-1 frame, so the first one goes out twice.
+                    for _ in range(2 if last_image is None else 1):
+                        await response.write(
+                            b"--frameboundary\r\nContent-Type: "
+                            + self.content_type.encode()
+                            + b"\r\nContent-Length: %d\r\n\r\n" % len(image)
+                            + image
+                            + b"\r\n"
+                        )
+                    last_image = image
+                try:
+                    async with asyncio.timeout(_STREAM_KEEPALIVE):
+                        await updated.wait()
+                except TimeoutError:
+                    continue
+                delay = sent + self.frame_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        except ConnectionResetError:
+            _LOGGER.debug("%s: map stream viewer disconnected", self.entity_id)
+        finally:
+            unsub()
+            release_viewer()
+        return response
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{DOMAIN}_{self.coordinator.device_id}_map_updated",
-                self._handle_map_update,
-            )
+            async_dispatcher_connect(self.hass, self._signal, self._handle_map_update)
         )
 
     @callback
@@ -20,14 +20,22 @@ from voluptuous import Required, Schema
 
 from .api.cloud import EufyLogin
 from .const import (
+    CONF_CLOUD_POLL_POLICY,
     CONF_LOCAL_DEVICES,
     CONF_LOCAL_HOST,
     CONF_LOCAL_VERSION,
+    CONF_MAP_ENGINE,
+    CONF_MAP_IMAGE_MODE,
+    CONF_MAP_MAX_FPS,
     CONF_MAP_MAX_PX,
     CONF_NOTIFY_DESKTOP,
     CONF_NOTIFY_MOBILE_SERVICE,
     CONF_ROBOT_STYLE,
     CONF_ROOM_NAMES,
+    DEFAULT_CLOUD_POLL_POLICY,
+    DEFAULT_MAP_ENGINE,
+    DEFAULT_MAP_IMAGE_MODE,
+    DEFAULT_MAP_MAX_FPS,
     DEFAULT_MAP_MAX_PX,
     DEFAULT_NOTIFY_DESKTOP,
     DEFAULT_NOTIFY_MOBILE_SERVICE,
@@ -239,6 +247,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         opts = self._config_entry.options
         current_max_px = str(opts.get(CONF_MAP_MAX_PX, DEFAULT_MAP_MAX_PX))
+        current_max_fps = str(opts.get(CONF_MAP_MAX_FPS, DEFAULT_MAP_MAX_FPS))
+        current_image_mode = opts.get(CONF_MAP_IMAGE_MODE, DEFAULT_MAP_IMAGE_MODE)
+        current_map_engine = opts.get(CONF_MAP_ENGINE, DEFAULT_MAP_ENGINE)
+        current_cloud_poll_policy = opts.get(
+            CONF_CLOUD_POLL_POLICY, DEFAULT_CLOUD_POLL_POLICY
+        )
         current_robot_style = opts.get(CONF_ROBOT_STYLE, DEFAULT_ROBOT_STYLE)
         current_notify_desktop = opts.get(CONF_NOTIFY_DESKTOP, DEFAULT_NOTIFY_DESKTOP)
         current_notify_mobile_service = opts.get(
@@ -271,6 +285,46 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         mode=selector.SelectSelectorMode.LIST,
                     )
                 ),
+                VOptional(CONF_MAP_MAX_FPS, default=current_max_fps): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value="0.5", label="Every 2 s"),
+                            selector.SelectOptionDict(value="1.0", label="1 per second (default)"),
+                            selector.SelectOptionDict(value="2.0", label="2 per second"),
+                            selector.SelectOptionDict(value="5.0", label="5 per second"),
+                        ],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+                VOptional(CONF_MAP_IMAGE_MODE, default=current_image_mode): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value="smooth", label="Smooth (default)"),
+                            selector.SelectOptionDict(value="palette", label="Indexed colour (smaller, faster)"),
+                        ],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+                VOptional(CONF_MAP_ENGINE, default=current_map_engine): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value="thread", label="Background thread (default)"),
+                            selector.SelectOptionDict(value="process", label="Worker processes (multi-core)"),
+                        ],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+                VOptional(
+                    CONF_CLOUD_POLL_POLICY, default=current_cloud_poll_policy
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value="adaptive", label="Follow robot activity (default)"),
+                            selector.SelectOptionDict(value="fixed", label="Every 30 s"),
+                        ],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
                 VOptional(CONF_ROBOT_STYLE, default=current_robot_style): selector.SelectSelector(
                     selector.SelectSelectorConfig(
                         options=[
@@ -12,6 +12,14 @@ DEVICES: Final = "devices"
 # Options keys
 CONF_MAP_MAX_PX: Final = "map_max_px"
 DEFAULT_MAP_MAX_PX: Final = 512
+CONF_MAP_MAX_FPS: Final = "map_max_fps"
+DEFAULT_MAP_MAX_FPS: Final = 1.0
+CONF_MAP_IMAGE_MODE: Final = "map_image_mode"
+DEFAULT_MAP_IMAGE_MODE: Final = "smooth"
+CONF_MAP_ENGINE: Final = "map_engine"
+DEFAULT_MAP_ENGINE: Final = "thread"
+CONF_CLOUD_POLL_POLICY: Final = "cloud_poll_policy"
+DEFAULT_CLOUD_POLL_POLICY: Final = "adaptive"
 
 CONF_ROBOT_STYLE: Final = "robot_style"
 DEFAULT_ROBOT_STYLE: Final = "googly"
@@ -4,8 +4,10 @@ import asyncio
 import base64
 import json
 import logging
+import re
 import time
-from dataclasses import replace
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
 from typing import Any
 
@@ -35,32 +37,85 @@ from .api.legacy_commands import build_legacy_command
 from .api.legacy_parser import update_state_legacy
 from .api.local_tuya import LocalTuyaClient, LocalTuyaError
 from .api.map_stream import (
+    PATH_BREAK,
+    PATH_HIDE,
+    PATH_SHOW_TRAJECTORY,
+    PATH_TYPE_MASK,
+    BizFrame,
+    MapBaseLayer,
     MapData,
-    parse_biz_protocol41,
+    TrailBuffer,
+    apply_map_patch,
+    decode_biz_frame,
     render_map_png,
-    try_decode_as_dynamic_data,
-    try_extract_map_data,
-    try_extract_map_description,
 )
 from .api.parser import update_state
 from .const import (
+    CONF_CLOUD_POLL_POLICY,
+    CONF_MAP_ENGINE,
+    CONF_MAP_IMAGE_MODE,
+    CONF_MAP_MAX_FPS,
     CONF_MAP_MAX_PX,
     CONF_NOTIFY_DESKTOP,
     CONF_NOTIFY_MOBILE_SERVICE,
     CONF_ROBOT_STYLE,
+    DEFAULT_CLOUD_POLL_POLICY,
+    DEFAULT_MAP_ENGINE,
+    DEFAULT_MAP_IMAGE_MODE,
+    DEFAULT_MAP_MAX_FPS,
     DEFAULT_MAP_MAX_PX,
     DEFAULT_NOTIFY_DESKTOP,
     DEFAULT_NOTIFY_MOBILE_SERVICE,
     DEFAULT_ROBOT_STYLE,
     DOMAIN,
 )
+from .map_engine import MapEngine, MapLayer, RemoteMapLayer, decode_biz_timed
+from .map_storage import (
+    async_load_map_blob,
+    async_load_trail_log,
+    async_remove_map_blob,
+    async_save_map_blob,
+    async_write_trail_log,
+    map_blob_path,
+    map_data_from_store,
+    map_meta_to_store,
+    trail_log_path,
+)
 from .models import VacuumState
+from .render_scheduler import RenderJob, RenderScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 _CLOUD_POLL_INTERVAL = timedelta(seconds=30)
+# "adaptive" cloud polling: faster while the robot moves, slower once it is
+# docked and full, and a short burst after a command to pick up its effect.
+_CLOUD_POLL_ACTIVE = timedelta(seconds=10)
+_CLOUD_POLL_IDLE = timedelta(minutes=5)
+_CLOUD_POLL_BURST = timedelta(seconds=5)
+_CLOUD_POLL_BURST_COUNT = 3
 _MAX_BACKOFF_INTERVAL = timedelta(minutes=5)
 _FAILURE_THRESHOLD = 5  # Raise UpdateFailed after this many consecutive failures
+_MAP_THUMBNAIL_PX = 256  # smallest camera image pyramid level
+_MAP_CACHE_SIZE = 4  # decoded maps kept in memory for instant map switching
+# Renders are deferred unless the map was requested this recently (or is streamed).
+_MAP_VIEWER_TIMEOUT = 60.0
+# Applied map frames are written to the map file at most this often.
+_MAP_SAVE_DELAY = 30.0
+# Store writes are coalesced: bursts of map / segment updates become one write.
+_STORE_SAVE_DELAY = 10.0
+_TRAIL_LOG_BATCH = 64  # new trail points per trail log append
+# biz/ payloads this small are decoded inline; larger ones go to the worker.
+_BIZ_INLINE_MAX = 4096
+_BIZ_CHANNEL_RE = re.compile(rb'channel_id\\*"\s*:\s*(\d+)')
+# Incremental channels: every frame counts (Path points, Map P-frames each
+# patching their own box), so they queue in order instead of latest-wins.
+_BIZ_QUEUED_KINDS = frozenset({"path", "map_data"})
+
+
+def _biz_channel_id(payload: bytes) -> int:
+    """Sniff a biz/ payload's channel id without parsing it (-1 if absent)."""
+    match = _BIZ_CHANNEL_RE.search(payload)
+    return int(match.group(1)) if match else -1
 
 
 def _px_dist(a: tuple[int, int], b: tuple[int, int]) -> float:
@@ -68,6 +123,15 @@ def _px_dist(a: tuple[int, int], b: tuple[int, int]) -> float:
     return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
 
 
+@dataclass
+class _MapSlot:
+    """A saved map's decoded grid, static layers and dock position."""
+
+    map_data: MapData
+    bases: dict[int, MapLayer] = field(default_factory=dict)
+    dock_pixel: tuple[int, int] | None = None
+
+
 class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
     """Coordinator to manage Eufy Clean device connection and state."""
 
@@ -134,29 +198,91 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
         self.data = VacuumState(device_model=self.device_model, api_type=self.api_type)
         self._consecutive_cloud_failures: int = 0
         self._base_poll_interval: timedelta | None = update_interval
+        self._cloud_poll_burst: int = 0  # fast polls left after a command
         self._dock_idle_cancel: CALLBACK_TYPE | None = (
             None  # Timer for dock IDLE debounce
         )
         self._segment_update_cancel: CALLBACK_TYPE | None = (
             None  # Timer for segment updates debounce
         )
+        self._cloud_unsub: CALLBACK_TYPE | None = None
         self._pending_dock_status: str | None = None
         self.last_seen_segments: list[Any] | None = None
         # Discovered saved maps {cloud_mapid: name}, learned from MapDescription
         # frames on the biz/ stream and persisted; backs the Active Map selector.
         self.last_seen_maps: dict[int, str] = {}
         self._store = Store(hass, 1, f"{DOMAIN}.{self.device_id}")
+        # In-memory copy of the Store; keys in _store_dirty are rebuilt from
+        # the live attributes when the delayed write runs.
+        self._store_data: dict[str, Any] = {}
+        self._store_dirty: set[str] = set()
         self._map_data_chan_id: int | None = None
+        # {channel_id: Metadata.ChanIds field name} once the device announces it.
+        self._biz_channels: dict[int, str] = {}
+        # Routed room/zone fields that arrived before the first map frame.
+        self._pending_map_fields: dict[str, Any] = {}
+        # payload_fingerprint() of the hex payload last applied per kind
+        # ("map" for Map / MapBackup, otherwise the channel kind); resends of
+        # it are skipped.
+        self._frame_fingerprints: dict[str, int] = {}
+        self.skipped_map_frames = 0
+        # Large biz/ payloads waiting for the decode worker, by channel id.
+        self._biz_slots: dict[int, list[bytes]] = {}
+        self._biz_decoding: int | None = None  # channel of the frame in the worker
+        self._biz_worker: asyncio.Task | None = None
+        self.biz_frames_dropped = 0
+        # Time spent decoding/applying biz/ frames on vs. off the event loop.
+        self.biz_loop_seconds = 0.0
+        self.biz_offloop_seconds = 0.0
         self._map_data: MapData | None = None
+        # Scaled static layers for _map_data by max_px; P-frames invalidate
+        # just their box.
+        self._map_bases: dict[int, MapLayer] = {}
+        # Saved map (DPS 165 map_id) that _map_data belongs to, 0 if unknown,
+        # and recently shown maps by id so a map switch can swap instantly.
+        self._map_data_id = 0
+        self._map_cache: OrderedDict[int, _MapSlot] = OrderedDict()
         self._robot_pixel: tuple[int, int] | None = None
-        self._robot_trail: list[tuple[int, int]] = []
+        self._robot_trail = TrailBuffer()
+        # Set once the device streams Path frames; poses then stop extending
+        # the trail, and a hidden/off-map point breaks the next visible one.
+        self._trail_from_path = False
+        self._trail_gap = False
+        # Trail log state: running trail index written so far, records in the
+        # file, and whether the next write must rewrite it (new session/map).
+        self._trail_log_synced = 0
+        self._trail_log_size = 0
+        self._trail_log_compact = True
+        self._trail_log_lock = asyncio.Lock()
+        self._trail_log_task: asyncio.Task | None = None
         self._dock_pixel: tuple[int, int] | None = None
         self._dock_arrival_time: float | None = None
-        self._last_robot_render: float = 0.0
         self.map_image: bytes | None = None
-        self._render_task: asyncio.Task | None = None
+        # Other sizes of the current render ({max_px: png}), made on request.
+        self._map_images: dict[int, bytes] = {}
+        self._map_version = 0
+        # Viewer demand: live streams plus the time of the last image request.
+        self._map_viewers = 0
+        self._last_map_request = 0.0
+        self._map_stale = False
+        self._map_save_cancel: CALLBACK_TYPE | None = None
+        self._map_save_pending = False
+        self.map_renders_deferred = 0
+        opts = config_entry.options if config_entry else {}
+        self._render_scheduler = RenderScheduler(
+            hass,
+            f"{DOMAIN}_{self.device_id}_map",
+            self._snapshot_map_render,
+            self._on_map_rendered,
+            max_fps=float(opts.get(CONF_MAP_MAX_FPS, DEFAULT_MAP_MAX_FPS)),
+        )
+        # "process": decode and render in a shared worker process pool.
+        self._map_engine: MapEngine | None = (
+            MapEngine(self.device_id)
+            if opts.get(CONF_MAP_ENGINE, DEFAULT_MAP_ENGINE) == "process"
+            else None
+        )
         self._last_notified_error_code: int = 0
-        self._last_map_save: float = 0.0
 
         if dps := device_info.get("dps"):
             self.data, _ = self._parse_dps(dps)
@@ -302,8 +428,19 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
             self.device_name,
             _CLOUD_POLL_INTERVAL,
         )
+        if self._cloud_unsub is None:
+            self._cloud_unsub = self.eufy_login.subscribe_cloud_device(
+                self.device_id, self._handle_cloud_dps
+            )
         await self.async_load_storage()
 
+    @callback
+    def _handle_cloud_dps(self, dps: dict[str, Any]) -> None:
+        """DPS from a shared cloud listing another device's poll triggered."""
+        new_state, _ = self._parse_dps(dps)
+        self._on_cloud_success(new_state, own_poll=False)
+        self.async_set_updated_data(new_state)
+
     @callback
     def _handle_mqtt_message(self, payload: bytes) -> None:
         """Handle incoming MQTT message bytes."""
@@ -338,7 +475,11 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
                         )
                         if not brief_dock_visit:
                             self._robot_trail.clear()
+                            self._trail_gap = False
                             self._robot_pixel = None
+                            self._trail_log_compact = True
+                            if self._map_data is not None:
+                                self._async_flush_trail_soon(force=True)
                             _LOGGER.debug("New cleaning session — trail cleared for %s", self.device_name)
                         self._dock_arrival_time = None
                     # Capture dock position when robot docks or enters idle/sleep in dock
@@ -347,6 +488,7 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
                             self._dock_arrival_time = time.monotonic()
                         if self._dock_pixel != self._robot_pixel:
                             self._dock_pixel = self._robot_pixel
+                            self._async_schedule_store_save("dock_pixel")
                             _LOGGER.debug("Dock position captured at %s for %s", self._dock_pixel, self.device_name)
                     # Schedule re-render after state update so _get_robot_status() sees
                     # the new activity (calling it here would read stale self.data).
@@ -411,6 +553,8 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
                 # tracks); the friendly name is layered in from the biz MapDescription
                 # stream when seen, else the option shows as "Map (ID: <id>)".
                 self._remember_map_id(new_state.map_id)
+                if new_state.map_id > 0 and new_state.map_id != self._map_data_id:
+                    self._switch_map(new_state.map_id)
 
                 self.async_set_updated_data(state_to_publish)
 
@@ -431,84 +575,221 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
 
     @callback
     def _handle_biz_message(self, payload: bytes) -> None:
-        """Handle incoming biz/ MQTT message (map stream data)."""
+        """Handle incoming biz/ MQTT message (map stream data).
+
+        Small frames (poses, channel tables, descriptions) are decoded inline.
+        Larger ones only have their channel id sniffed here and wait in a
+        per-channel slot for the decode worker, so hex, protobuf and LZ4 work
+        on big Map / MapBackup frames stays off the event loop. Snapshot
+        channels keep only the newest waiting frame; incremental ones queue
+        every frame. A small frame on a channel with work pending joins the
+        queue so frames of one channel are applied in order.
+        """
+        start = time.perf_counter()
         _LOGGER.debug(
             "biz/ message received (%d bytes) for %s: %s",
             len(payload),
             self.device_name,
             payload[:300],
         )
-        result = parse_biz_protocol41(payload)
-        if result is None:
-            _LOGGER.debug("biz/ message not a map stream, skipping")
-            return
-
-        channel_id, hex_data = result
-        _LOGGER.debug("biz/ protocol-41 channel_id=%d, hex_len=%d", channel_id, len(hex_data))
-
-        # Map discovery: a small single-shot MapDescription frame carries the
-        # active map's id + friendly name (delivered on a map switch). Capture it
-        # for the Active Map selector, persist, and notify entities.
-        desc = try_extract_map_description(hex_data)
-        if desc is not None:
-            map_id, name = desc
-            if self.last_seen_maps.get(map_id) != name:
-                self.last_seen_maps[map_id] = name
-                _LOGGER.debug(
-                    "Discovered map %d = %r for %s", map_id, name, self.device_name
+        busy = bool(self._biz_slots) or self._biz_decoding is not None
+        channel_id = _biz_channel_id(payload) if busy else None
+        if len(payload) < _BIZ_INLINE_MAX and (
+            channel_id is None
+            or (channel_id not in self._biz_slots and channel_id != self._biz_decoding)
+        ):
+            frame = decode_biz_frame(payload, *self._biz_decode_state())
+            if frame is not None:
+                self._apply_biz_frame(frame)
+        else:
+            if channel_id is None:
+                channel_id = _biz_channel_id(payload)
+            queue = self._biz_slots.setdefault(channel_id, [])
+            if queue and self._biz_latest_wins(channel_id):
+                # A newer frame on the same channel supersedes the waiting one.
+                self.biz_frames_dropped += len(queue)
+                queue.clear()
+            queue.append(payload)
+            if self._biz_worker is None or self._biz_worker.done():
+                self._biz_worker = self.hass.async_create_background_task(
+                    self._async_drain_biz_slots(), f"{DOMAIN}_{self.device_id}_biz"
                 )
-                self.async_update_listeners()
-                self.hass.async_create_task(self.async_save_maps())
+        self.biz_loop_seconds += time.perf_counter() - start
+
+    def _biz_latest_wins(self, channel_id: int) -> bool:
+        """Whether a newer frame on ``channel_id`` supersedes a waiting one."""
+        kind = self._biz_channels.get(channel_id)
+        if kind is None:
+            # Off-table channels carry MapBackup snapshots. Without a table
+            # the channel may be the incremental map one: keep every frame.
+            return bool(self._biz_channels)
+        return kind not in _BIZ_QUEUED_KINDS
+
+    def _biz_decode_state(
+        self,
+    ) -> tuple[dict[int, str], int | None, dict[str, int]]:
+        """Coordinator state decode_biz_frame needs (fingerprints only with a map)."""
+        fingerprints = self._frame_fingerprints if self._map_data is not None else {}
+        return self._biz_channels, self._map_data_chan_id, dict(fingerprints)
+
+    async def _async_drain_biz_slots(self) -> None:
+        """Decode queued large biz/ frames in the executor, oldest channel first."""
+        while self._biz_slots:
+            channel_id = next(iter(self._biz_slots))
+            queue = self._biz_slots[channel_id]
+            payload = queue.pop(0)
+            if not queue:
+                del self._biz_slots[channel_id]
+            self._biz_decoding = channel_id
+            try:
+                if self._map_engine is not None:
+                    frame, seconds = await self._map_engine.async_decode(
+                        payload, *self._biz_decode_state()
+                    )
+                else:
+                    frame, seconds = await self.hass.async_add_executor_job(
+                        decode_biz_timed, payload, *self._biz_decode_state()
+                    )
+                self.biz_offloop_seconds += seconds
+                if frame is not None:
+                    start = time.perf_counter()
+                    self._apply_biz_frame(frame)
+                    self.biz_loop_seconds += time.perf_counter() - start
+            except Exception as e:  # noqa: BLE001 - one bad frame must not stop the drain
+                _LOGGER.warning(
+                    "Error handling biz/ frame for %s: %s", self.device_name, e
+                )
+            finally:
+                self._biz_decoding = None
+
+    def _apply_biz_frame(self, frame: BizFrame) -> None:
+        """Apply a decoded biz/ frame to coordinator state (event loop)."""
+        kind, value = frame.kind, frame.value
+        if kind == "repeat":
+            self.skipped_map_frames += 1
+            _LOGGER.debug("biz/ %s frame unchanged for %s, skipped", value, self.device_name)
             return
+        if kind == "channels":
+            if value != self._biz_channels:
+                self._biz_channels = value
+                _LOGGER.debug("Learned biz/ channel table for %s: %s", self.device_name, value)
+        elif kind == "map_description":
+            self._handle_map_description(*value)
+        elif kind == "dynamic_data":
+            self._handle_robot_pose(value)
+        elif kind == "path":
+            self._handle_path_points(value)
+        elif kind == "map":
+            self._handle_map_frame(frame.channel_id, value)
+        else:
+            self._apply_map_fields(value)
+        if frame.fingerprint is not None:
+            self._frame_fingerprints[kind] = frame.fingerprint
+
+    def _handle_map_description(self, map_id: int, name: str) -> None:
+        """Record a discovered saved map's friendly name."""
+        if self.last_seen_maps.get(map_id) != name:
+            self.last_seen_maps[map_id] = name
+            _LOGGER.debug(
+                "Discovered map %d = %r for %s", map_id, name, self.device_name
+            )
+            self.async_update_listeners()
+            self.hass.async_create_task(self.async_save_maps())
 
-        # Small channels (<200 hex chars = ~100 bytes): try as robot pose (DynamicData).
-        if len(hex_data) < 200:
-            pose = try_decode_as_dynamic_data(hex_data)
-            if pose is not None:
-                robot_px = self._pose_to_pixel(pose[0], pose[1])
-                if robot_px is not None:
-                    # Only accumulate trail during active cleaning — poses that arrive
-                    # while returning or docked would create through-wall lines on resume.
-                    if self.data.activity == "cleaning":
-                        if not self._robot_trail:
-                            self._robot_trail.append(robot_px)
-                        else:
-                            d = _px_dist(self._robot_trail[-1], robot_px)
-                            max_step = (
-                                max(self._map_data.width, self._map_data.height) // 10
-                                if self._map_data else 400
-                            )
-                            if 3 <= d <= max_step:
-                                self._robot_trail.append(robot_px)
-                    if robot_px != self._robot_pixel:
-                        self._robot_pixel = robot_px
-                        now = time.monotonic()
-                        if now - self._last_robot_render >= 2.0 and self._map_data is not None:
-                            self._last_robot_render = now
-                            self._rerender_map()
+    def _handle_robot_pose(self, pose: tuple[int, int, int]) -> None:
+        """Move the robot marker (and extend the trail while cleaning)."""
+        robot_px = self._pose_to_pixel(pose[0], pose[1])
+        if robot_px is None:
             return
+        # Only accumulate trail during active cleaning — poses that arrive
+        # while returning or docked would create through-wall lines on resume.
+        # Devices that stream Path frames get their trail from those instead.
+        if self.data.activity == "cleaning" and not self._trail_from_path:
+            last = self._robot_trail.last()
+            if last is None:
+                self._robot_trail.append(*robot_px)
+            else:
+                d = _px_dist(last, robot_px)
+                max_step = (
+                    max(self._map_data.width, self._map_data.height) // 10
+                    if self._map_data else 400
+                )
+                if 3 <= d <= max_step:
+                    self._robot_trail.append(*robot_px)
+            self._async_flush_trail_soon()
+        if robot_px != self._robot_pixel:
+            self._robot_pixel = robot_px
+            self._rerender_map()
 
-        # Large channels: try as map data.
-        # Always attempt for: the cached map channel, unknown channel, or any >15 KB channel
-        # (map arrives on a different channel during cleaning vs. map editing).
-        is_map_candidate = (
-            self._map_data_chan_id is None
-            or channel_id == self._map_data_chan_id
-            or len(hex_data) > 15000
-        )
-        if not is_map_candidate:
+    def _handle_path_points(self, points: list[tuple[int, int, int]]) -> None:
+        """Extend the trail from an incremental Path frame.
+
+        The device marks discontinuities itself (``PATH_BREAK``); hidden and
+        off-map points are dropped and break the next visible point.
+        """
+        if self._map_data is None:
             return
+        self._trail_from_path = True
+        before = len(self._robot_trail)
+        for x_cm, y_cm, flags in points:
+            px = self._pose_to_pixel(x_cm, y_cm)
+            if (
+                px is None
+                or not flags & PATH_SHOW_TRAJECTORY
+                or flags & PATH_TYPE_MASK == PATH_HIDE
+            ):
+                self._trail_gap = True
+                continue
+            if self._trail_gap:
+                flags |= PATH_BREAK
+                self._trail_gap = False
+            self._robot_trail.append(*px, flags)
+        if len(self._robot_trail) != before:
+            self._async_flush_trail_soon()
+            self._rerender_map()
 
-        map_data = try_extract_map_data(hex_data)
-        if map_data is None:
+    def _apply_map_fields(self, fields: dict[str, Any]) -> None:
+        """Overlay routed room mask / names / zones onto the current map."""
+        if self._map_data is None:
+            # Single-shot frames can beat the first map frame; keep them for it.
+            self._pending_map_fields.update(fields)
             return
+        self._map_data = replace(self._map_data, **fields)
+        self._map_bases = {}  # room colours and zones are in the static layer
+        self._cache_current_map()
+        self._async_schedule_map_save()
+        self._rerender_map()
 
+    def _handle_map_frame(self, channel_id: int, map_data: MapData) -> None:
+        """Install a decoded Map / MapBackup frame and re-render."""
         if self._map_data_chan_id != channel_id:
             self._map_data_chan_id = channel_id
             _LOGGER.debug(
                 "Discovered map channel %d for %s", channel_id, self.device_name
             )
 
+        # Incremental (P) frame: patch the cached grid in place so decode, copy
+        # and re-render only cover the changed rectangle. A P-frame is only a
+        # fragment of the floor, so one with no cached map to fit is dropped;
+        # the next I-frame or MapBackup brings the map back in step.
+        if map_data.incremental:
+            dirty = (
+                apply_map_patch(self._map_data, map_data)
+                if self._map_data is not None
+                else None
+            )
+            if dirty is None:
+                _LOGGER.debug(
+                    "P-frame does not fit the cached map for %s, dropped",
+                    self.device_name,
+                )
+                return
+            for layer in self._map_bases.values():
+                layer.invalidate(dirty)
+            self._async_schedule_map_save()
+            self._rerender_map()
+            return
+
         # Preserve cached RoomOutline + zone/name data from the last MapBackup
         # when a plain Map update arrives (plain Map has none of these).
         if self._map_data is not None and map_data.room_pixels is None:
@@ -521,8 +802,99 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
             map_data.virtual_walls = self._map_data.virtual_walls
             map_data.forbidden_zones = self._map_data.forbidden_zones
             map_data.ban_mop_zones = self._map_data.ban_mop_zones
+        elif self._pending_map_fields and map_data.room_pixels is None:
+            map_data = replace(map_data, **self._pending_map_fields)
+        self._pending_map_fields = {}
+
+        self._map_data = map_data
+        self._map_data_id = self.data.map_id
+        self._map_bases = {}
+        self._cache_current_map()
+        self._async_schedule_map_save()
+        self._rerender_map()
+
+    def _cache_current_map(self) -> None:
+        """Keep the current map in the per-map LRU under its map id."""
+        if self._map_data is None or self._map_data_id <= 0:
+            return
+        self._map_cache[self._map_data_id] = _MapSlot(
+            self._map_data, self._map_bases, self._dock_pixel
+        )
+        self._map_cache.move_to_end(self._map_data_id)
+        while len(self._map_cache) > _MAP_CACHE_SIZE:
+            self._map_cache.popitem(last=False)
+
+    def _switch_map(self, map_id: int) -> None:
+        """Show the cached map for ``map_id`` as soon as DPS 165 reports it.
+
+        The outgoing map is saved to its own Store. A map that is not cached in
+        memory is loaded from its Store in the background; either way the
+        robot's next frames for the map replace it as usual.
+        """
+        if self._map_data is not None and self._map_data_id <= 0:
+            # First id reported for the map already shown — adopt it.
+            self._map_data_id = map_id
+            self._cache_current_map()
+            return
+        if self._map_data is not None:
+            self._cache_current_map()
+            outgoing = self._map_cache[self._map_data_id]
+            self.hass.async_create_task(
+                self._async_save_map_slot(self._map_data_id, outgoing)
+            )
+        _LOGGER.debug(
+            "Map switch %d -> %d for %s (cached: %s)",
+            self._map_data_id, map_id, self.device_name, map_id in self._map_cache,
+        )
+        # Trail, pose and frame fingerprints are in the old map's frame.
+        self._robot_trail.clear()
+        self._trail_gap = False
+        self._robot_pixel = None
+        self._trail_log_compact = True
+        self._frame_fingerprints.clear()
+        self._pending_map_fields = {}
+        self._map_data_id = map_id
+        if (slot := self._map_cache.get(map_id)) is None:
+            self._map_data = None
+            self._map_bases = {}
+            self._dock_pixel = None
+            self.hass.async_create_task(self._async_load_map_slot(map_id))
+            return
+        self._map_cache.move_to_end(map_id)
+        self._map_data = slot.map_data
+        self._map_bases = slot.bases
+        self._dock_pixel = slot.dock_pixel
+        self._rerender_map()
+
+    def _map_store(self, map_id: int) -> Store:
+        return Store(self.hass, 1, f"{DOMAIN}.{self.device_id}.map_{map_id}")
+
+    def _map_blob_path(self, map_id: int) -> str:
+        return map_blob_path(self.hass, self.device_id, map_id)
+
+    async def _async_save_map_slot(self, map_id: int, slot: _MapSlot) -> None:
+        """Persist one saved map so a later switch back can show it at once."""
+        await async_save_map_blob(self.hass, self._map_blob_path(map_id), slot.map_data)
+        data = map_meta_to_store(slot.map_data)
+        data["dock_pixel"] = list(slot.dock_pixel) if slot.dock_pixel else None
+        await self._map_store(map_id).async_save(data)
 
+    async def _async_load_map_slot(self, map_id: int) -> None:
+        """Install a persisted map if the robot is still on it and nothing newer arrived."""
+        raw = await self._map_store(map_id).async_load()
+        if not raw:
+            return
+        try:
+            map_data = await self._async_restore_map_data(raw, map_id)
+        except Exception as exc:
+            _LOGGER.warning("Failed to restore map %d for %s: %s", map_id, self.device_name, exc)
+            return
+        if map_data is None or self._map_data_id != map_id or self._map_data is not None:
+            return
         self._map_data = map_data
+        self._map_bases = {}
+        self._dock_pixel = tuple(raw["dock_pixel"]) if raw.get("dock_pixel") else None
+        self._cache_current_map()
         self._rerender_map()
 
     def _pose_to_pixel(self, x_cm: int, y_cm: int) -> tuple[int, int] | None:
@@ -622,18 +994,50 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
             return "charging"
         return None
 
+    @property
+    def map_watched(self) -> bool:
+        """Whether someone streams or recently fetched the map image."""
+        return bool(self._map_viewers) or (
+            time.monotonic() - self._last_map_request < _MAP_VIEWER_TIMEOUT
+        )
+
+    @callback
+    def async_add_map_viewer(self) -> CALLBACK_TYPE:
+        """Count a live map viewer (e.g. an MJPEG stream); returns its release."""
+        self._map_viewers += 1
+        released = False
+
+        @callback
+        def _release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._map_viewers -= 1
+
+        return _release
+
     def _rerender_map(self) -> None:
-        """Schedule an async map re-render, cancelling any in-flight render."""
+        """Request a map re-render; bursts collapse into one trailing render.
+
+        While nobody watches, only the decoded state is kept current: the
+        render is deferred until the next image request. Persistence does not
+        depend on renders (see ``_async_schedule_map_save``).
+        """
         if self._map_data is None:
             return
-        if self._render_task and not self._render_task.done():
-            self._render_task.cancel()
-        self._render_task = self.hass.async_create_task(self._async_rerender_map())
+        if self.map_watched:
+            self._render_scheduler.request()
+            return
+        self._map_stale = True
+        self.map_renders_deferred += 1
 
-    async def _async_rerender_map(self) -> None:
-        """Re-render the PNG in a thread executor so PIL does not block the event loop."""
+    def _snapshot_map_render(self, max_px: int | None = None) -> RenderJob | None:
+        """Snapshot render inputs on the event loop; the job runs on the render thread.
+
+        ``max_px`` overrides the configured image size (camera image pyramid).
+        """
         if self._map_data is None:
-            return
+            return None
         # When docked/idle, show robot at the known dock pixel rather than last pose.
         robot_px = (
             self._dock_pixel
@@ -642,32 +1046,105 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
         )
         entry = self.hass.config_entries.async_get_entry(self.entry_id)
         opts = entry.options if entry else {}
-        max_px = int(opts.get(CONF_MAP_MAX_PX, DEFAULT_MAP_MAX_PX))
+        if max_px is None:
+            max_px = self._map_max_px()
         robot_style = opts.get(CONF_ROBOT_STYLE, DEFAULT_ROBOT_STYLE)
+        palette = opts.get(CONF_MAP_IMAGE_MODE, DEFAULT_MAP_IMAGE_MODE) == "palette"
         # Snapshot mutable state before entering the thread.
         map_data = self._map_data
-        robot_trail = list(self._robot_trail) if self._robot_trail else None
+        robot_trail = self._robot_trail.copy() if self._robot_trail else None
         dock_pixel = self._dock_pixel
         robot_status = self._get_robot_status()
+        engine = self._map_engine
+        base = self._map_bases.get(max_px)
+        if base is None or not base.matches(map_data, max_px, palette):
+            layer_cls = RemoteMapLayer if engine is not None else MapBaseLayer
+            base = self._map_bases[max_px] = layer_cls(map_data, max_px, palette)
+        overlays = {
+            "robot_pixel": robot_px,
+            "robot_trail": robot_trail,
+            "dock_pixel": dock_pixel,
+            "robot_status": robot_status,
+            "robot_style": robot_style,
+            "palette": palette,
+        }
+
+        if isinstance(base, RemoteMapLayer):
+            assert engine is not None
+            remote = base
+
+            async def _render_remote() -> bytes:
+                return await engine.async_render(remote, map_data, overlays)
+
+            return _render_remote
+        assert isinstance(base, MapBaseLayer)
+        local = base
 
         def _render() -> bytes:
-            return render_map_png(
-                map_data,
-                robot_pixel=robot_px,
-                robot_trail=robot_trail,
-                dock_pixel=dock_pixel,
-                robot_status=robot_status,
-                max_px=max_px,
-                robot_style=robot_style,
-            )
+            return render_map_png(map_data, max_px=max_px, base=local, **overlays)
 
-        try:
-            png = await self.hass.async_add_executor_job(_render)
-        except asyncio.CancelledError:
-            return
+        return _render
+
+    def _map_max_px(self) -> int:
+        """Configured map image size (the size every render is made at)."""
+        entry = self.hass.config_entries.async_get_entry(self.entry_id)
+        opts = entry.options if entry else {}
+        return int(opts.get(CONF_MAP_MAX_PX, DEFAULT_MAP_MAX_PX))
+
+    def _map_image_size_for(self, width: int | None, height: int | None) -> int:
+        """Pick the smallest pyramid level that covers ``width`` x ``height``.
+
+        Levels are a thumbnail, the configured size and the map's native
+        resolution; ``max_px`` bounds the longer side of the rendered image.
+        """
+        default = self._map_max_px()
+        md = self._map_data
+        if md is None or not (width or height):
+            return default
+        native = max(md.width, md.height)
+        levels = sorted({min(px, native) for px in (_MAP_THUMBNAIL_PX, default, native)})
+        need = max(
+            (width or 0) * native / md.width,
+            (height or 0) * native / md.height,
+        )
+        return next((px for px in levels if px >= need), levels[-1])
+
+    async def async_get_map_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Map PNG for a requested size, rendered lazily on the render thread.
+
+        Sizes other than the configured one are cached until the next render.
+        Without map data (e.g. only a stored image) the last image is served.
+        A request marks the map as watched; if renders were deferred, the
+        current state is rendered first.
+        """
+        self._last_map_request = time.monotonic()
+        if self._map_stale and self._map_data is not None:
+            self._map_stale = False
+            if (job := self._snapshot_map_render()) is not None:
+                self._on_map_rendered(await self._render_scheduler.async_run(job))
+        if self._map_data is None or self.map_image is None:
+            return self.map_image
+        max_px = self._map_image_size_for(width, height)
+        if (png := self._map_images.get(max_px)) is not None:
+            return png
+        job = self._snapshot_map_render(max_px)
+        if job is None:
+            return self.map_image
+        version = self._map_version
+        png = await self._render_scheduler.async_run(job)
+        if version == self._map_version:
+            self._map_images[max_px] = png
+        return png
+
+    def _on_map_rendered(self, png: bytes) -> None:
+        """Publish a finished render."""
         self.map_image = png
+        self._map_version += 1
+        self._map_stale = False
+        self._map_images = {self._map_max_px(): png}
         _LOGGER.debug("Map image updated (%d bytes PNG) for %s", len(png), self.device_name)
-        self.hass.async_create_task(self._async_save_map_image())
         async_dispatcher_send(self.hass, f"{DOMAIN}_{self.device_id}_map_updated")
 
     @callback
@@ -734,6 +1211,19 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
         if self._segment_update_cancel:
             self._segment_update_cancel()
             self._segment_update_cancel = None
+        if self._cloud_unsub:
+            self._cloud_unsub()
+            self._cloud_unsub = None
+        self._render_scheduler.shutdown()
+        if self._map_save_cancel:
+            self._map_save_cancel()  # async_flush_storage writes what is pending
+            self._map_save_cancel = None
+        if self._map_engine is not None:
+            self._map_engine.close()
+        self._biz_slots.clear()
+        if self._biz_worker is not None:
+            self._biz_worker.cancel()
+            self._biz_worker = None
         self._clear_error_notification()
 
     @callback
@@ -793,6 +1283,7 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
         try:
             if self.connection_type == "cloud":
                 await self.eufy_login.sendCloudCommand(self.device_id, command_dict)
+                self._start_cloud_poll_burst()
             elif self.client:
                 # Both LocalTuyaClient and EufyCleanClient expose send_command.
                 await self.client.send_command(command_dict)
@@ -819,7 +1310,7 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
                 dps = await self.eufy_login.getCloudDevice(self.device_id)
                 if dps:
                     new_state, _ = self._parse_dps(dps)
-                    self._on_cloud_success()
+                    self._on_cloud_success(new_state)
                     return new_state
             except Exception as e:
                 _LOGGER.warning(
@@ -836,8 +1327,40 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
 
         return self.data
 
-    def _on_cloud_success(self) -> None:
-        """Reset failure counter and restore base poll interval."""
+    @property
+    def cloud_poll_policy(self) -> str:
+        """Configured cloud polling policy ("adaptive" or "fixed")."""
+        entry = self.config_entry
+        opts = entry.options if entry else {}
+        return opts.get(CONF_CLOUD_POLL_POLICY, DEFAULT_CLOUD_POLL_POLICY)
+
+    def _cloud_poll_interval(self, state: VacuumState) -> timedelta:
+        """Poll interval for the cloud transport given the latest state."""
+        if self.cloud_poll_policy != "adaptive":
+            return _CLOUD_POLL_INTERVAL
+        if self._cloud_poll_burst:
+            return _CLOUD_POLL_BURST
+        if state.activity in ("cleaning", "returning"):
+            return _CLOUD_POLL_ACTIVE
+        if state.activity == "docked" and state.battery_level >= 100:
+            return _CLOUD_POLL_IDLE
+        return _CLOUD_POLL_INTERVAL
+
+    @callback
+    def _start_cloud_poll_burst(self) -> None:
+        """Poll now and a few times shortly after, to catch a command's effect."""
+        if self.cloud_poll_policy != "adaptive":
+            return
+        self._cloud_poll_burst = _CLOUD_POLL_BURST_COUNT
+        self._base_poll_interval = self.update_interval = _CLOUD_POLL_BURST
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _on_cloud_success(self, state: VacuumState, own_poll: bool = True) -> None:
+        """Reset failure counter and set the poll interval for ``state``.
+
+        Only this device's own polls use up its burst: listings other devices
+        triggered arrive on their schedule, not in answer to its command.
+        """
         if self._consecutive_cloud_failures > 0:
             _LOGGER.debug(
                 "Cloud device %s recovered after %d failure(s)",
@@ -846,7 +1369,15 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
             )
         self._consecutive_cloud_failures = 0
         if self._base_poll_interval:
-            self.update_interval = self._base_poll_interval
+            interval = self._cloud_poll_interval(state)
+            if self._cloud_poll_burst and own_poll:
+                self._cloud_poll_burst -= 1
+            if interval != self._base_poll_interval:
+                _LOGGER.debug(
+                    "Cloud device %s (%s): polling every %s",
+                    self.device_name, state.activity, interval,
+                )
+            self._base_poll_interval = self.update_interval = interval
 
     def _on_cloud_failure(self) -> None:
         """Increment failure counter and apply exponential backoff."""
@@ -866,6 +1397,9 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
     async def async_load_storage(self) -> None:
         """Load data from storage."""
         if data := await self._store.async_load():
+            self._store_data = dict(data)
+            if self._store_data.pop("map_image_png", None) is not None:
+                self._store_data.pop("robot_trail", None)
             self.last_seen_segments = data.get("last_seen_segments")
             _LOGGER.debug(
                 "Loaded %s segments from storage for %s",
@@ -876,86 +1410,139 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
                 int(k): v for k, v in (data.get("last_seen_maps") or {}).items()
             }
             if map_b64 := data.get("map_image_png"):
+                # Written by older versions; replaced by a render of map_data.
                 self.map_image = base64.b64decode(map_b64)
-                _LOGGER.debug(
-                    "Loaded cached map image (%d bytes) for %s",
-                    len(self.map_image),
-                    self.device_name,
-                )
             if trail := data.get("robot_trail"):
-                self._robot_trail = [tuple(p) for p in trail]
-                _LOGGER.debug(
-                    "Loaded robot trail (%d points) for %s",
-                    len(self._robot_trail),
-                    self.device_name,
-                )
+                self._robot_trail = TrailBuffer.from_list(trail)  # older versions
             if dp := data.get("dock_pixel"):
                 self._dock_pixel = tuple(dp)
             if md_raw := data.get("map_data"):
                 try:
-                    self._map_data = MapData(
-                        raw_pixels=base64.b64decode(md_raw["raw_pixels"]),
-                        width=md_raw["width"],
-                        height=md_raw["height"],
-                        origin_x=md_raw["origin_x"],
-                        origin_y=md_raw["origin_y"],
-                        resolution=md_raw["resolution"],
-                        room_pixels=base64.b64decode(md_raw["room_pixels"]) if md_raw.get("room_pixels") else None,
-                        room_outline_width=md_raw.get("room_outline_width", 0),
-                        room_outline_height=md_raw.get("room_outline_height", 0),
-                        room_outline_origin_x=md_raw.get("room_outline_origin_x", 0),
-                        room_outline_origin_y=md_raw.get("room_outline_origin_y", 0),
-                        room_names={int(k): v for k, v in md_raw.get("room_names", {}).items()},
-                        virtual_walls=[(tuple(w[0]), tuple(w[1])) for w in md_raw.get("virtual_walls", [])],
-                        forbidden_zones=[[tuple(p) for p in zone] for zone in md_raw.get("forbidden_zones", [])],
-                        ban_mop_zones=[[tuple(p) for p in zone] for zone in md_raw.get("ban_mop_zones", [])],
-                    )
-                    _LOGGER.debug("Loaded map data from storage for %s", self.device_name)
+                    map_id = md_raw.get("map_id", 0)
+                    if map_data := await self._async_restore_map_data(md_raw, map_id, True):
+                        self._map_data = map_data
+                        self._map_data_id = map_id
+                        await self._async_replay_trail_log(map_id)
+                        self._map_stale = True  # rendered on the first image request
+                        self._cache_current_map()
+                        _LOGGER.debug(
+                            "Loaded map data and trail (%d points) from storage for %s",
+                            len(self._robot_trail),
+                            self.device_name,
+                        )
                 except Exception as exc:
                     _LOGGER.warning("Failed to restore map data for %s: %s", self.device_name, exc)
 
-    async def _async_save_map_image(self) -> None:
-        """Persist the current map image, trail, and raw map data to storage (debounced)."""
-        if self.map_image is None:
+    async def _async_restore_map_data(
+        self, md_raw: dict[str, Any], map_id: int, with_trail: bool = False
+    ) -> MapData | None:
+        """MapData from Store metadata plus its map file (or legacy inline pixels)."""
+        if "raw_pixels" in md_raw:
+            return map_data_from_store(md_raw)
+        blob = await async_load_map_blob(self.hass, self._map_blob_path(map_id))
+        if blob is None:
+            return None
+        raw_pixels, room_pixels, trail, geometry = blob
+        if geometry is not None:
+            # Written with the pixels; the Store copy may predate them.
+            md_raw = {**md_raw, **geometry}
+        elif len(raw_pixels) != (md_raw["width"] * md_raw["height"] + 3) // 4:
+            raise ValueError("map file does not match the stored map size")
+        if with_trail:
+            self._robot_trail = trail
+        return map_data_from_store(md_raw, raw_pixels, room_pixels)
+
+    @callback
+    def _async_schedule_map_save(self) -> None:
+        """Persist the current map within ``_MAP_SAVE_DELAY`` (one write per window)."""
+        self._map_save_pending = True
+        if self._map_save_cancel is None:
+            self._map_save_cancel = async_call_later(
+                self.hass, _MAP_SAVE_DELAY, self._async_map_save_due
+            )
+
+    @callback
+    def _async_map_save_due(self, _now: Any) -> None:
+        self._map_save_cancel = None
+        self.hass.async_create_task(self._async_save_map_data())
+
+    async def _async_save_map_data(self) -> None:
+        """Persist the current map and trail.
+
+        Pixels go to the map's binary file and new trail points to the trail
+        log; the Store only gets the metadata. Rendered images are not kept:
+        they are re-rendered from the map.
+        """
+        self._map_save_pending = False
+        if self._map_data is None:
+            return
+        map_id = self._map_data_id
+        # Metadata taken with the pixels below. Its Store write is delayed, so
+        # the map file carries its own geometry for a restart in between.
+        meta = {**map_meta_to_store(self._map_data), "map_id": map_id}
+        await async_save_map_blob(self.hass, self._map_blob_path(map_id), self._map_data)
+        await self._async_flush_trail()
+        self._store_data["map_data"] = meta
+        self._async_schedule_store_save("map_data", "dock_pixel")
+
+    async def _async_replay_trail_log(self, map_id: int) -> None:
+        """Restore the session trail from the trail log if it is for ``map_id``."""
+        try:
+            log = await async_load_trail_log(
+                self.hass, trail_log_path(self.hass, self.device_id)
+            )
+        except ValueError as exc:
+            _LOGGER.warning("Ignoring trail log for %s: %s", self.device_name, exc)
+            return
+        if log is None or log[0] != map_id:
+            return
+        self._robot_trail = log[1]
+        self._trail_log_synced = self._trail_log_size = log[1].end
+        self._trail_log_compact = False
+
+    @callback
+    def _async_flush_trail_soon(self, force: bool = False) -> None:
+        """Start a trail log write once a batch of new points is waiting."""
+        if self._trail_log_task is not None and not self._trail_log_task.done():
             return
-        now = time.monotonic()
-        if now - self._last_map_save < 30:
+        if not force and self._robot_trail.end - self._trail_log_synced < _TRAIL_LOG_BATCH:
             return
-        self._last_map_save = now
-        data = await self._store.async_load() or {}
-        data["map_image_png"] = base64.b64encode(self.map_image).decode()
-        data["robot_trail"] = list(self._robot_trail)
-        if self._dock_pixel is not None:
-            data["dock_pixel"] = list(self._dock_pixel)
-        if self._map_data is not None:
-            md = self._map_data
-            data["map_data"] = {
-                "raw_pixels": base64.b64encode(md.raw_pixels).decode(),
-                "width": md.width,
-                "height": md.height,
-                "origin_x": md.origin_x,
-                "origin_y": md.origin_y,
-                "resolution": md.resolution,
-                "room_pixels": base64.b64encode(md.room_pixels).decode() if md.room_pixels else None,
-                "room_outline_width": md.room_outline_width,
-                "room_outline_height": md.room_outline_height,
-                "room_outline_origin_x": md.room_outline_origin_x,
-                "room_outline_origin_y": md.room_outline_origin_y,
-                "room_names": {str(k): v for k, v in md.room_names.items()},
-                "virtual_walls": [[list(p) for p in wall] for wall in md.virtual_walls],
-                "forbidden_zones": [[list(p) for p in zone] for zone in md.forbidden_zones],
-                "ban_mop_zones": [[list(p) for p in zone] for zone in md.ban_mop_zones],
-            }
-        await self._store.async_save(data)
+        self._trail_log_task = self.hass.async_create_task(self._async_flush_trail())
+
+    async def _async_flush_trail(self) -> None:
+        """Append trail points recorded since the last write to the trail log.
+
+        The log is rewritten from the current trail instead when a session or
+        map change asked for it, or once it holds twice the trail's capacity.
+        """
+        async with self._trail_log_lock:
+            trail = self._robot_trail
+            compact = (
+                self._trail_log_compact
+                or trail.end < self._trail_log_synced
+                or self._trail_log_size + trail.end - self._trail_log_synced
+                > 2 * trail.max_points
+            )
+            records = trail.pack_since(0 if compact else self._trail_log_synced)
+            if not records and not compact:
+                return
+            self._trail_log_compact = False
+            self._trail_log_synced = trail.end
+            self._trail_log_size = (0 if compact else self._trail_log_size) + len(records) // 5
+            await async_write_trail_log(
+                self.hass,
+                trail_log_path(self.hass, self.device_id),
+                self._map_data_id,
+                records,
+                compact,
+            )
 
     async def async_save_segments(self, segments_payload: list[dict[str, Any]]) -> None:
         """Save segments to storage."""
         self.last_seen_segments = segments_payload
-        data = await self._store.async_load() or {}
-        data["last_seen_segments"] = segments_payload
-        await self._store.async_save(data)
+        self._async_schedule_store_save("last_seen_segments")
         _LOGGER.debug(
-            "Saved %s segments to storage for %s",
+            "Queued %s segments to storage for %s",
             len(segments_payload),
             self.device_name,
         )
@@ -976,15 +1563,50 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
 
     async def async_save_maps(self) -> None:
         """Persist discovered saved-map id→name to storage."""
-        data = await self._store.async_load() or {}
-        data["last_seen_maps"] = {str(k): v for k, v in self.last_seen_maps.items()}
-        await self._store.async_save(data)
+        self._async_schedule_store_save("last_seen_maps")
         _LOGGER.debug(
-            "Saved %s discovered maps to storage for %s",
+            "Queued %s discovered maps to storage for %s",
             len(self.last_seen_maps),
             self.device_name,
         )
 
+    @callback
+    def _async_schedule_store_save(self, *keys: str) -> None:
+        """Mark Store keys dirty and (re)arm the single delayed write."""
+        self._store_dirty.update(keys)
+        self._store.async_delay_save(self._store_snapshot, _STORE_SAVE_DELAY)
+
+    @callback
+    def _store_snapshot(self) -> dict[str, Any]:
+        """The Store contents, with dirty keys refreshed from live state."""
+        for key in self._store_dirty:
+            value = self._store_value(key)
+            if value is None:
+                self._store_data.pop(key, None)
+            else:
+                self._store_data[key] = value
+        self._store_dirty.clear()
+        # Serialised in the executor; the values are never mutated in place.
+        return dict(self._store_data)
+
+    def _store_value(self, key: str) -> Any:
+        if key == "last_seen_segments":
+            return self.last_seen_segments
+        if key == "last_seen_maps":
+            return {str(k): v for k, v in self.last_seen_maps.items()}
+        if key == "dock_pixel" and self._dock_pixel is not None:
+            return list(self._dock_pixel)
+        return self._store_data.get(key)
+
+    async def async_flush_storage(self) -> None:
+        """Write pending map, Store changes and trail points now (entry unload)."""
+        if self._map_save_pending:
+            await self._async_save_map_data()
+        elif self._map_data is not None:
+            await self._async_flush_trail()
+        if self._store_dirty:
+            await self._store.async_save(self._store_snapshot())
+
     async def async_forget_map(self, cloud_mapid: int) -> bool:
         """Drop a map id from ``last_seen_maps``, persist, and refresh listeners so the
         Switch Map selector stops offering it.
@@ -996,6 +1618,9 @@ class EufyCleanCoordinator(DataUpdateCoordinator[VacuumState]):
         """
         if self.last_seen_maps.pop(cloud_mapid, None) is None:
             return False
+        self._map_cache.pop(cloud_mapid, None)
+        await self._map_store(cloud_mapid).async_remove()
+        await async_remove_map_blob(self.hass, self._map_blob_path(cloud_mapid))
         await self.async_save_maps()
         self.async_update_listeners()
         _LOGGER.debug("Forgot map %d for %s", cloud_mapid, self.device_name)
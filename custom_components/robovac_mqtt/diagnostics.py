@@ -44,13 +44,25 @@ async def async_get_config_entry_diagnostics(
                 "battery_level": coordinator.data.battery_level,
                 "last_update_success": coordinator.last_update_success,
                 "update_interval": str(coordinator.update_interval),
+                "cloud_poll_policy": coordinator.cloud_poll_policy,
+                "cloud_poll_burst": coordinator._cloud_poll_burst,
                 "consecutive_cloud_failures": coordinator._consecutive_cloud_failures,
+                "skipped_map_frames": coordinator.skipped_map_frames,
+                "biz_frames_dropped": coordinator.biz_frames_dropped,
+                "biz_event_loop_ms": round(coordinator.biz_loop_seconds * 1000, 1),
+                "biz_offloaded_decode_ms": round(coordinator.biz_offloop_seconds * 1000, 1),
+                "map_watched": coordinator.map_watched,
+                "map_renders_deferred": coordinator.map_renders_deferred,
             }
         )
 
+    login = data.get("login")
+    cloud_login = login.login_state if login else None
+
     return async_redact_data(
         {
             "entry_data": dict(entry.data),
+            "cloud_login": cloud_login,
             "device_count": len(coordinators),
             "devices": devices,
         },
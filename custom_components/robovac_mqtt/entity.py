@@ -10,14 +10,23 @@ attribute — a tuple of protocol names, or ``None`` (the default) for
 universal entities. Platform setups pass their candidate entities through
 :func:`filter_supported_entities` so unsupported entities are never added
 to the registry (e.g. no scalar-only switches on X-series devices).
+
+Platform setups build their entities through
+:func:`async_add_coordinator_entities`, which also adds them for a device
+whose coordinator only comes up after the entry was set up.
 """
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import TypeVar
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 
+from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator
 
 API_TYPE_NOVEL = "novel"
@@ -46,3 +55,33 @@ def filter_supported_entities(
         if (supported := getattr(entity, "supported_api_types", None)) is None
         or api_type in supported
     ]
+
+
+def signal_coordinator_added(entry_id: str) -> str:
+    """Dispatcher signal carrying a coordinator that joined a running entry."""
+    return f"{DOMAIN}_{entry_id}_coordinator_added"
+
+
+@callback
+def async_add_coordinator_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    add: Callable[[list[EufyCleanCoordinator]], None],
+) -> None:
+    """Call ``add`` with the entry's coordinators, then with each late one.
+
+    A device that failed setup is retried in the background; when it answers,
+    its coordinator joins the entry and every platform adds its entities
+    without reloading the devices that are already running.
+    """
+    add(hass.data[DOMAIN][config_entry.entry_id]["coordinators"])
+
+    @callback
+    def _added(coordinator: EufyCleanCoordinator) -> None:
+        add([coordinator])
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal_coordinator_added(config_entry.entry_id), _added
+        )
+    )
@@ -0,0 +1,81 @@
+"""Warm-start cache of the cloud login and device discovery.
+
+A cold start is a chain of sequential HTTPS calls (Eufy login over several
+credential sets, user info, MQTT credentials, two device lists, Tuya login and
+device list) before any entity exists. The result of that chain
+(``EufyLogin.export_state``) is kept in a private Store per config entry so
+setup can start from it and revalidate in the background. The password is
+never cached; entries are bound to a hash of the account name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from cryptography import x509
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_CACHE_VERSION = 1
+# A cached MQTT certificate must outlive this margin to be used.
+_CERT_MARGIN = timedelta(hours=1)
+
+
+def _store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, _CACHE_VERSION, f"{DOMAIN}.{entry.entry_id}.login", private=True)
+
+
+def _account_key(entry: ConfigEntry) -> str:
+    return hashlib.sha256(entry.data[CONF_USERNAME].encode()).hexdigest()
+
+
+def mqtt_certificate_valid(creds: dict[str, Any] | None) -> bool:
+    """Whether cached MQTT credentials carry a certificate that is still valid."""
+    if not creds or not creds.get("certificate_pem"):
+        return False
+    try:
+        cert = x509.load_pem_x509_certificate(creds["certificate_pem"].encode())
+    except ValueError:
+        return False
+    return cert.not_valid_after_utc - _CERT_MARGIN > datetime.now(timezone.utc)
+
+
+def login_cache_usable(state: dict[str, Any]) -> bool:
+    """A cache can stand in for a login if it found devices and, when any of
+    them use MQTT, still holds a valid certificate for the broker."""
+    if not state.get("mqtt_devices") and not state.get("cloud_devices"):
+        return False
+    return not state.get("mqtt_devices") or mqtt_certificate_valid(
+        state.get("mqtt_credentials")
+    )
+
+
+async def async_load_login_cache(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any] | None:
+    """The cached login state for this entry's account, if any."""
+    data = await _store(hass, entry).async_load()
+    if not data or data.get("account") != _account_key(entry):
+        return None
+    return data
+
+
+async def async_save_login_cache(
+    hass: HomeAssistant, entry: ConfigEntry, state: dict[str, Any]
+) -> None:
+    """Replace the cached login state with a fresh ``export_state``."""
+    await _store(hass, entry).async_save(
+        {**state, "account": _account_key(entry), "saved_at": time.time()}
+    )
+
+
+async def async_remove_login_cache(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the cache (bad credentials, entry removed)."""
+    await _store(hass, entry).async_remove()
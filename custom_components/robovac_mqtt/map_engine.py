@@ -0,0 +1,230 @@
+"""Optional process-pool backend for map decoding and rendering.
+
+LZ4 / protobuf decode and PIL rendering hold the GIL, so with several robots
+mapping at once they compete with the rest of Home Assistant for one core.
+With the ``process`` map engine each device is pinned to one of a few
+single-worker processes (spawned, shared across devices). Pinning keeps a
+device's static map layers warm in its process: the parent only ships the
+``MapData`` (pickled bytes) plus the dirty box when the layer changed since
+the previous render, so a pose-only render sends just the overlays.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Protocol, TypeVar
+
+from .api.map_stream import (
+    BizFrame,
+    MapBaseLayer,
+    MapData,
+    decode_biz_frame,
+    render_map_png,
+)
+
+_POOL_SIZE = max(1, min(os.cpu_count() or 1, 4))
+
+_layer_serial = itertools.count(1)
+
+_R = TypeVar("_R")
+
+
+class _Pool:
+    """The shared worker processes and the devices using them."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.executors: list[ProcessPoolExecutor | None] = [None] * _POOL_SIZE
+        self.users = 0
+        self.next_slot = itertools.count()
+
+
+_pool = _Pool()
+
+
+def decode_biz_timed(payload: bytes, *state: Any) -> tuple[BizFrame | None, float]:
+    """decode_biz_frame plus its duration (runs in an executor or worker)."""
+    start = time.perf_counter()
+    frame = decode_biz_frame(payload, *state)
+    return frame, time.perf_counter() - start
+
+
+class MapLayer(Protocol):
+    """Cached static map layer as the coordinator sees it (local or remote)."""
+
+    def matches(self, map_data: MapData, max_px: int, palette: bool = False) -> bool:
+        """Whether this layer was built for exactly this map, size and mode."""
+
+    def invalidate(self, rect: tuple[int, int, int, int]) -> None:
+        """Mark source grid rectangle ``(x0, y0, x1, y1)`` as changed."""
+
+
+class RemoteMapLayer:
+    """Parent-side stand-in for a ``MapBaseLayer`` that lives in a worker.
+
+    Same ``matches`` / ``invalidate`` surface as ``MapBaseLayer``; dirty boxes
+    are folded into a sequence number so the worker can tell whether its copy
+    is one patch behind (apply the box) or stale (rebuild). A job whose
+    previous and current sequence match has nothing new to ship.
+    """
+
+    def __init__(self, map_data: MapData, max_px: int, palette: bool = False) -> None:
+        self.map_data = map_data
+        self.max_px = max_px
+        self.palette = palette
+        self.serial = next(_layer_serial)
+        self._seq = 0
+        self._sent_seq = -1  # nothing shipped yet
+        self._dirty: tuple[int, int, int, int] | None = None
+        self._lock = threading.Lock()
+
+    def matches(self, map_data: MapData, max_px: int, palette: bool = False) -> bool:
+        """Whether this layer was built for exactly this map, size and mode."""
+        return (
+            self.map_data is map_data and self.max_px == max_px and self.palette == palette
+        )
+
+    def invalidate(self, rect: tuple[int, int, int, int]) -> None:
+        """Mark source grid rectangle ``(x0, y0, x1, y1)`` as changed."""
+        with self._lock:
+            if self._dirty is not None:
+                rect = (
+                    min(rect[0], self._dirty[0]), min(rect[1], self._dirty[1]),
+                    max(rect[2], self._dirty[2]), max(rect[3], self._dirty[3]),
+                )
+            self._dirty = rect
+            self._seq += 1
+
+    def take(self) -> tuple[int, int, int, tuple[int, int, int, int] | None]:
+        """``(serial, prev_seq, seq, dirty)`` for the next render job."""
+        with self._lock:
+            prev, self._sent_seq = self._sent_seq, self._seq
+            dirty, self._dirty = self._dirty, None
+            return self.serial, prev, self._seq, dirty
+
+
+# Worker-process state: (device key, max_px) -> (serial, seq, layer)
+_worker_layers: dict[tuple[str, int], tuple[int, int, MapBaseLayer]] = {}
+
+
+def render_in_worker(
+    key: str,
+    job: tuple[int, int, int, tuple[int, int, int, int] | None],
+    map_data: MapData | None,
+    max_px: int,
+    overlays: dict[str, Any],
+) -> bytes | None:
+    """Render in the worker, reusing (or patching) its cached static layer.
+
+    ``map_data`` is None when the layer did not change since the previous
+    job; returns None if this process has no copy of it (the parent then
+    resends the map).
+    """
+    serial, prev_seq, seq, dirty = job
+    cached = _worker_layers.get((key, max_px))
+    if cached is not None and cached[0] == serial and cached[1] == prev_seq:
+        layer = cached[2]
+        if map_data is None:
+            map_data = layer.map_data
+        else:
+            layer.map_data = map_data  # fresh unpickled copy of the same map
+            if dirty is not None:
+                layer.invalidate(dirty)
+    elif map_data is None:
+        return None
+    else:
+        layer = MapBaseLayer(map_data, max_px, overlays.get("palette", False))
+    _worker_layers[(key, max_px)] = (serial, seq, layer)
+    return render_map_png(map_data, max_px=max_px, base=layer, **overlays)
+
+
+class MapEngine:
+    """A device's handle on its pinned map worker process."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        with _pool.lock:
+            _pool.users += 1
+            self._slot = next(_pool.next_slot) % _POOL_SIZE
+        self._closed = False
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with _pool.lock:
+            executor = _pool.executors[self._slot]
+            if executor is None:
+                # spawn: forking a threaded event-loop process is unsafe.
+                executor = _pool.executors[self._slot] = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                )
+            return executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor from this device's slot (once)."""
+        with _pool.lock:
+            if _pool.executors[self._slot] is executor:
+                _pool.executors[self._slot] = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _async_run(self, func: Callable[..., _R], *args: Any) -> _R:
+        """Run ``func`` in the slot's worker, restarting it once if it died."""
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # The worker crashed or was killed: spawn a fresh one and retry.
+            self._discard(executor)
+            return await loop.run_in_executor(self._executor(), func, *args)
+
+    async def async_decode(
+        self, payload: bytes, *state: Any
+    ) -> tuple[BizFrame | None, float]:
+        """decode_biz_timed in the worker process."""
+        return await self._async_run(decode_biz_timed, payload, *state)
+
+    async def async_render(
+        self, layer: RemoteMapLayer, map_data: MapData, overlays: dict[str, Any]
+    ) -> bytes:
+        """Render in the worker; ``map_data`` only travels when the layer changed."""
+        job = layer.take()
+        serial, prev_seq, seq, _ = job
+        png = await self._async_run(
+            render_in_worker, self.key, job,
+            map_data if prev_seq != seq else None, layer.max_px, overlays,
+        )
+        if png is None:
+            # The worker lost its copy (restarted process or pool): rebuild.
+            png = await self._async_run(
+                render_in_worker, self.key, (serial, -1, seq, None),
+                map_data, layer.max_px, overlays,
+            )
+        assert png is not None
+        return png
+
+    def close(self) -> None:
+        """Release the pool; the last device to go shuts the processes down."""
+        if self._closed:
+            return
+        self._closed = True
+        with _pool.lock:
+            _pool.users -= 1
+            if _pool.users:
+                return
+        shutdown_pool()
+
+
+def shutdown_pool(wait: bool = False) -> None:
+    """Stop every worker process (pending jobs are cancelled)."""
+    with _pool.lock:
+        executors = [e for e in _pool.executors if e is not None]
+        _pool.executors = [None] * _POOL_SIZE
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,266 @@
+"""Compact binary persistence for decoded maps.
+
+Map pixels, the room mask and the cleaning trail are nearly all of what the
+integration persists. They are kept out of the JSON ``Store`` (where they
+were base64 text rewritten on every save) in one zlib-compressed file per
+device and map under ``.storage``; the Store keeps the small metadata from
+``map_meta_to_store`` alongside the map id that names the file.
+
+The trail of the current cleaning session grows through the whole clean, so
+it has its own append-only log (see :func:`async_write_trail_log`) instead of
+being rewritten with the map. Map files written by older versions may still
+carry a trail section, which is read but no longer written.
+
+The pixel geometry (size and origins) is written into the map file itself:
+the Store metadata is saved on a delay, and pixels must never be read back
+under another map's geometry.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import struct
+import zlib
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .api.map_stream import MapData, TrailBuffer
+from .const import DOMAIN
+
+_MAGIC = b"EUFYMAP\x02"
+_MAGIC_V1 = b"EUFYMAP\x01"  # no geometry; Store metadata gives the size
+# magic, raw pixel bytes, room mask bytes, trail bytes (lengths before zlib;
+# the trail section is legacy and always empty in new files)
+_HEADER = struct.Struct("<8sIII")
+# Follows _HEADER in version 2 files, in _GEOMETRY_FIELDS order.
+_GEOMETRY = struct.Struct("<IIiiIIii")
+_GEOMETRY_FIELDS = (
+    "width",
+    "height",
+    "origin_x",
+    "origin_y",
+    "room_outline_width",
+    "room_outline_height",
+    "room_outline_origin_x",
+    "room_outline_origin_y",
+)
+_TRAIL_MAGIC = b"EUFYTRL\x01"
+# magic, map id; followed by TrailBuffer.pack_since records
+_TRAIL_HEADER = struct.Struct("<8sI")
+
+
+def map_blob_path(hass: HomeAssistant, device_id: str, map_id: int) -> str:
+    """Binary file holding one map's pixels and room mask."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{device_id}.map_{map_id}.bin")
+
+
+def trail_log_path(hass: HomeAssistant, device_id: str) -> str:
+    """Append-only log of the current cleaning session's trail."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{device_id}.trail.bin")
+
+
+def map_geometry(md: MapData) -> dict[str, int]:
+    """The ``MapData`` fields that give its pixel buffers their meaning."""
+    return {name: getattr(md, name) for name in _GEOMETRY_FIELDS}
+
+
+def encode_map_blob(
+    raw_pixels: bytes, room_pixels: bytes | None, geometry: dict[str, int]
+) -> bytes:
+    """Header and geometry plus the zlib-compressed pixel and room sections."""
+    room = room_pixels or b""
+    header = _HEADER.pack(_MAGIC, len(raw_pixels), len(room), 0)
+    header += _GEOMETRY.pack(*(geometry[name] for name in _GEOMETRY_FIELDS))
+    return header + zlib.compress(raw_pixels + room)
+
+
+def decode_map_blob(
+    blob: bytes,
+) -> tuple[bytes, bytes | None, TrailBuffer, dict[str, int] | None]:
+    """Inverse of :func:`encode_map_blob`; raises ValueError on a bad file.
+
+    The geometry is None and the trail may be non-empty for files written by
+    older versions.
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("map file truncated")
+    magic, raw_len, room_len, trail_len = _HEADER.unpack_from(blob)
+    offset = _HEADER.size
+    geometry: dict[str, int] | None = None
+    if magic == _MAGIC:
+        if len(blob) < offset + _GEOMETRY.size:
+            raise ValueError("map file truncated")
+        geometry = dict(zip(_GEOMETRY_FIELDS, _GEOMETRY.unpack_from(blob, offset)))
+        offset += _GEOMETRY.size
+    elif magic != _MAGIC_V1:
+        raise ValueError("not a map file")
+    try:
+        body = zlib.decompress(blob[offset:])
+    except zlib.error as exc:
+        raise ValueError(f"map file corrupt: {exc}") from exc
+    if len(body) != raw_len + room_len + trail_len:
+        raise ValueError("map file size mismatch")
+    room = body[raw_len:raw_len + room_len] or None
+    trail = TrailBuffer.from_bytes(body[raw_len + room_len:])
+    return body[:raw_len], room, trail, geometry
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data``; synced first so a crash keeps old or new."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _write_trail_log(path: str, map_id: int, records: bytes, compact: bool) -> None:
+    header = _TRAIL_HEADER.pack(_TRAIL_MAGIC, map_id)
+    if compact:
+        _write_atomic(path, header + records)
+        return
+    with open(path, "ab") as fh:
+        if fh.tell() == 0:
+            fh.write(header)
+        fh.write(records)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def decode_trail_log(data: bytes) -> tuple[int, TrailBuffer]:
+    """``(map_id, trail)`` from a trail log; raises ValueError on a bad file."""
+    if len(data) < _TRAIL_HEADER.size:
+        raise ValueError("trail log truncated")
+    magic, map_id = _TRAIL_HEADER.unpack_from(data)
+    if magic != _TRAIL_MAGIC:
+        raise ValueError("not a trail log")
+    trail = TrailBuffer()
+    trail.extend_packed(data[_TRAIL_HEADER.size:])
+    return map_id, trail
+
+
+def _read(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def async_save_map_blob(
+    hass: HomeAssistant, path: str, map_data: MapData
+) -> None:
+    """Compress and write a map file in the executor.
+
+    The pixel buffers are snapshotted on the event loop first, so a frame
+    applied while the write runs cannot tear the file.
+    """
+    raw = bytes(map_data.raw_pixels)
+    room = bytes(map_data.room_pixels) if map_data.room_pixels else None
+    geometry = map_geometry(map_data)
+    await hass.async_add_executor_job(
+        lambda: _write_atomic(path, encode_map_blob(raw, room, geometry))
+    )
+
+
+async def async_load_map_blob(
+    hass: HomeAssistant, path: str
+) -> tuple[bytes, bytes | None, TrailBuffer, dict[str, int] | None] | None:
+    """Read and decode a map file in the executor (None when absent)."""
+
+    def _load() -> tuple[bytes, bytes | None, TrailBuffer, dict[str, int] | None] | None:
+        blob = _read(path)
+        return None if blob is None else decode_map_blob(blob)
+
+    return await hass.async_add_executor_job(_load)
+
+
+async def async_remove_map_blob(hass: HomeAssistant, path: str) -> None:
+    """Delete a map file if it exists."""
+    await hass.async_add_executor_job(_remove, path)
+
+
+async def async_write_trail_log(
+    hass: HomeAssistant, path: str, map_id: int, records: bytes, compact: bool = False
+) -> None:
+    """Append a batch of trail records and fsync, in the executor.
+
+    ``compact`` replaces the log with just ``records`` (a new session, another
+    map, or a log that has outgrown the trail it replays to).
+    """
+    await hass.async_add_executor_job(_write_trail_log, path, map_id, records, compact)
+
+
+async def async_load_trail_log(
+    hass: HomeAssistant, path: str
+) -> tuple[int, TrailBuffer] | None:
+    """Replay the trail log in the executor (None when absent)."""
+
+    def _load() -> tuple[int, TrailBuffer] | None:
+        data = _read(path)
+        return None if data is None else decode_trail_log(data)
+
+    return await hass.async_add_executor_job(_load)
+
+
+def map_meta_to_store(md: MapData) -> dict[str, Any]:
+    """JSON-safe ``MapData`` metadata; the pixels go to the map file."""
+    return {
+        "width": md.width,
+        "height": md.height,
+        "origin_x": md.origin_x,
+        "origin_y": md.origin_y,
+        "resolution": md.resolution,
+        "room_outline_width": md.room_outline_width,
+        "room_outline_height": md.room_outline_height,
+        "room_outline_origin_x": md.room_outline_origin_x,
+        "room_outline_origin_y": md.room_outline_origin_y,
+        "room_names": {str(k): v for k, v in md.room_names.items()},
+        "virtual_walls": [[list(p) for p in wall] for wall in md.virtual_walls],
+        "forbidden_zones": [[list(p) for p in zone] for zone in md.forbidden_zones],
+        "ban_mop_zones": [[list(p) for p in zone] for zone in md.ban_mop_zones],
+    }
+
+
+def map_data_from_store(
+    md_raw: dict[str, Any],
+    raw_pixels: bytes | None = None,
+    room_pixels: bytes | None = None,
+) -> MapData:
+    """Rebuild ``MapData`` from metadata plus the map file's pixels.
+
+    Stores written before the map file existed carry base64 ``raw_pixels`` /
+    ``room_pixels`` inline; those are used when no pixels are passed.
+    """
+    if raw_pixels is None:
+        raw_pixels = base64.b64decode(md_raw["raw_pixels"])
+        if md_raw.get("room_pixels"):
+            room_pixels = base64.b64decode(md_raw["room_pixels"])
+    return MapData(
+        raw_pixels=raw_pixels,
+        width=md_raw["width"],
+        height=md_raw["height"],
+        origin_x=md_raw["origin_x"],
+        origin_y=md_raw["origin_y"],
+        resolution=md_raw["resolution"],
+        room_pixels=room_pixels,
+        room_outline_width=md_raw.get("room_outline_width", 0),
+        room_outline_height=md_raw.get("room_outline_height", 0),
+        room_outline_origin_x=md_raw.get("room_outline_origin_x", 0),
+        room_outline_origin_y=md_raw.get("room_outline_origin_y", 0),
+        room_names={int(k): v for k, v in md_raw.get("room_names", {}).items()},
+        virtual_walls=[(tuple(w[0]), tuple(w[1])) for w in md_raw.get("virtual_walls", [])],
+        forbidden_zones=[[tuple(p) for p in zone] for zone in md_raw.get("forbidden_zones", [])],
+        ban_mop_zones=[[tuple(p) for p in zone] for zone in md_raw.get("ban_mop_zones", [])],
+    )
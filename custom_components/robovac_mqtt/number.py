@@ -9,14 +9,17 @@ from typing import Any
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator
-from .entity import API_TYPE_NOVEL, filter_supported_entities
+from .entity import (
+    API_TYPE_NOVEL,
+    async_add_coordinator_entities,
+    filter_supported_entities,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,43 +33,44 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Setup number entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding number entities for %s", coordinator.device_name)
-
-        # Dock number entities require protobuf DPS (novel/scalar); legacy
-        # (Tuya Cloud plain-value) devices have no station support.
-        if coordinator.api_type == "legacy":
-            continue
-
-        entities.extend(
-            filter_supported_entities(
-                coordinator,
-                [
-                    DockNumberEntity(
-                        coordinator,
-                        "wash_frequency_value",
-                        "Wash Frequency Value (Time)",
-                        15,
-                        25,
-                        1,  # step
-                        lambda cfg: cfg.get("wash", {})
-                        .get("wash_freq", {})
-                        .get("time_or_area", {})
-                        .get("value", 15),
-                        _set_wash_freq_value,
-                        icon="mdi:clock-time-four-outline",
-                    ),
-                    VolumeNumberEntity(coordinator),
-                ],
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding number entities for %s", coordinator.device_name)
+
+            # Dock number entities require protobuf DPS (novel/scalar); legacy
+            # (Tuya Cloud plain-value) devices have no station support.
+            if coordinator.api_type == "legacy":
+                continue
+
+            entities.extend(
+                filter_supported_entities(
+                    coordinator,
+                    [
+                        DockNumberEntity(
+                            coordinator,
+                            "wash_frequency_value",
+                            "Wash Frequency Value (Time)",
+                            15,
+                            25,
+                            1,  # step
+                            lambda cfg: cfg.get("wash", {})
+                            .get("wash_freq", {})
+                            .get("time_or_area", {})
+                            .get("value", 15),
+                            _set_wash_freq_value,
+                            icon="mdi:clock-time-four-outline",
+                        ),
+                        VolumeNumberEntity(coordinator),
+                    ],
+                )
             )
-        )
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 def _set_wash_freq_value(cfg: dict[str, Any], val: float) -> None:
@@ -0,0 +1,109 @@
+"""Per-device map render scheduler.
+
+Render triggers (pose, activity, battery, dock, new map frame) arrive in bursts.
+Cancelling the awaiting task does not stop the executor thread already inside
+``render_map_png``, so each device funnels its renders through one scheduler:
+
+- at most one render in flight;
+- a dirty flag collapses every request made meanwhile into one trailing render,
+  snapshotted from the latest state when it starts;
+- renders start at most ``max_fps`` times a second;
+- renders run on a private single-thread pool, never on HA's shared executor
+  (coroutine jobs, which hand the work to a worker process, are awaited).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+RenderJob = Callable[[], bytes] | Callable[[], Awaitable[bytes]]
+
+
+class RenderScheduler:
+    """Coalescing, rate-limited render loop for one device.
+
+    ``snapshot`` runs on the event loop right before each render and returns
+    the job to run in the render thread (or None to skip). ``on_result`` gets
+    the rendered bytes back on the event loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        snapshot: Callable[[], RenderJob | None],
+        on_result: Callable[[bytes], None],
+        max_fps: float = 1.0,
+    ) -> None:
+        self.hass = hass
+        self.name = name
+        self.max_fps = max_fps
+        self._snapshot = snapshot
+        self._on_result = on_result
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._task: asyncio.Task | None = None
+        self._dirty = False
+        self._last_start = 0.0
+        self.renders = 0
+        self.requests = 0
+
+    @property
+    def busy(self) -> bool:
+        """Whether a render is running or waiting on the frame-rate cap."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def request(self) -> None:
+        """Ask for a render of the latest state (cheap, coalesced)."""
+        self.requests += 1
+        self._dirty = True
+        if not self.busy:
+            self._task = self.hass.async_create_background_task(
+                self._run(), f"{self.name} render"
+            )
+
+    async def _run(self) -> None:
+        while self._dirty:
+            if self.max_fps > 0:
+                delay = self._last_start + 1 / self.max_fps - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._dirty = False
+            job = self._snapshot()
+            if job is None:
+                continue
+            self._last_start = time.monotonic()
+            self.renders += 1
+            try:
+                result = await self.async_run(job)
+            except Exception as exc:
+                _LOGGER.warning("%s: map render failed: %s", self.name, exc)
+                continue
+            self._on_result(result)
+
+    async def async_run(self, job: RenderJob) -> bytes:
+        """Run a one-off job (e.g. another image size) on the render thread."""
+        if inspect.iscoroutinefunction(job):
+            return await job()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, cast(Callable[[], bytes], job)
+        )
+
+    @callback
+    def shutdown(self) -> None:
+        """Drop pending work and release the render thread."""
+        self._dirty = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -9,14 +9,13 @@ from typing import Any
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from ._orphan_cleanup import prune_orphan_entities
 from .const import (
-    DOMAIN,
     DRY_DURATION_MAP,
     EUFY_CLEAN_CLEANING_INTENSITIES,
     EUFY_CLEAN_CLEANING_MODES,
@@ -28,7 +27,12 @@ from .const import (
     VOICE_CATALOG,
 )
 from .coordinator import EufyCleanCoordinator
-from .entity import API_TYPE_NOVEL, API_TYPE_SCALAR, filter_supported_entities
+from .entity import (
+    API_TYPE_NOVEL,
+    API_TYPE_SCALAR,
+    async_add_coordinator_entities,
+    filter_supported_entities,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -74,98 +78,99 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Setup select entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding select entities for %s", coordinator.device_name)
-
-        # Universal selects that work on every api type, including legacy:
-        # SuctionLevelSelectEntity's set_fan_speed is a supported legacy command,
-        # and CleaningPatternSelectEntity is scalar-only (dropped for legacy by
-        # filter_supported_entities anyway).
-        candidates = [
-            SuctionLevelSelectEntity(coordinator),
-            CleaningPatternSelectEntity(coordinator),
-        ]
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding select entities for %s", coordinator.device_name)
+
+            # Universal selects that work on every api type, including legacy:
+            # SuctionLevelSelectEntity's set_fan_speed is a supported legacy command,
+            # and CleaningPatternSelectEntity is scalar-only (dropped for legacy by
+            # filter_supported_entities anyway).
+            candidates = [
+                SuctionLevelSelectEntity(coordinator),
+                CleaningPatternSelectEntity(coordinator),
+            ]
 
-        # Novel-only selects. Legacy (Tuya Cloud plain-value) devices cannot
-        # drive these: their commands route to build_legacy_command, which
-        # returns {} and is silently dropped — so a legacy device would show
-        # functional-looking but no-op dropdowns. filter_supported_entities does
-        # NOT exclude them because effective_api_type buckets "legacy" as
-        # "novel", so guard explicitly (matching number/button/sensor).
-        if coordinator.api_type != "legacy":
-            candidates += [
-                CleaningModeSelectEntity(coordinator),
-                WaterLevelSelectEntity(coordinator),
-                MopIntensitySelectEntity(coordinator),
-                CleaningIntensitySelectEntity(coordinator),
-                DockSelectEntity(
-                    coordinator,
-                    "wash_frequency_mode",
-                    "Wash Frequency Mode",
-                    ["ByRoom", "ByTime"],
-                    lambda cfg: (
-                        "ByRoom"
-                        if cfg.get("wash", {})
-                        .get("wash_freq", {})
-                        .get("mode", "ByPartition")
-                        == "ByPartition"
-                        else "ByTime"
+            # Novel-only selects. Legacy (Tuya Cloud plain-value) devices cannot
+            # drive these: their commands route to build_legacy_command, which
+            # returns {} and is silently dropped — so a legacy device would show
+            # functional-looking but no-op dropdowns. filter_supported_entities does
+            # NOT exclude them because effective_api_type buckets "legacy" as
+            # "novel", so guard explicitly (matching number/button/sensor).
+            if coordinator.api_type != "legacy":
+                candidates += [
+                    CleaningModeSelectEntity(coordinator),
+                    WaterLevelSelectEntity(coordinator),
+                    MopIntensitySelectEntity(coordinator),
+                    CleaningIntensitySelectEntity(coordinator),
+                    DockSelectEntity(
+                        coordinator,
+                        "wash_frequency_mode",
+                        "Wash Frequency Mode",
+                        ["ByRoom", "ByTime"],
+                        lambda cfg: (
+                            "ByRoom"
+                            if cfg.get("wash", {})
+                            .get("wash_freq", {})
+                            .get("mode", "ByPartition")
+                            == "ByPartition"
+                            else "ByTime"
+                        ),
+                        _set_wash_freq_mode,
+                        icon="mdi:calendar-sync",
                     ),
-                    _set_wash_freq_mode,
-                    icon="mdi:calendar-sync",
-                ),
-                DockSelectEntity(
-                    coordinator,
-                    "dry_duration",
-                    "Dry Duration",
-                    list(DRY_DURATION_MAP.values()),
-                    _get_dry_duration,
-                    _set_dry_duration,
-                    icon="mdi:timer-sand",
-                ),
-                DockSelectEntity(
-                    coordinator,
-                    "auto_empty_mode",
-                    "Auto Empty Mode",
-                    ["Smart", "15 min", "30 min", "45 min", "60 min"],
-                    _get_collect_dust_mode,
-                    _set_collect_dust_mode,
-                    icon="mdi:delete-restore",
-                ),
-                VoiceSelectEntity(coordinator),
-            ]
+                    DockSelectEntity(
+                        coordinator,
+                        "dry_duration",
+                        "Dry Duration",
+                        list(DRY_DURATION_MAP.values()),
+                        _get_dry_duration,
+                        _set_dry_duration,
+                        icon="mdi:timer-sand",
+                    ),
+                    DockSelectEntity(
+                        coordinator,
+                        "auto_empty_mode",
+                        "Auto Empty Mode",
+                        ["Smart", "15 min", "30 min", "45 min", "60 min"],
+                        _get_collect_dust_mode,
+                        _set_collect_dust_mode,
+                        icon="mdi:delete-restore",
+                    ),
+                    VoiceSelectEntity(coordinator),
+                ]
+
+            # Transport-based hiding (complementary to api-type gating):
+            # Scene data is delivered through Eufy's encrypted P2P channel which
+            # only the MQTT transport receives — skip on Tuya transports rather
+            # than expose permanently-`unknown` UI.
+            if coordinator.connection_type == "mqtt":
+                candidates.append(SceneSelectEntity(coordinator))
+                candidates.append(MapSelectEntity(coordinator))
+            # Room list is normally P2P-only too, but the user can supply a
+            # manual {room_id: name} override through the options flow which
+            # works on every transport.
+            if coordinator.connection_type == "mqtt" or coordinator.room_name_overrides:
+                candidates.append(RoomSelectEntity(coordinator))
+
+            entities.extend(filter_supported_entities(coordinator, candidates))
+
+        # Prune registry orphans (e.g., scene/clean_room entities registered by an
+        # older build but no longer created on Tuya transports).
+        prune_orphan_entities(
+            hass,
+            config_entry.entry_id,
+            coordinators,
+            added_unique_ids={e.unique_id for e in entities if e.unique_id},
+            platform="select",
+        )
 
-        # Transport-based hiding (complementary to api-type gating):
-        # Scene data is delivered through Eufy's encrypted P2P channel which
-        # only the MQTT transport receives — skip on Tuya transports rather
-        # than expose permanently-`unknown` UI.
-        if coordinator.connection_type == "mqtt":
-            candidates.append(SceneSelectEntity(coordinator))
-            candidates.append(MapSelectEntity(coordinator))
-        # Room list is normally P2P-only too, but the user can supply a
-        # manual {room_id: name} override through the options flow which
-        # works on every transport.
-        if coordinator.connection_type == "mqtt" or coordinator.room_name_overrides:
-            candidates.append(RoomSelectEntity(coordinator))
-
-        entities.extend(filter_supported_entities(coordinator, candidates))
-
-    # Prune registry orphans (e.g., scene/clean_room entities registered by an
-    # older build but no longer created on Tuya transports).
-    prune_orphan_entities(
-        hass,
-        config_entry.entry_id,
-        coordinators,
-        added_unique_ids={e.unique_id for e in entities if e.unique_id},
-        platform="select",
-    )
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 def _set_wash_freq_mode(cfg: dict[str, Any], val: str) -> None:
@@ -9,14 +9,18 @@ from typing import Any
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator
-from .entity import API_TYPE_NOVEL, API_TYPE_SCALAR, filter_supported_entities
+from .entity import (
+    API_TYPE_NOVEL,
+    API_TYPE_SCALAR,
+    async_add_coordinator_entities,
+    filter_supported_entities,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,52 +34,53 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Setup switch entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding switch entities for %s", coordinator.device_name)
-
-        # FindRobot works on every transport (find_robot is a legacy command).
-        # The dock/station/setting switches are novel-only — legacy (Tuya Cloud
-        # plain-value) devices can't drive them and they'd register permanently
-        # unavailable, so skip them for legacy (matching number/button/sensor).
-        if coordinator.api_type == "legacy":
-            candidates = [FindRobotSwitchEntity(coordinator)]
-        else:
-            candidates = [
-                DockSwitchEntity(
-                    coordinator,
-                    "auto_empty",
-                    "Auto Empty",
-                    lambda cfg: cfg.get("collectdust_v2", {})
-                    .get("sw", {})
-                    .get("value", False),
-                    set_collect_dust,
-                    icon="mdi:delete-restore",
-                ),
-                DockSwitchEntity(
-                    coordinator,
-                    "auto_wash",
-                    "Auto Wash",
-                    lambda cfg: cfg.get("wash", {}).get("cfg", "CLOSE")
-                    == "STANDARD",
-                    set_wash_cfg,
-                    icon="mdi:water-sync",
-                ),
-                DoNotDisturbSwitchEntity(coordinator),
-                OffPeakChargingSwitchEntity(coordinator),
-                ChildLockSwitchEntity(coordinator),
-                FindRobotSwitchEntity(coordinator),
-                BoostIQSwitchEntity(coordinator),
-                AutoReturnSwitchEntity(coordinator),
-                ActivityLogSwitchEntity(coordinator),
-            ]
-        entities.extend(filter_supported_entities(coordinator, candidates))
-
-    async_add_entities(entities)
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding switch entities for %s", coordinator.device_name)
+
+            # FindRobot works on every transport (find_robot is a legacy command).
+            # The dock/station/setting switches are novel-only — legacy (Tuya Cloud
+            # plain-value) devices can't drive them and they'd register permanently
+            # unavailable, so skip them for legacy (matching number/button/sensor).
+            if coordinator.api_type == "legacy":
+                candidates = [FindRobotSwitchEntity(coordinator)]
+            else:
+                candidates = [
+                    DockSwitchEntity(
+                        coordinator,
+                        "auto_empty",
+                        "Auto Empty",
+                        lambda cfg: cfg.get("collectdust_v2", {})
+                        .get("sw", {})
+                        .get("value", False),
+                        set_collect_dust,
+                        icon="mdi:delete-restore",
+                    ),
+                    DockSwitchEntity(
+                        coordinator,
+                        "auto_wash",
+                        "Auto Wash",
+                        lambda cfg: cfg.get("wash", {}).get("cfg", "CLOSE")
+                        == "STANDARD",
+                        set_wash_cfg,
+                        icon="mdi:water-sync",
+                    ),
+                    DoNotDisturbSwitchEntity(coordinator),
+                    OffPeakChargingSwitchEntity(coordinator),
+                    ChildLockSwitchEntity(coordinator),
+                    FindRobotSwitchEntity(coordinator),
+                    BoostIQSwitchEntity(coordinator),
+                    AutoReturnSwitchEntity(coordinator),
+                    ActivityLogSwitchEntity(coordinator),
+                ]
+            entities.extend(filter_supported_entities(coordinator, candidates))
+
+        async_add_entities(entities)
+
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 def set_collect_dust(cfg: dict[str, Any], val: bool) -> None:
@@ -6,13 +6,13 @@ from datetime import time as dt_time
 from homeassistant.components.time import TimeEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api.commands import build_command
-from .const import DOMAIN
 from .coordinator import EufyCleanCoordinator
+from .entity import async_add_coordinator_entities
 
 
 async def async_setup_entry(
@@ -21,17 +21,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up DND time entities."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
-
-    entities = []
-    for coordinator in coordinators:
-        entities.append(DoNotDisturbStartTimeEntity(coordinator))
-        entities.append(DoNotDisturbEndTimeEntity(coordinator))
-        entities.append(OffPeakChargingStartTimeEntity(coordinator))
-        entities.append(OffPeakChargingEndTimeEntity(coordinator))
-
-    async_add_entities(entities)
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+        for coordinator in coordinators:
+            entities.append(DoNotDisturbStartTimeEntity(coordinator))
+            entities.append(DoNotDisturbEndTimeEntity(coordinator))
+            entities.append(OffPeakChargingStartTimeEntity(coordinator))
+            entities.append(OffPeakChargingEndTimeEntity(coordinator))
+
+        async_add_entities(entities)
+
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
 
 class _DoNotDisturbTimeEntity(CoordinatorEntity[EufyCleanCoordinator], TimeEntity):
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import logging
+import time
 from base64 import b64decode, b64encode
+from collections.abc import Awaitable
 from typing import Any, TypeVar
 
 from google.protobuf.message import Message
@@ -8,6 +11,7 @@ from google.protobuf.message import Message
 # This code comes from here: https://github.com/CodeFoodPixels/robovac/issues/68#issuecomment-2119573501  # noqa: E501
 
 T = TypeVar("T", bound=Message)
+R = TypeVar("R")
 
 
 def is_protobuf_dps_value(value: Any) -> bool:
@@ -106,3 +110,20 @@ def encode_message(message: Message, has_length: bool = True) -> str:
         out = encode_varint(len(out)) + out
 
     return b64encode(out).decode("utf-8")
+
+
+async def log_timing(
+    logger: logging.Logger,
+    label: str,
+    awaitable: Awaitable[R],
+    timings: dict[str, float] | None = None,
+) -> R:
+    """Await ``awaitable``, debug-log how long it took and record it in ``timings``."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings[label] = elapsed
+        logger.debug("%s took %.0f ms", label, elapsed * 1000)
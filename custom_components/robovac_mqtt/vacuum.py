@@ -36,6 +36,7 @@ from .const import (
     SCALAR_SUCTION_LEVELS,
 )
 from .coordinator import EufyCleanCoordinator
+from .entity import async_add_coordinator_entities
 
 if TYPE_CHECKING:
     from homeassistant.components.vacuum import Segment
@@ -134,15 +135,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up vacuum entities for Eufy Clean devices."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinators: list[EufyCleanCoordinator] = data["coordinators"]
+    @callback
+    def _async_add(coordinators: list[EufyCleanCoordinator]) -> None:
+        entities = []
+        for coordinator in coordinators:
+            _LOGGER.debug("Adding vacuum entity for %s", coordinator.device_name)
+            entities.append(RoboVacMQTTEntity(coordinator, config_entry))
 
-    entities = []
-    for coordinator in coordinators:
-        _LOGGER.debug("Adding vacuum entity for %s", coordinator.device_name)
-        entities.append(RoboVacMQTTEntity(coordinator, config_entry))
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    async_add_coordinator_entities(hass, config_entry, _async_add)
 
     # Response service used by the bundled card to resolve a tapped map point to a
     # room id (tap-a-room-on-the-map selection). Registered once per platform setup;
@@ -0,0 +1,69 @@
+"""Benchmark: indexed (palette) vs RGB map PNG size and encode time.
+
+Renders the static layer of a synthetic 900x700 house map at 512 and 1024 px
+in both image styles and reports the PNG size and the best of five encodes.
+
+Usage (from the repository root, in the dev venv):
+    python scripts/bench_map_palette.py
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.robovac_mqtt.api.map_stream import (  # noqa: E402
+    MapBaseLayer,
+    MapData,
+    _pack_2bpp,
+)
+
+
+def _house_map(width: int, height: int, cols: int = 3, rows: int = 2) -> MapData:
+    """Walled grid of named rectangular rooms with furniture speckle."""
+    pv = np.zeros((height, width), np.uint8)
+    pv[20:height - 20, 20:width - 20] = 2
+    rooms = np.zeros((height, width), np.uint8)
+    names = {}
+    for i in range(cols):
+        for j in range(rows):
+            x0, x1 = 20 + i * (width - 40) // cols, 20 + (i + 1) * (width - 40) // cols
+            y0, y1 = 20 + j * (height - 40) // rows, 20 + (j + 1) * (height - 40) // rows
+            rid = 1 + i * rows + j
+            rooms[y0:y1, x0:x1] = rid << 2
+            pv[y0:y1, x0:x0 + 2] = 1
+            pv[y0:y0 + 2, x0:x1] = 1
+            names[rid] = f"Room {rid}"
+    pv[(np.arange(height)[:, None] * 7 + np.arange(width)) % 97 == 0] = 1
+    return MapData(
+        raw_pixels=_pack_2bpp(pv), width=width, height=height,
+        room_pixels=rooms.tobytes(), room_outline_width=width,
+        room_outline_height=height, room_names=names,
+    )
+
+
+def main() -> None:
+    map_data = _house_map(900, 700)
+    for max_px in (512, 1024):
+        for palette in (False, True):
+            img = MapBaseLayer(map_data, max_px, palette).refresh()
+            best = float("inf")
+            for _ in range(5):
+                buf = io.BytesIO()
+                start = time.perf_counter()
+                img.save(buf, format="PNG", optimize=False, compress_level=3)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{max_px:>5} px {'palette' if palette else 'rgb':>8}: "
+                f"{len(buf.getvalue()) / 1024:6.1f} KiB, {best * 1000:5.1f} ms encode"
+            )
+
+
+if __name__ == "__main__":
+    main()
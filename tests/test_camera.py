@@ -0,0 +1,87 @@
+"""Tests for the map camera's push-driven MJPEG stream."""
+
+import asyncio
+import contextlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from custom_components.robovac_mqtt.camera import EufyMapCamera
+
+_SIGNAL = "robovac_mqtt_test_id_map_updated"
+
+
+class _FakeResponse:
+    """StreamResponse stand-in recording written multipart frames."""
+
+    instances: list["_FakeResponse"] = []
+
+    def __init__(self) -> None:
+        self.content_type = ""
+        self.frames: list[bytes] = []
+        self.fail_after: int | None = None
+        _FakeResponse.instances.append(self)
+
+    async def prepare(self, request) -> None:
+        pass
+
+    async def write(self, data: bytes) -> None:
+        if self.fail_after is not None and len(self.frames) >= self.fail_after:
+            raise ConnectionResetError
+        self.frames.append(data)
+
+
+def _camera(hass: HomeAssistant, images: list[bytes], max_fps: float) -> EufyMapCamera:
+    coordinator = MagicMock()
+    coordinator.device_id = "test_id"
+    coordinator.async_get_map_image = AsyncMock(side_effect=images)
+    coordinator.async_add_map_viewer.return_value = MagicMock()
+    camera = EufyMapCamera(coordinator, max_fps)
+    camera.hass = hass
+    camera.entity_id = "camera.test_map"
+    return camera
+
+
+async def test_stream_pushes_frames_on_map_updates_only(hass: HomeAssistant):
+    """The first frame goes out twice; later ones only after a map update."""
+    camera = _camera(hass, [b"one", b"two", b"three"], max_fps=0)
+    _FakeResponse.instances.clear()
+    with patch("custom_components.robovac_mqtt.camera.web.StreamResponse", _FakeResponse):
+        task = asyncio.create_task(camera.handle_async_mjpeg_stream(MagicMock()))
+        await asyncio.sleep(0.05)
+        response = _FakeResponse.instances[0]
+        assert response.content_type.startswith("multipart/x-mixed-replace")
+        assert len(response.frames) == 2 and response.frames[0].endswith(b"one\r\n")
+        assert camera.coordinator.async_get_map_image.await_count == 1  # idle
+
+        async_dispatcher_send(hass, _SIGNAL)
+        await asyncio.sleep(0.05)
+        assert len(response.frames) == 3 and response.frames[2].endswith(b"two\r\n")
+        assert b"Content-Length: 3\r\n" in response.frames[2]
+
+        camera.coordinator.async_add_map_viewer.assert_called_once()
+        response.fail_after = 3  # viewer goes away
+        async_dispatcher_send(hass, _SIGNAL)
+        assert await asyncio.wait_for(task, 1) is response
+        camera.coordinator.async_add_map_viewer.return_value.assert_called_once()
+
+
+async def test_stream_frame_rate_cap(hass: HomeAssistant):
+    """A burst of updates yields at most one frame per frame_interval."""
+    camera = _camera(hass, [b"a", b"b", b"c"], max_fps=10)
+    assert camera.frame_interval == 0.1
+    _FakeResponse.instances.clear()
+    with patch("custom_components.robovac_mqtt.camera.web.StreamResponse", _FakeResponse):
+        task = asyncio.create_task(camera.handle_async_mjpeg_stream(MagicMock()))
+        await asyncio.sleep(0.01)
+        for _ in range(5):
+            async_dispatcher_send(hass, _SIGNAL)
+            await asyncio.sleep(0.01)
+        response = _FakeResponse.instances[0]
+        assert len(response.frames) == 2  # still inside the 0.1 s window
+        await asyncio.sleep(0.15)
+        assert len(response.frames) == 3
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
@@ -1,8 +1,9 @@
 """Unit tests for the cloud login module."""
 
-import unittest.mock
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 
 from custom_components.robovac_mqtt.api import cloud as cloud_mod
@@ -251,22 +252,40 @@ def test_find_model_truncation_fallback():
 # ── Tuya Cloud login ────────────────────────────────────────────────
 
 
+def _region_clients(results: dict[str, object]):
+    """TuyaCloudClient stand-in whose login per region returns or raises."""
+    created: list[MagicMock] = []
+
+    def make_client(region, **kwargs):
+        mock = MagicMock()
+        mock.region = region
+        outcome = results[region]
+        if isinstance(outcome, Exception):
+            mock.login = AsyncMock(side_effect=outcome)
+        else:
+            mock.login = AsyncMock(return_value=outcome)
+        created.append(mock)
+        return mock
+
+    return make_client, created
+
+
 @pytest.mark.asyncio
 async def test_tuya_login_eu_success():
-    """tuya_login succeeds on EU region."""
+    """Both regions are raced; EU wins when it succeeds and is remembered."""
     login = _make_login()
     login._eufy_user_id = "test_user_123"
+    make_client, created = _region_clients({"EU": "eu_session", "US": "us_session"})
 
     with patch(
-        "custom_components.robovac_mqtt.api.cloud.TuyaCloudClient"
-    ) as MockClient:
-        mock_instance = MockClient.return_value
-        mock_instance.login = AsyncMock(return_value="session_id")
-
+        "custom_components.robovac_mqtt.api.cloud.TuyaCloudClient",
+        side_effect=make_client,
+    ):
         await login.tuya_login()
 
-    assert login.tuya_client is mock_instance
-    MockClient.assert_called_once_with("EU", websession=unittest.mock.ANY)
+    assert [c.region for c in created] == ["EU", "US"]
+    assert login.tuya_client is created[0]
+    assert login.preferred_tuya_region == "EU"
 
 
 @pytest.mark.asyncio
@@ -274,27 +293,45 @@ async def test_tuya_login_eu_fails_us_succeeds():
     """tuya_login falls back to US when EU fails."""
     login = _make_login()
     login._eufy_user_id = "test_user_123"
+    make_client, created = _region_clients(
+        {"EU": TuyaCloudError("ERR", "EU failed"), "US": "us_session"}
+    )
+
+    with patch(
+        "custom_components.robovac_mqtt.api.cloud.TuyaCloudClient",
+        side_effect=make_client,
+    ):
+        await login.tuya_login()
 
-    call_count = 0
+    assert login.tuya_client is created[1]
+    assert login.preferred_tuya_region == "US"
 
-    def make_client(region, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        mock = MagicMock()
-        if region == "EU":
-            mock.login = AsyncMock(side_effect=TuyaCloudError("ERR", "EU failed"))
-        else:
-            mock.login = AsyncMock(return_value="us_session")
-        return mock
+
+@pytest.mark.asyncio
+async def test_tuya_login_tries_remembered_region_alone():
+    """A remembered region is logged into on its own; the rest only on failure."""
+    login = _make_login()
+    login._eufy_user_id = "test_user_123"
+    login.preferred_tuya_region = "US"
+    make_client, created = _region_clients({"EU": "eu_session", "US": "us_session"})
 
     with patch(
         "custom_components.robovac_mqtt.api.cloud.TuyaCloudClient",
         side_effect=make_client,
     ):
         await login.tuya_login()
+    assert [c.region for c in created] == ["US"]
 
-    assert login.tuya_client is not None
-    assert call_count == 2
+    make_client, created = _region_clients(
+        {"EU": "eu_session", "US": TuyaCloudError("ERR", "gone")}
+    )
+    with patch(
+        "custom_components.robovac_mqtt.api.cloud.TuyaCloudClient",
+        side_effect=make_client,
+    ):
+        await login.tuya_login()
+    assert [c.region for c in created] == ["US", "EU"]
+    assert login.preferred_tuya_region == "EU"
 
 
 @pytest.mark.asyncio
@@ -422,16 +459,50 @@ async def test_get_cloud_devices_no_tuya_client():
 
 @pytest.mark.asyncio
 async def test_get_cloud_device_delegates_to_tuya():
-    """getCloudDevice should call tuya_client.get_device."""
+    """getCloudDevice reads the device's DPS from the Tuya device listing."""
     login = _make_login()
     mock_tuya = MagicMock()
-    mock_tuya.get_device = AsyncMock(return_value={"15": "Charging", "104": 100})
+    mock_tuya.get_device_list = AsyncMock(
+        return_value=[{"devId": "dev_123", "dps": {"15": "Charging", "104": 100}}]
+    )
     login.tuya_client = mock_tuya
 
     result = await login.getCloudDevice("dev_123")
 
     assert result == {"15": "Charging", "104": 100}
-    mock_tuya.get_device.assert_called_once_with("dev_123")
+    mock_tuya.get_device_list.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_cloud_polls_share_one_listing_and_fan_out():
+    """Concurrent polls join one listing; polls inside the share window reuse
+    it; subscribed devices that did not poll get their DPS pushed."""
+    login = _make_login()
+    mock_tuya = MagicMock()
+
+    async def listing():
+        await asyncio.sleep(0.01)
+        return [
+            {"devId": "a", "dps": {"104": 10}},
+            {"devId": "b", "dps": '{"104": 20}'},
+            {"devId": "c", "dps": {"104": 30}},
+        ]
+
+    mock_tuya.get_device_list = AsyncMock(side_effect=listing)
+    login.tuya_client = mock_tuya
+    pushed: dict[str, dict] = {}
+    for dev in ("a", "b", "c"):
+        login.subscribe_cloud_device(dev, lambda dps, dev=dev: pushed.setdefault(dev, dps))
+
+    a, b = await asyncio.gather(login.getCloudDevice("a"), login.getCloudDevice("b"))
+    assert (a, b) == ({"104": 10}, {"104": 20})
+    assert pushed == {"c": {"104": 30}}  # a and b got theirs as the poll result
+    assert await login.getCloudDevice("c") == {"104": 30}
+    assert mock_tuya.get_device_list.await_count == 1 and login.cloud_polls == 1
+
+    with patch.object(cloud_mod, "_CLOUD_POLL_SHARE_WINDOW", 0):
+        await login.getCloudDevice("a")
+    assert mock_tuya.get_device_list.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -442,9 +513,12 @@ async def test_send_cloud_command_delegates_to_tuya():
     mock_tuya.send_command = AsyncMock()
     login.tuya_client = mock_tuya
 
+    login._cloud_dps_at = 1e12  # a fresh shared listing
     await login.sendCloudCommand("dev_123", {"2": True})
 
     mock_tuya.send_command.assert_called_once_with("dev_123", {"2": True})
+    # The next poll must not be answered from a listing older than the command.
+    assert login._cloud_dps_at == 0.0
 
 
 @pytest.mark.asyncio
@@ -468,10 +542,10 @@ async def test_get_cloud_device_relogins_on_failure():
     login._eufy_user_id = "test_user"
     mock_tuya = MagicMock()
     # First call fails, second (after re-login) succeeds
-    mock_tuya.get_device = AsyncMock(
+    mock_tuya.get_device_list = AsyncMock(
         side_effect=[
             TuyaCloudError("EXPIRED", "Session expired"),
-            {"15": "Running", "104": 50},
+            [{"devId": "dev_123", "dps": {"15": "Running", "104": 50}}],
         ]
     )
     mock_tuya.sid = "old_sid"
@@ -482,7 +556,7 @@ async def test_get_cloud_device_relogins_on_failure():
 
     mock_relogin.assert_called_once()
     assert result == {"15": "Running", "104": 50}
-    assert mock_tuya.get_device.call_count == 2
+    assert mock_tuya.get_device_list.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -491,7 +565,7 @@ async def test_get_cloud_device_relogin_also_fails():
     login = _make_login()
     login._eufy_user_id = "test_user"
     mock_tuya = MagicMock()
-    mock_tuya.get_device = AsyncMock(
+    mock_tuya.get_device_list = AsyncMock(
         side_effect=TuyaCloudError("EXPIRED", "Session expired")
     )
     mock_tuya.sid = "old_sid"
@@ -852,3 +926,129 @@ async def test_tuya_supersedes_placeholder_on_id_mismatch_single_robot():
     assert len(login.cloud_devices) == 1
     assert login.cloud_devices[0]["deviceId"] == "tuya_devid"
     assert login.cloud_devices[0]["local_key"] == "k"
+
+
+def test_export_restore_state_round_trip():
+    """A restored snapshot stands in for login + discovery without the password."""
+    login = _make_login(mqtt_credentials={"certificate_pem": "PEM", "user_id": "u"})
+    login.eufyApi.session = {"access_token": "tok"}
+    login.eufyApi.user_info = {"user_center_id": "c"}
+    login._eufy_user_id = "eufy-1"
+    login.tuya_client = cloud_mod.TuyaCloudClient("US", websession=MagicMock())
+    login.tuya_client.sid = "sid-1"
+    login.mqtt_devices = [{"deviceId": "a", "apiType": "novel", "mqtt": True}]
+    login.cloud_devices = [{"deviceId": "b", "apiType": "legacy", "local_key": "k"}]
+
+    state = login.export_state()
+    assert "password123" not in repr(state)
+
+    restored = _make_login()
+    restored.restore_state(state)
+    assert restored.export_state() == state
+    assert restored.tuya_client.region == "US" and restored.tuya_client.sid == "sid-1"
+    assert restored.device_signature() == login.device_signature()
+    restored.mqtt_devices[0] = {**restored.mqtt_devices[0], "apiType": "scalar"}
+    assert restored.device_signature() != login.device_signature()
+
+
+@pytest.mark.asyncio
+async def test_init_runs_discovery_requests_concurrently():
+    """After login, the Eufy device lists and the Tuya login + list overlap;
+    the results are merged and every request is timed."""
+    login = _make_login()
+    login._eufy_user_id = "eufy-1"
+    login.eufyApi.login = AsyncMock(
+        return_value={"mqtt": {"endpoint": "x"}, "session": {"user_id": "eufy-1"}}
+    )
+    in_flight: set[str] = set()
+    overlap: set[frozenset[str]] = set()
+
+    def slow(name, result):
+        async def call(*_args):
+            in_flight.add(name)
+            await asyncio.sleep(0.01)
+            overlap.add(frozenset(in_flight))
+            in_flight.discard(name)
+            return result
+
+        return call
+
+    login.eufyApi.get_cloud_device_list = slow("cloud", [])
+    login.eufyApi.get_device_list = slow("aiot", [])
+    tuya = MagicMock()
+    tuya.get_device_list = slow("tuya_list", [{"devId": "t1", "localKey": "k"}])
+
+    async def tuya_login():
+        await slow("tuya_login", None)()
+        login.tuya_client = tuya
+
+    with patch.object(login, "tuya_login", tuya_login):
+        await login.init()
+
+    assert any({"cloud", "aiot", "tuya_login"} <= s for s in overlap)
+    assert [d["deviceId"] for d in login.cloud_devices] == ["t1"]
+    assert set(login.discovery_timings) == {
+        "Eufy login",
+        "Eufy cloud device list",
+        "Eufy AIOT device list",
+        "Tuya login",
+        "Tuya device list",
+    }
+
+
+@pytest.mark.asyncio
+async def test_init_keeps_eufy_devices_when_tuya_listing_fails():
+    """A network error from the Tuya device list only costs the Tuya devices."""
+    login = _make_login()
+    login.eufyApi.login = AsyncMock(
+        return_value={"mqtt": {"endpoint": "x"}, "session": {"user_id": "eufy-1"}}
+    )
+    login.eufyApi.get_cloud_device_list = AsyncMock(
+        return_value=[
+            {
+                "id": "AMP1",
+                "product": {"product_code": "T2080A", "name": "S1 Pro"},
+                "device_model": "T2080A",
+            }
+        ]
+    )
+    tuya = MagicMock()
+    tuya.get_device_list = AsyncMock(side_effect=aiohttp.ClientError("reset"))
+
+    async def tuya_login():
+        login.tuya_client = tuya
+
+    with patch.object(login, "tuya_login", tuya_login):
+        await login.init()
+
+    assert [d["deviceId"] for d in login.mqtt_devices] == ["AMP1"]
+    assert login.cloud_devices == []
+
+
+@pytest.mark.asyncio
+async def test_init_keeps_eufy_devices_when_tuya_merge_fails():
+    """A malformed Tuya entry that breaks the merge only costs the Tuya devices."""
+    login = _make_login()
+    login.eufyApi.login = AsyncMock(
+        return_value={"mqtt": {"endpoint": "x"}, "session": {"user_id": "eufy-1"}}
+    )
+    login.eufyApi.get_cloud_device_list = AsyncMock(
+        return_value=[
+            {
+                "id": "AMP1",
+                "product": {"product_code": "T2080A", "name": "S1 Pro"},
+                "device_model": "T2080A",
+            }
+        ]
+    )
+    tuya = MagicMock()
+    tuya.get_device_list = AsyncMock(return_value=[None])
+
+    async def tuya_login():
+        login.tuya_client = tuya
+
+    with patch.object(login, "tuya_login", tuya_login):
+        await login.init()
+
+    assert [d["deviceId"] for d in login.mqtt_devices] == ["AMP1"]
+    assert login.cloud_devices == []
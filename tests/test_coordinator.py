@@ -2,16 +2,43 @@
 
 # pylint: disable=redefined-outer-name
 
+import asyncio
+import io
+import json
+import zlib
 from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from custom_components.robovac_mqtt.api.map_stream import MapData
-from custom_components.robovac_mqtt.coordinator import EufyCleanCoordinator
+from PIL import Image
+
+from custom_components.robovac_mqtt.api.map_stream import (
+    PATH_BREAK,
+    PATH_MOP,
+    PATH_SHOW_TRAJECTORY,
+    MapData,
+)
+from custom_components.robovac_mqtt.coordinator import (
+    EufyCleanCoordinator,
+    _MapSlot,
+)
+from custom_components.robovac_mqtt.map_engine import (
+    MapEngine,
+    RemoteMapLayer,
+    decode_biz_timed,
+    shutdown_pool,
+)
+from custom_components.robovac_mqtt.map_storage import (
+    _HEADER,
+    _MAGIC_V1,
+    map_meta_to_store,
+)
 from custom_components.robovac_mqtt.models import VacuumState
+from custom_components.robovac_mqtt.proto.cloud import clean_record_pb2, stream_pb2
+from custom_components.robovac_mqtt.utils import encode_varint
 
 
 @pytest.fixture
@@ -69,6 +96,718 @@ def _coordinator_with_map(mock_hass, mock_login, map_data):
     return coordinator
 
 
+@pytest.mark.parametrize(
+    "size,expected",
+    [((None, None), 512), ((200, None), 256), ((300, 150), 512),
+     ((None, 600), 2000), ((1000, None), 2000), ((5000, 5000), 2000)],
+)
+def test_map_image_pyramid_level(mock_hass, mock_login, size, expected):
+    """The smallest of thumbnail / configured / native covering the request wins."""
+    mock_hass.config_entries.async_get_entry.return_value = None
+    map_data = MapData(raw_pixels=b"", width=2000, height=1000)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    assert coordinator._map_image_size_for(*size) == expected
+
+
+async def test_map_image_pyramid_renders_lazily_and_caches(mock_hass, mock_login):
+    """A new size is rendered on the render thread once per map version."""
+    mock_hass.config_entries.async_get_entry.return_value = None
+    map_data = MapData(raw_pixels=b"\xaa" * 250_000, width=1000, height=1000, resolution=5)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    coordinator.map_image = b"default"
+    coordinator._map_images = {512: b"default"}
+    try:
+        assert await coordinator.async_get_map_image() == b"default"
+        thumb = await coordinator.async_get_map_image(128, 128)
+        assert Image.open(io.BytesIO(thumb)).size == (256, 256)
+        assert await coordinator.async_get_map_image(200, None) is thumb
+        full = await coordinator.async_get_map_image(900, 900)
+        assert Image.open(io.BytesIO(full)).size == (1000, 1000)
+        assert set(coordinator._map_bases) == {256, 1000}
+    finally:
+        coordinator._render_scheduler.shutdown()
+
+
+async def test_process_engine_renders_through_remote_layer(mock_hass, mock_login):
+    """With the process engine the render job hands a remote layer to the worker."""
+    mock_hass.config_entries.async_get_entry.return_value = None
+    map_data = MapData(raw_pixels=b"\xaa" * 1024, width=64, height=64, resolution=5)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    coordinator._map_engine = engine = MagicMock()
+    engine.async_render = AsyncMock(return_value=b"png")
+
+    assert await coordinator._snapshot_map_render()() == b"png"
+    layer, sent, overlays = engine.async_render.call_args.args
+    assert isinstance(layer, RemoteMapLayer) and coordinator._map_bases == {512: layer}
+    assert sent is map_data and overlays["robot_style"] == "googly"
+    coordinator._render_scheduler.shutdown()
+
+
+async def test_map_renders_deferred_until_someone_watches(mock_hass, mock_login):
+    """Unwatched updates render nothing; the next request renders once."""
+    mock_hass.config_entries.async_get_entry.return_value = None
+    map_data = MapData(raw_pixels=b"\xaa" * 1024, width=64, height=64, resolution=5)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    coordinator._render_scheduler = scheduler = MagicMock()
+    scheduler.async_run = AsyncMock(return_value=b"fresh")
+    coordinator._rerender_map()
+    coordinator._rerender_map()
+    scheduler.request.assert_not_called()
+    assert coordinator.map_renders_deferred == 2
+
+    assert await coordinator.async_get_map_image() == b"fresh"
+    scheduler.async_run.assert_awaited_once()
+    assert coordinator.map_watched and not coordinator._map_stale
+    coordinator._rerender_map()
+    scheduler.request.assert_called_once()  # watched: renders go through
+
+    coordinator._last_map_request = 0.0
+    release = coordinator.async_add_map_viewer()
+    assert coordinator.map_watched
+    release()
+    release()
+    assert not coordinator.map_watched and coordinator._map_viewers == 0
+
+
+def _biz(map_proto) -> bytes:
+    """Wrap a Map proto as a biz/ protocol-41 MQTT payload."""
+    body = map_proto.SerializeToString()
+    hex_data = (encode_varint(len(body)) + body).hex()
+    return json.dumps({"payload": {"data": {"channel_id": 9, "data": hex_data}}}).encode()
+
+
+def test_biz_p_frame_patches_cached_map(mock_hass, mock_login):
+    """A P-frame is written into the cached MapData and only its box is invalidated."""
+    map_data = MapData(raw_pixels=b"\xaa" * 1024, width=64, height=64, resolution=5)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    layer = MagicMock()
+    coordinator._map_bases = {512: layer}
+    coordinator._rerender_map = MagicMock()
+
+    p_frame = stream_pb2.Map(
+        frame=stream_pb2.Map.P,
+        pixels=b"\x55" * 128,
+        pixel_size=128,
+        info=stream_pb2.MapInfo(width=32, height=16, resolution=5, origin={"x": 40, "y": 80}),
+    )
+    coordinator._handle_biz_message(_biz(p_frame))
+
+    assert coordinator._map_data is map_data
+    row = 16 * 16  # first patched row (y=16), 16 bytes per 64-px row
+    assert map_data.raw_pixels[row:row + 12] == b"\xaa" * 2 + b"\x55" * 8 + b"\xaa" * 2
+    assert map_data.raw_pixels[row - 16:row] == b"\xaa" * 16
+    layer.invalidate.assert_called_once_with((8, 16, 40, 32))
+    coordinator._rerender_map.assert_called_once()
+
+
+def test_biz_unaligned_p_frame_keeps_cached_map(mock_hass, mock_login):
+    """A P-frame that does not fit the cached grid is dropped, as is one that
+    arrives before any map: a fragment never replaces the floor map."""
+    map_data = MapData(raw_pixels=b"\xaa" * 1024, width=64, height=64, resolution=5)
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    coordinator._rerender_map = MagicMock()
+    bases = coordinator._map_bases
+
+    p_frame = stream_pb2.Map(
+        frame=stream_pb2.Map.P,
+        pixels=b"\x55" * 128,
+        pixel_size=128,
+        info=stream_pb2.MapInfo(width=32, height=16, resolution=5, origin={"x": -40, "y": 0}),
+    )
+    coordinator._handle_biz_message(_biz(p_frame))
+
+    assert coordinator._map_data is map_data
+    assert coordinator._map_data.raw_pixels == b"\xaa" * 1024
+    assert coordinator._map_bases is bases
+    coordinator._rerender_map.assert_not_called()
+
+    empty = _coordinator_with_map(mock_hass, mock_login, None)
+    empty._rerender_map = MagicMock()
+    empty._handle_biz_message(_biz(p_frame))
+    assert empty._map_data is None
+    empty._rerender_map.assert_not_called()
+
+
+def _biz_frame(channel_id: int, message) -> bytes:
+    """Wrap any stream proto as a biz/ payload on ``channel_id``."""
+    body = message.SerializeToString()
+    hex_data = (encode_varint(len(body)) + body).hex()
+    return json.dumps(
+        {"payload": {"data": {"channel_id": channel_id, "data": hex_data}}}
+    ).encode()
+
+
+def _routed_coordinator(mock_hass, mock_login, map_data=None):
+    coordinator = _coordinator_with_map(mock_hass, mock_login, map_data)
+    coordinator._rerender_map = MagicMock()
+    coordinator._handle_biz_message(
+        _biz_frame(
+            0,
+            stream_pb2.Metadata(
+                chan_ids={"path": 2, "room_params": 4, "dynamic_data": 6, "map_data": 9}
+            ),
+        )
+    )
+    return coordinator
+
+
+def test_biz_learns_channel_table(mock_hass, mock_login):
+    """A Metadata frame teaches the coordinator which channel carries what."""
+    coordinator = _routed_coordinator(mock_hass, mock_login)
+    assert coordinator._biz_channels == {
+        2: "path", 4: "room_params", 6: "dynamic_data", 9: "map_data",
+    }
+
+
+def test_biz_routes_small_map_frame_by_channel(mock_hass, mock_login):
+    """With a table, a small map frame is decoded as a map (no size heuristic)."""
+    coordinator = _routed_coordinator(mock_hass, mock_login)
+    small = stream_pb2.Map(
+        pixels=b"\xaa" * 4, pixel_size=4, info={"width": 4, "height": 4, "resolution": 5}
+    )
+    coordinator._handle_biz_message(_biz_frame(9, small))
+    assert coordinator._map_data is not None
+    assert coordinator._map_data.width == 4
+
+
+def test_biz_routes_pose_by_channel(mock_hass, mock_login):
+    """dynamic_data frames move the robot marker without trial decoding."""
+    map_data = MapData(raw_pixels=b"\xaa" * 100, width=20, height=20, resolution=5)
+    coordinator = _routed_coordinator(mock_hass, mock_login, map_data)
+    with patch(
+        "custom_components.robovac_mqtt.api.map_stream.try_extract_map_description"
+    ) as desc:
+        coordinator._handle_biz_message(
+            _biz_frame(6, stream_pb2.DynamicData(cur_pose={"x": 50, "y": 25}))
+        )
+    desc.assert_not_called()
+    assert coordinator._robot_pixel == (10, 5)
+
+
+def test_biz_routed_path_extends_trail(mock_hass, mock_login):
+    """Path frames feed the trail; hidden/off-map points break the next point."""
+    map_data = MapData(raw_pixels=b"\xaa" * 100, width=20, height=20, resolution=5)
+    coordinator = _routed_coordinator(mock_hass, mock_login, map_data)
+    show = PATH_SHOW_TRAJECTORY
+    path = clean_record_pb2.CleanRecordData.PathData(
+        points=[
+            {"xy": 10 | 10 << 16, "flags": show},
+            {"xy": 20 | 10 << 16, "flags": show | PATH_MOP},
+            {"xy": 30 | 10 << 16, "flags": 0},  # trajectory hidden
+            {"xy": 40 | 10 << 16, "flags": show},
+            {"xy": 5000 | 10 << 16, "flags": show},  # off the map
+        ]
+    )
+    coordinator._handle_biz_message(_biz_frame(2, path))
+    tail = clean_record_pb2.CleanRecordData.PathData(
+        points=[{"xy": 45 | 10 << 16, "flags": show}]
+    )
+    coordinator._handle_biz_message(_biz_frame(2, tail))
+    assert coordinator._robot_trail.to_list() == [
+        [2, 2, PATH_BREAK], [4, 2, PATH_MOP], [8, 2, PATH_BREAK], [9, 2, PATH_BREAK],
+    ]
+
+    # Once Path frames flow, poses only move the robot marker.
+    coordinator.data.activity = "cleaning"
+    coordinator._handle_biz_message(
+        _biz_frame(6, stream_pb2.DynamicData(cur_pose={"x": 75, "y": 50}))
+    )
+    assert coordinator._robot_pixel == (15, 10)
+    assert len(coordinator._robot_trail) == 4
+
+
+def test_biz_routed_room_params_update_map(mock_hass, mock_login):
+    """room_params frames replace the current map's names, drop the cached
+    static layers and re-render."""
+    map_data = MapData(raw_pixels=b"\xaa" * 100, width=20, height=20)
+    coordinator = _routed_coordinator(mock_hass, mock_login, map_data)
+    coordinator._map_bases = {64: MagicMock()}
+    coordinator._handle_biz_message(
+        _biz_frame(4, stream_pb2.RoomParams(rooms=[{"id": 2, "name": "Hall"}]))
+    )
+    assert coordinator._map_data.room_names == {2: "Hall"}
+    assert coordinator._map_data is not map_data
+    assert coordinator._map_bases == {}
+    coordinator._rerender_map.assert_called_once()
+
+
+def test_biz_routed_fields_wait_for_first_map(mock_hass, mock_login):
+    """Room names that arrive before any map are applied to the first plain map."""
+    coordinator = _routed_coordinator(mock_hass, mock_login)
+    coordinator._handle_biz_message(
+        _biz_frame(4, stream_pb2.RoomParams(rooms=[{"id": 2, "name": "Hall"}]))
+    )
+    assert coordinator._map_data is None
+    coordinator._handle_biz_message(
+        _biz_frame(9, stream_pb2.Map(pixels=b"\xaa" * 4, pixel_size=4, info={"width": 4, "height": 4}))
+    )
+    assert coordinator._map_data.room_names == {2: "Hall"}
+    assert coordinator._pending_map_fields == {}
+
+
+def test_biz_resent_map_frame_is_skipped(mock_hass, mock_login):
+    """An identical map frame is recognised before decoding and not re-rendered."""
+    coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+    coordinator._rerender_map = MagicMock()
+    frame = _biz(stream_pb2.Map(pixels=b"\xaa" * 256, pixel_size=256, info={"width": 32, "height": 32}))
+
+    coordinator._handle_biz_message(frame)
+    first = coordinator._map_data
+    with patch(
+        "custom_components.robovac_mqtt.api.map_stream.try_extract_map_data"
+    ) as extract:
+        coordinator._handle_biz_message(frame)
+    extract.assert_not_called()
+    assert coordinator._map_data is first
+    assert coordinator.skipped_map_frames == 1
+    coordinator._rerender_map.assert_called_once()
+
+    # A changed frame is decoded as usual.
+    coordinator._handle_biz_message(
+        _biz(stream_pb2.Map(pixels=b"\x55" * 256, pixel_size=256, info={"width": 32, "height": 32}))
+    )
+    assert coordinator._map_data is not first
+    assert coordinator.skipped_map_frames == 1
+
+
+def test_biz_resent_routed_fields_are_skipped(mock_hass, mock_login):
+    """Resent room_params frames are skipped per channel kind."""
+    map_data = MapData(raw_pixels=b"\xaa" * 100, width=20, height=20)
+    coordinator = _routed_coordinator(mock_hass, mock_login, map_data)
+    frame = _biz_frame(4, stream_pb2.RoomParams(rooms=[{"id": 2, "name": "Hall"}]))
+    coordinator._handle_biz_message(frame)
+    coordinator._handle_biz_message(frame)
+    assert coordinator.skipped_map_frames == 1
+    coordinator._rerender_map.assert_called_once()
+
+
+def _map_frame(value: int) -> bytes:
+    return _biz(stream_pb2.Map(pixels=bytes([value]) * 256, pixel_size=256,
+                               info={"width": 32, "height": 32}))
+
+
+def _switching_coordinator(mock_hass, mock_login):
+    mock_hass.async_create_task.side_effect = lambda coro: coro.close()
+    coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+    coordinator._rerender_map = MagicMock()
+    return coordinator
+
+
+def test_map_switch_swaps_to_cached_map(mock_hass, mock_login):
+    """Switching back to a map already seen shows it without waiting for frames."""
+    coordinator = _switching_coordinator(mock_hass, mock_login)
+    coordinator.data.map_id = 1
+    coordinator._handle_biz_message(_map_frame(0xAA))
+    first = coordinator._map_data
+    coordinator._map_bases = {512: MagicMock()}
+    coordinator._dock_pixel = (3, 4)
+    coordinator._robot_trail.append(1, 1)
+
+    coordinator._switch_map(2)
+    assert coordinator._map_data is None
+    assert coordinator._dock_pixel is None
+    assert not coordinator._robot_trail
+    coordinator.data.map_id = 2
+    coordinator._handle_biz_message(_map_frame(0x55))
+    second = coordinator._map_data
+    assert second is not first
+
+    coordinator._rerender_map.reset_mock()
+    coordinator._switch_map(1)
+    assert coordinator._map_data is first
+    assert set(coordinator._map_bases) == {512}
+    assert coordinator._dock_pixel == (3, 4)
+    coordinator._rerender_map.assert_called_once()
+    assert list(coordinator._map_cache) == [2, 1]
+
+
+def test_map_switch_adopts_id_for_unlabelled_map(mock_hass, mock_login):
+    """A map shown before any map_id was reported is filed under the first id."""
+    coordinator = _switching_coordinator(mock_hass, mock_login)
+    coordinator._handle_biz_message(_map_frame(0xAA))
+    shown = coordinator._map_data
+    coordinator._switch_map(7)
+    assert coordinator._map_data is shown
+    assert coordinator._map_data_id == 7
+    assert coordinator._map_cache[7].map_data is shown
+
+
+def test_map_cache_evicts_least_recently_used(mock_hass, mock_login):
+    coordinator = _switching_coordinator(mock_hass, mock_login)
+    for map_id in range(1, 7):
+        coordinator._switch_map(map_id)
+        coordinator.data.map_id = map_id
+        coordinator._handle_biz_message(_map_frame(map_id))
+    assert list(coordinator._map_cache) == [3, 4, 5, 6]
+
+
+async def test_map_switch_loads_persisted_map(mock_hass, mock_login, tmp_path):
+    """An uncached map is restored from its Store and map file in the background."""
+    coordinator = _switching_coordinator(_storage_hass(mock_hass, tmp_path), mock_login)
+    stored = MapData(raw_pixels=b"\x55" * 16, width=8, height=8, resolution=5,
+                     room_pixels=b"\x04" * 64, room_outline_width=8, room_outline_height=8)
+    saved = {"map_data": None}
+
+    class _FakeStore:
+        def __init__(self, _hass, _version, key):
+            assert key == "robovac_mqtt.test_id.map_3"
+
+        async def async_save(self, data):
+            saved["map_data"] = data
+
+        async def async_load(self):
+            return saved["map_data"]
+
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _FakeStore):
+        await coordinator._async_save_map_slot(3, _MapSlot(stored, dock_pixel=(1, 2)))
+        coordinator._map_data_id = 3
+        await coordinator._async_load_map_slot(3)
+
+    assert "raw_pixels" not in saved["map_data"]  # pixels live in the map file
+    assert (tmp_path / ".storage" / "robovac_mqtt.test_id.map_3.bin").exists()
+    assert coordinator._map_data.raw_pixels == stored.raw_pixels
+    assert coordinator._map_data.room_pixels == stored.room_pixels
+    assert coordinator._dock_pixel == (1, 2)
+    assert coordinator._map_cache[3].map_data is coordinator._map_data
+    coordinator._rerender_map.assert_called_once()
+
+
+def _storage_hass(mock_hass, tmp_path):
+    """Mock hass with real executor jobs and a temporary config dir."""
+    (tmp_path / ".storage").mkdir(exist_ok=True)
+    mock_hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    mock_hass.async_add_executor_job = (
+        lambda func, *args: asyncio.get_running_loop().run_in_executor(None, func, *args)
+    )
+    return mock_hass
+
+
+class _MemoryStore:
+    """Store stand-in keeping saved data in a shared dict keyed by store key."""
+
+    data: dict[str, Any] = {}
+    delayed: list[tuple[str, Any, float]] = []
+
+    def __init__(self, _hass, _version, key):
+        self.key = key
+
+    async def async_save(self, data):
+        _MemoryStore.data[self.key] = data
+
+    async def async_load(self):
+        return _MemoryStore.data.get(self.key)
+
+    def async_delay_save(self, data_func, delay=0):
+        _MemoryStore.delayed.append((self.key, data_func, delay))
+
+
+async def test_map_and_trail_persist_to_binary_file(mock_hass, mock_login, tmp_path):
+    """Saving writes pixels + trail to the map file and metadata only to the Store;
+    loading restores both and renders on the first request instead of a stored PNG."""
+    _storage_hass(mock_hass, tmp_path)
+    _MemoryStore.data = {"robovac_mqtt.test_id": {"map_image_png": "AAAA"}}
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _MemoryStore):
+        coordinator = _coordinator_with_map(
+            mock_hass, mock_login,
+            MapData(raw_pixels=bytearray(b"\xaa" * 16), width=8, height=8, resolution=5),
+        )
+        coordinator._map_data_id = 5
+        coordinator._robot_trail.append(1, 2)
+        coordinator._robot_trail.append(3, 4, PATH_MOP)
+        await coordinator.async_load_storage()
+        await coordinator._async_save_map_data()
+        assert {"map_data", "dock_pixel"} <= coordinator._store_dirty
+        await coordinator.async_flush_storage()
+
+        stored = _MemoryStore.data["robovac_mqtt.test_id"]
+        assert "map_image_png" not in stored and "robot_trail" not in stored
+        assert stored["map_data"]["map_id"] == 5 and "raw_pixels" not in stored["map_data"]
+
+        restored = _coordinator_with_map(mock_hass, mock_login, None)
+        await restored.async_load_storage()
+    assert restored._map_data.raw_pixels == b"\xaa" * 16
+    assert restored._map_data_id == 5 and restored.map_image is None
+    assert restored._robot_trail.to_list() == coordinator._robot_trail.to_list()
+    assert restored._map_stale
+
+
+async def test_map_file_geometry_wins_over_a_stale_store(
+    mock_hass, mock_login, tmp_path
+):
+    """A restart after the map file write but before the delayed Store write
+    restores the new pixels with their own geometry; an old-format file whose
+    size disagrees with the Store is rejected."""
+    _storage_hass(mock_hass, tmp_path)
+    old = MapData(raw_pixels=b"\xaa" * 16, width=8, height=8, resolution=5)
+    _MemoryStore.data = {"robovac_mqtt.test_id": {
+        "map_data": {**map_meta_to_store(old), "map_id": 5},
+    }}
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _MemoryStore):
+        coordinator = _coordinator_with_map(
+            mock_hass, mock_login,
+            MapData(raw_pixels=bytearray(b"\x55" * 32), width=16, height=8,
+                    origin_x=-40, resolution=5),
+        )
+        coordinator._map_data_id = 5
+        await coordinator._async_save_map_data()  # Store write still pending
+
+        restored = _coordinator_with_map(mock_hass, mock_login, None)
+        await restored.async_load_storage()
+        assert restored._map_data.raw_pixels == b"\x55" * 32
+        assert (restored._map_data.width, restored._map_data.origin_x) == (16, -40)
+
+        path = tmp_path / ".storage" / "robovac_mqtt.test_id.map_5.bin"
+        path.write_bytes(
+            _HEADER.pack(_MAGIC_V1, 32, 0, 0) + zlib.compress(b"\x55" * 32)
+        )
+        legacy = _coordinator_with_map(mock_hass, mock_login, None)
+        await legacy.async_load_storage()
+    assert legacy._map_data is None
+
+
+async def test_applied_map_frames_persist_without_rendering(
+    mock_hass, mock_login, tmp_path
+):
+    """Frames schedule one map file write per window; unload writes what is pending."""
+    _storage_hass(mock_hass, tmp_path)
+    _MemoryStore.data = {}
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _MemoryStore), patch(
+        "custom_components.robovac_mqtt.coordinator.async_call_later"
+    ) as call_later:
+        coordinator = _switching_coordinator(mock_hass, mock_login)
+        coordinator.data.map_id = 4
+        coordinator._handle_biz_message(_map_frame(0xAA))
+        coordinator._handle_biz_message(_map_frame(0x55))
+        call_later.assert_called_once()
+        assert call_later.call_args.args[1] == 30.0
+        assert coordinator.map_image is None  # nothing was rendered
+
+        coordinator.async_shutdown_timers()
+        await coordinator.async_flush_storage()
+
+    blob = tmp_path / ".storage" / "robovac_mqtt.test_id.map_4.bin"
+    assert blob.exists()
+    stored = _MemoryStore.data["robovac_mqtt.test_id"]
+    assert stored["map_data"]["map_id"] == 4
+    assert not coordinator._map_save_pending
+
+
+async def test_trail_log_appends_batches_and_compacts_per_session(
+    mock_hass, mock_login, tmp_path
+):
+    """Only new points are appended; a new session rewrites the log and the
+    trail is replayed from it on load."""
+    _storage_hass(mock_hass, tmp_path)
+    coordinator = _coordinator_with_map(
+        mock_hass, mock_login, MapData(raw_pixels=b"", width=8, height=8, resolution=5)
+    )
+    coordinator._map_data_id = 7
+    log = tmp_path / ".storage" / "robovac_mqtt.test_id.trail.bin"
+    for i in range(3):
+        coordinator._robot_trail.append(i, i)
+    await coordinator._async_flush_trail()
+    first = log.stat().st_size
+    coordinator._robot_trail.append(5, 5, PATH_MOP)
+    await coordinator._async_flush_trail()
+    assert log.stat().st_size == first + 5
+
+    restored = _coordinator_with_map(mock_hass, mock_login, None)
+    await restored._async_replay_trail_log(7)
+    assert restored._robot_trail.to_list() == coordinator._robot_trail.to_list()
+
+    coordinator._robot_trail.clear()
+    coordinator._trail_log_compact = True
+    coordinator._robot_trail.append(1, 1)
+    await coordinator._async_flush_trail()
+    assert log.stat().st_size == first - 10
+
+    other = _coordinator_with_map(mock_hass, mock_login, None)
+    await other._async_replay_trail_log(8)  # log belongs to map 7
+    assert len(other._robot_trail) == 0 and other._trail_log_compact
+
+
+async def test_store_writes_are_coalesced(mock_hass, mock_login):
+    """Map discovery and segment updates only touch the in-memory model; the
+    one delayed write sees all of them and never re-reads the Store."""
+    _MemoryStore.data = {"robovac_mqtt.test_id": {"dock_pixel": [3, 4], "extra": 1}}
+    _MemoryStore.delayed = []
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _MemoryStore):
+        coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+        await coordinator.async_load_storage()
+        with patch.object(_MemoryStore, "async_load") as load:
+            for map_id in (1, 2, 3):
+                coordinator.last_seen_maps[map_id] = ""
+                await coordinator.async_save_maps()
+            await coordinator.async_save_segments([{"id": "1", "name": "Hall"}])
+        load.assert_not_called()
+
+    assert _MemoryStore.data["robovac_mqtt.test_id"] == {"dock_pixel": [3, 4], "extra": 1}
+    funcs = {func for _key, func, _delay in _MemoryStore.delayed}
+    assert len(funcs) == 1
+    assert funcs.pop()() == {
+        "dock_pixel": [3, 4],
+        "extra": 1,
+        "last_seen_maps": {"1": "", "2": "", "3": ""},
+        "last_seen_segments": [{"id": "1", "name": "Hall"}],
+    }
+    assert not coordinator._store_dirty
+
+
+async def test_legacy_inline_map_store_still_loads(mock_hass, mock_login, tmp_path):
+    """Stores from older versions (base64 pixels, JSON trail) load unchanged."""
+    _storage_hass(mock_hass, tmp_path)
+    legacy = {
+        "map_data": {"raw_pixels": "VVVV", "width": 4, "height": 4, "origin_x": 0,
+                     "origin_y": 0, "resolution": 5, "map_id": 2},
+        "robot_trail": [[1, 1], [2, 2, PATH_MOP]],
+    }
+    _MemoryStore.data = {"robovac_mqtt.test_id": legacy}
+    with patch("custom_components.robovac_mqtt.coordinator.Store", _MemoryStore):
+        coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+        await coordinator.async_load_storage()
+    assert coordinator._map_data.raw_pixels == b"\x55" * 3
+    assert coordinator._robot_trail.to_list() == [[1, 1, PATH_BREAK], [2, 2, PATH_MOP]]
+
+
+def _async_hass(mock_hass):
+    """Give the mock hass real background tasks and executor jobs."""
+    loop = asyncio.get_running_loop()
+    mock_hass.async_create_background_task = lambda coro, name: loop.create_task(coro)
+    mock_hass.async_add_executor_job = lambda func, *args: loop.run_in_executor(None, func, *args)
+    return mock_hass
+
+
+async def test_biz_large_map_frames_decode_off_loop_in_order(mock_hass, mock_login):
+    """Big Map frames wait for the worker and every one is applied, in order."""
+    coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+    _async_hass(mock_hass)
+    coordinator._rerender_map = MagicMock()
+    frames = [
+        _biz(stream_pb2.Map(pixels=bytes([v]) * 4096, pixel_size=4096,
+                            info={"width": 128, "height": 128}))
+        for v in (0x00, 0x55, 0xAA)
+    ]
+    for frame in frames:
+        coordinator._handle_biz_message(frame)
+    assert coordinator._map_data is None  # nothing decoded on the loop
+    await coordinator._biz_worker
+
+    assert coordinator._map_data.raw_pixels == b"\xaa" * 4096
+    assert coordinator.biz_frames_dropped == 0
+    assert coordinator.biz_offloop_seconds > 0
+    assert coordinator._biz_slots == {}
+    assert coordinator._rerender_map.call_count == 3
+
+
+async def test_biz_failed_decode_does_not_stop_the_drain(mock_hass, mock_login):
+    """A frame whose decode raises is logged and skipped; later frames apply."""
+    coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+    _async_hass(mock_hass)
+    coordinator._rerender_map = MagicMock()
+    frames = [
+        _biz(stream_pb2.Map(pixels=bytes([v]) * 4096, pixel_size=4096,
+                            info={"width": 128, "height": 128}))
+        for v in (0x55, 0xAA)
+    ]
+    calls = 0
+
+    def flaky_decode(*args):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("worker died")
+        return decode_biz_timed(*args)
+
+    with patch(
+        "custom_components.robovac_mqtt.coordinator.decode_biz_timed", flaky_decode
+    ):
+        for frame in frames:
+            coordinator._handle_biz_message(frame)
+        await coordinator._biz_worker
+
+    assert coordinator._map_data.raw_pixels == b"\xaa" * 4096
+    assert coordinator._biz_decoding is None
+    assert coordinator._rerender_map.call_count == 1
+
+
+async def test_biz_resend_is_skipped_across_worker_process(mock_hass, mock_login):
+    """A frame applied inline is recognised as a resend when it comes back
+    through the map worker process, whose str hashing is salted differently."""
+    coordinator = _coordinator_with_map(mock_hass, mock_login, None)
+    _async_hass(mock_hass)
+    coordinator._rerender_map = MagicMock()
+    frame = _biz(stream_pb2.Map(pixels=b"\xaa" * 4096, pixel_size=4096,
+                                info={"width": 128, "height": 128}))
+    engine = coordinator._map_engine = MapEngine("test_id")
+    try:
+        with patch(
+            "custom_components.robovac_mqtt.coordinator._BIZ_INLINE_MAX", len(frame) + 1
+        ):
+            coordinator._handle_biz_message(frame)
+        assert coordinator._map_data.raw_pixels == b"\xaa" * 4096
+        coordinator._handle_biz_message(frame)
+        await coordinator._biz_worker
+    finally:
+        shutdown_pool(wait=True)
+        engine.close()
+
+    assert coordinator.biz_offloop_seconds > 0
+    assert coordinator.skipped_map_frames == 1
+    coordinator._rerender_map.assert_called_once()
+
+
+async def test_biz_off_table_snapshots_latest_wins(mock_hass, mock_login):
+    """Snapshot frames on an off-table channel replace the one still waiting."""
+    coordinator = _routed_coordinator(mock_hass, mock_login)
+    _async_hass(mock_hass)
+    for v in (0x00, 0x55, 0xAA):
+        coordinator._handle_biz_message(_biz_frame(11, stream_pb2.Map(
+            pixels=bytes([v]) * 4096, pixel_size=4096, info={"width": 128, "height": 128}
+        )))
+    await coordinator._biz_worker
+
+    assert coordinator._map_data.raw_pixels == b"\xaa" * 4096
+    assert coordinator.biz_frames_dropped == 2
+
+
+async def test_biz_small_frame_waits_behind_large_one(mock_hass, mock_login):
+    """A small P-frame is not applied before a big frame of its channel."""
+    coordinator = _routed_coordinator(mock_hass, mock_login)
+    _async_hass(mock_hass)
+    coordinator._handle_biz_message(_biz_frame(9, stream_pb2.Map(
+        pixels=b"\xaa" * 4096, pixel_size=4096,
+        info={"width": 128, "height": 128, "resolution": 5},
+    )))
+    coordinator._handle_biz_message(_biz_frame(9, stream_pb2.Map(
+        frame=stream_pb2.Map.P, pixels=b"\x55" * 8, pixel_size=8,
+        info={"width": 32, "height": 1, "resolution": 5},
+    )))
+    assert coordinator._map_data is None
+    assert len(coordinator._biz_slots[9]) == 2
+    await coordinator._biz_worker
+
+    assert coordinator._map_data.raw_pixels[:8] == b"\x55" * 8
+    assert coordinator._map_data.raw_pixels[8:] == b"\xaa" * 4088
+
+
+async def test_biz_large_path_frames_are_all_applied(mock_hass, mock_login):
+    """Incremental Path frames queue instead of replacing each other."""
+    map_data = MapData(raw_pixels=b"\xaa" * 25_000, width=400, height=250, resolution=5)
+    coordinator = _routed_coordinator(mock_hass, mock_login, map_data)
+    _async_hass(mock_hass)
+    mock_hass.async_create_task = lambda coro: coro.close()  # trail log writes
+    show = PATH_SHOW_TRAJECTORY
+    for row in (10, 20):
+        path = clean_record_pb2.CleanRecordData.PathData(
+            points=[{"xy": x | row << 16, "flags": show} for x in range(0, 1800, 5)]
+        )
+        coordinator._handle_biz_message(_biz_frame(2, path))
+    await coordinator._biz_worker
+
+    assert coordinator.biz_frames_dropped == 0
+    assert len(coordinator._robot_trail) == 720
+
+
 def test_normalized_rects_to_quads_cm_no_map(mock_hass, mock_login):
     """With no map decoded yet, the helper returns [] so callers no-op."""
     coordinator = _coordinator_with_map(mock_hass, mock_login, None)
@@ -228,7 +967,7 @@ def test_remember_map_id_seeds_and_dedupes(mock_hass, mock_login):
 
 
 @pytest.mark.asyncio
-async def test_async_forget_map_prunes_and_persists(mock_hass, mock_login):
+async def test_async_forget_map_prunes_and_persists(mock_hass, mock_login, tmp_path):
     """forget_map drops a known id, persists, and refreshes listeners so the Switch Map
     selector stops offering it; an unknown id is a no-op (returns False, no extra work)."""
     device_info = {
@@ -236,13 +975,18 @@ async def test_async_forget_map_prunes_and_persists(mock_hass, mock_login):
         "deviceModel": "T2118",
         "deviceName": "Test Vac",
     }
-    coordinator = EufyCleanCoordinator(mock_hass, mock_login, device_info)
+    coordinator = EufyCleanCoordinator(
+        _storage_hass(mock_hass, tmp_path), mock_login, device_info
+    )
     coordinator.last_seen_maps = {6: "Home", 7: "Spare", 11: ""}
+    blob = tmp_path / ".storage" / "robovac_mqtt.test_id.map_6.bin"
+    blob.write_bytes(b"x")
     coordinator.async_save_maps = AsyncMock()
     coordinator.async_update_listeners = MagicMock()
 
     removed = await coordinator.async_forget_map(6)
     assert removed is True
+    assert not blob.exists()
     assert coordinator.last_seen_maps == {7: "Spare", 11: ""}
     coordinator.async_save_maps.assert_awaited_once()
     coordinator.async_update_listeners.assert_called_once()
@@ -521,6 +1265,7 @@ async def test_cloud_send_command(mock_hass, mock_login):
         "apiType": "legacy",
     }
     mock_login.sendCloudCommand = AsyncMock()
+    mock_hass.async_create_task = lambda coro: coro.close()
     coordinator = EufyCleanCoordinator(mock_hass, mock_login, device_info)
 
     await coordinator.async_send_command({"2": True})
@@ -607,7 +1352,7 @@ async def test_cloud_poll_success_resets_counter(mock_hass, mock_login):
 
     # Now succeed
     mock_login.getCloudDevice = AsyncMock(
-        return_value={"15": "Charging", "104": 100}
+        return_value={"15": "Charging", "104": 80}
     )
     await coordinator._async_update_data()
 
@@ -659,3 +1404,87 @@ async def test_cloud_poll_backoff_caps_at_max(mock_hass, mock_login):
         await coordinator._async_update_data()
 
     assert coordinator.update_interval <= timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("dps", "expected"),
+    [
+        ({"15": "Running", "104": 60}, timedelta(seconds=10)),
+        ({"15": "Recharge", "104": 40}, timedelta(seconds=10)),
+        ({"15": "Charging", "104": 80}, timedelta(seconds=30)),
+        ({"15": "Charging", "104": 100}, timedelta(minutes=5)),
+    ],
+)
+async def test_cloud_poll_interval_follows_activity(
+    mock_hass, mock_login, dps, expected
+):
+    """Adaptive polling is fast while moving and slow when docked and full."""
+    mock_login.getCloudDevice = AsyncMock(return_value=dps)
+    coordinator = _make_cloud_coordinator(mock_hass, mock_login)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.update_interval == expected
+
+
+@pytest.mark.asyncio
+async def test_cloud_poll_fixed_policy(mock_hass, mock_login):
+    """The fixed policy keeps the 30 s interval and skips command bursts."""
+    mock_login.getCloudDevice = AsyncMock(return_value={"15": "Running", "104": 60})
+    mock_login.sendCloudCommand = AsyncMock()
+    coordinator = _make_cloud_coordinator(mock_hass, mock_login)
+    coordinator.config_entry = MagicMock(options={"cloud_poll_policy": "fixed"})
+
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+    await coordinator.async_send_command({"2": True})
+    assert coordinator._cloud_poll_burst == 0
+    mock_hass.async_create_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cloud_command_starts_poll_burst(mock_hass, mock_login):
+    """A cloud command polls at once, then a few times at the burst rate."""
+    mock_login.getCloudDevice = AsyncMock(return_value={"15": "Charging", "104": 100})
+    mock_login.sendCloudCommand = AsyncMock()
+    refreshes = []
+    mock_hass.async_create_task = lambda coro: refreshes.append(coro.cr_code.co_name) or coro.close()
+    coordinator = _make_cloud_coordinator(mock_hass, mock_login)
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == timedelta(minutes=5)
+
+    await coordinator.async_send_command({"2": True})
+
+    assert refreshes == ["async_request_refresh"]
+    assert coordinator.update_interval == timedelta(seconds=5)
+    # Listings other devices triggered do not use up this device's burst.
+    for _ in range(5):
+        coordinator._handle_cloud_dps({"15": "Charging", "104": 100})
+    assert coordinator.update_interval == timedelta(seconds=5)
+    for _ in range(3):
+        await coordinator._async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=5)
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == timedelta(minutes=5)
+
+
+async def test_cloud_coordinator_takes_pushed_dps(mock_hass, mock_login):
+    """A cloud coordinator subscribes to the shared listing and applies DPS
+    another device's poll fetched."""
+    coordinator = _make_cloud_coordinator(mock_hass, mock_login)
+    coordinator.async_load_storage = AsyncMock()
+    await coordinator._initialize_cloud()
+    mock_login.subscribe_cloud_device.assert_called_once_with(
+        "cloud_dev", coordinator._handle_cloud_dps
+    )
+    coordinator._consecutive_cloud_failures = 2
+
+    with patch.object(coordinator, "async_set_updated_data") as set_data:
+        coordinator._handle_cloud_dps({"15": "Charging", "104": 80})
+
+    assert set_data.call_args[0][0].battery_level == 80
+    assert coordinator._consecutive_cloud_failures == 0
+    coordinator.async_shutdown_timers()
+    mock_login.subscribe_cloud_device.return_value.assert_called_once()
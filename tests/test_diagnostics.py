@@ -23,6 +23,14 @@ async def test_diagnostics_output():
     coordinator.last_update_success = True
     coordinator.update_interval = None
     coordinator._consecutive_cloud_failures = 0
+    coordinator.cloud_poll_policy = "adaptive"
+    coordinator._cloud_poll_burst = 2
+    coordinator.skipped_map_frames = 3
+    coordinator.biz_frames_dropped = 1
+    coordinator.biz_loop_seconds = 0.0123
+    coordinator.biz_offloop_seconds = 1.5
+    coordinator.map_watched = False
+    coordinator.map_renders_deferred = 7
 
     hass = MagicMock()
     entry = MagicMock()
@@ -51,6 +59,14 @@ async def test_diagnostics_output():
     assert device["connection_type"] == "mqtt"
     assert device["activity"] == "cleaning"
     assert device["battery_level"] == 75
+    assert device["skipped_map_frames"] == 3
+    assert device["biz_frames_dropped"] == 1
+    assert device["biz_event_loop_ms"] == 12.3
+    assert device["biz_offloaded_decode_ms"] == 1500.0
+    assert device["map_watched"] is False
+    assert device["map_renders_deferred"] == 7
+    assert device["cloud_poll_policy"] == "adaptive"
+    assert device["cloud_poll_burst"] == 2
 
     # Check password is redacted
     assert result["entry_data"]["password"] == "**REDACTED**"
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from unittest.mock import AsyncMock, MagicMock
 
+import aiohttp
 import pytest
 
 from custom_components.robovac_mqtt.api.http import _REQUEST_TIMEOUT, EufyHTTPClient
@@ -148,18 +149,85 @@ def _login_response(status: int, token: str | None = None) -> AsyncMock:
     return r
 
 
+def _mock_websession_routes(routes: dict[str, AsyncMock]) -> MagicMock:
+    """websession answering each request by the first route contained in its URL."""
+
+    def _ctx(url: str, *_args, **_kwargs) -> MagicMock:
+        resp = next(r for key, r in routes.items() if key in url)
+        c = MagicMock()
+        c.__aenter__ = AsyncMock(return_value=resp)
+        c.__aexit__ = AsyncMock(return_value=False)
+        return c
+
+    mock_session = MagicMock()
+    mock_session.post.side_effect = _ctx
+    mock_session.get.side_effect = _ctx
+    return mock_session
+
+
 @pytest.mark.asyncio
 async def test_login_validate_prefers_v2():
-    """v2 (unified Eufy app) login is tried first; success short-circuits v1."""
-    mock_session = _mock_websession_sequence(_login_response(200, "tok_v2"))
+    """Both credential sets are raced; v2 (unified Eufy app) wins when it works
+    and is remembered as the account's preferred login."""
+    mock_session = _mock_websession_routes(
+        {"v2/email/login": _login_response(200, "tok_v2"),
+         "email/login": _login_response(200, "tok_v1")}
+    )
     client = _make_client(websession=mock_session)
 
     result = await client.login(validate_only=True)
 
     assert result["session"]["access_token"] == "tok_v2"
-    assert mock_session.post.call_count == 1
     first_url = mock_session.post.call_args_list[0][0][0]
     assert "v2/email/login" in first_url
+    assert client.preferred_login == "v2 (Eufy app)"
+
+
+@pytest.mark.asyncio
+async def test_login_tries_remembered_strategy_alone():
+    """A remembered winner is attempted on its own; no race when it works."""
+    mock_session = _mock_websession_routes(
+        {"v2/email/login": _login_response(401),
+         "email/login": _login_response(200, "tok_v1")}
+    )
+    client = _make_client(websession=mock_session)
+    client.preferred_login = "v1 (Eufy Clean app)"
+
+    result = await client.login(validate_only=True)
+
+    assert result["session"]["access_token"] == "tok_v1"
+    assert mock_session.post.call_count == 1
+    assert "v2" not in mock_session.post.call_args_list[0][0][0]
+
+
+@pytest.mark.asyncio
+async def test_login_remembered_strategy_error_tries_the_others():
+    """A network error from the remembered set falls through to the other sets;
+    it is raised only when they fail too."""
+    ok = _mock_websession_routes({"v2/email/login": _login_response(200, "tok_v2")})
+    post = ok.post.side_effect
+
+    def _post(url, *args, **kwargs):
+        if "v2" not in url:
+            raise aiohttp.ClientConnectionError("v1 host down")
+        return post(url, *args, **kwargs)
+
+    ok.post.side_effect = _post
+    client = _make_client(websession=ok)
+    client.preferred_login = "v1 (Eufy Clean app)"
+
+    result = await client.login(validate_only=True)
+
+    assert result["session"]["access_token"] == "tok_v2"
+    assert client.preferred_login == "v2 (Eufy app)"
+
+    down = MagicMock()
+    down.post.side_effect = aiohttp.ClientConnectionError("offline")
+    client = _make_client(websession=down)
+    client.preferred_login = "v1 (Eufy Clean app)"
+    with pytest.raises(aiohttp.ClientError):
+        await client.login(validate_only=True)
+    assert down.post.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -237,17 +305,9 @@ async def test_login_falls_back_when_no_user_center_anywhere():
 
 
 @pytest.mark.asyncio
-async def test_login_real_sequence_v2_user_center_skips_v1():
+async def test_login_real_sequence_v2_user_center_wins_race():
     """End-to-end (real get_user_info/gtoken): when the v2 login yields a
-    user_center, v1 is never attempted and MQTT creds are fetched."""
-
-    def _ctx(resp: AsyncMock) -> MagicMock:
-        c = MagicMock()
-        c.__aenter__ = AsyncMock(return_value=resp)
-        c.__aexit__ = AsyncMock(return_value=False)
-        return c
-
-    login_resp = _login_response(200, "tok_v2")
+    user_center it wins over v1 and MQTT creds are fetched once."""
     userinfo_resp = AsyncMock()
     userinfo_resp.status = 200
     userinfo_resp.json = AsyncMock(
@@ -257,9 +317,14 @@ async def test_login_real_sequence_v2_user_center_skips_v1():
     mqtt_resp.status = 200
     mqtt_resp.json = AsyncMock(return_value={"data": {"endpoint": "mqtt"}})
 
-    mock_session = MagicMock()
-    mock_session.post.side_effect = [_ctx(login_resp), _ctx(mqtt_resp)]
-    mock_session.get.side_effect = [_ctx(userinfo_resp)]
+    mock_session = _mock_websession_routes(
+        {
+            "v2/email/login": _login_response(200, "tok_v2"),
+            "email/login": _login_response(401),
+            "user_center": userinfo_resp,
+            "mqtt": mqtt_resp,
+        }
+    )
     client = _make_client(websession=mock_session)
 
     result = await client.login()
@@ -269,14 +334,8 @@ async def test_login_real_sequence_v2_user_center_skips_v1():
     assert result["user"]["gtoken"]  # real gtoken computed by get_user_info
     assert result["mqtt"] == {"endpoint": "mqtt"}
     assert client.user_info["user_center_id"] == "uc1"
-    # Only one login POST happened (v1 not attempted).
-    login_posts = [
-        c.args[0]
-        for c in mock_session.post.call_args_list
-        if "email/login" in c.args[0]
-    ]
-    assert len(login_posts) == 1
-    assert "v2/email/login" in login_posts[0]
+    mqtt_posts = [c for c in mock_session.post.call_args_list if "mqtt" in c.args[0]]
+    assert len(mqtt_posts) == 1
 
 
 @pytest.mark.asyncio
@@ -300,17 +359,20 @@ async def test_get_cloud_device_list_falls_back_to_home_api():
 
 
 @pytest.mark.asyncio
-async def test_get_cloud_device_list_legacy_short_circuits():
-    """When the legacy endpoint returns devices, the home-api fallback is skipped."""
+async def test_get_cloud_device_list_prefers_legacy():
+    """Both endpoints are queried concurrently; a non-empty legacy list wins."""
     legacy = AsyncMock()
     legacy.status = 200
     legacy.json = AsyncMock(return_value={"devices": [{"id": "legacy_dev"}]})
+    home = AsyncMock()
+    home.status = 200
+    home.json = AsyncMock(return_value={"devices": [{"id": "home_dev"}]})
 
-    mock_session = _mock_websession_sequence(legacy, AsyncMock())
+    mock_session = _mock_websession_sequence(legacy, home)
     client = _make_client(websession=mock_session)
     client.session = {"access_token": "tok"}
 
     result = await client.get_cloud_device_list()
 
     assert result == [{"id": "legacy_dev"}]
-    assert mock_session.get.call_count == 1
+    assert mock_session.get.call_count == 2
@@ -1,5 +1,7 @@
 """Test component setup."""
 
+import asyncio
+import hashlib
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -43,6 +45,7 @@ async def test_load_unload_entry(hass: HomeAssistant):
             }
         ]
         mock_login.cloud_devices = []
+        mock_login.export_state.return_value = {}
 
         # Setup Coordinator mock
         mock_coord = mock_coord_cls.return_value
@@ -55,6 +58,7 @@ async def test_load_unload_entry(hass: HomeAssistant):
         # Mock client and disconnect method
         mock_coord.client = MagicMock()
         mock_coord.client.disconnect = AsyncMock()
+        mock_coord.async_flush_storage = AsyncMock()
 
         # Setup the config entry
         result = await hass.config_entries.async_setup(config_entry.entry_id)
@@ -124,6 +128,7 @@ async def test_bundled_eufy_clean_card_registered(hass: HomeAssistant):
             }
         ]
         mock_login.cloud_devices = []
+        mock_login.export_state.return_value = {}
 
         mock_coord = mock_coord_cls.return_value
         mock_coord.initialize = AsyncMock()
@@ -133,6 +138,7 @@ async def test_bundled_eufy_clean_card_registered(hass: HomeAssistant):
         mock_coord.data = MagicMock()
         mock_coord.client = MagicMock()
         mock_coord.client.disconnect = AsyncMock()
+        mock_coord.async_flush_storage = AsyncMock()
 
         result = await hass.config_entries.async_setup(config_entry.entry_id)
         assert result is True, f"Async setup failed, result: {result}"
@@ -196,6 +202,7 @@ async def test_mixed_mqtt_and_cloud_device_setup(hass: HomeAssistant):
                 "mqtt": False,
             }
         ]
+        mock_login.export_state.return_value = {}
 
         # Track coordinator creation calls
         coordinators = []
@@ -210,6 +217,7 @@ async def test_mixed_mqtt_and_cloud_device_setup(hass: HomeAssistant):
             coord.data = MagicMock()
             coord.client = MagicMock()
             coord.client.disconnect = AsyncMock()
+            coord.async_flush_storage = AsyncMock()
             coordinators.append((coord, device_info))
             return coord
 
@@ -269,3 +277,176 @@ async def test_setup_network_failure_raises_config_entry_not_ready(hass: HomeAss
         await hass.async_block_till_done()
 
     assert config_entry.state == ConfigEntryState.SETUP_RETRY
+
+
+def _cached_login_storage(hass_storage, entry_id, devices):
+    """Seed a warm-start login cache whose MQTT certificate is valid."""
+    hass_storage[f"{DOMAIN}.{entry_id}.login"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry_id}.login",
+        "data": {
+            "account": hashlib.sha256(b"user").hexdigest(),
+            "openudid": "cached-udid",
+            "mqtt_credentials": {"certificate_pem": "PEM"},
+            "mqtt_devices": devices,
+            "cloud_devices": [],
+        },
+    }
+
+
+def _coordinator_mock(mock_coord_cls):
+    mock_coord = mock_coord_cls.return_value
+    mock_coord.initialize = AsyncMock()
+    mock_coord.device_id = "test_device_id"
+    mock_coord.device_name = "Test Vac"
+    mock_coord.device_model = "T2118"
+    mock_coord.data = MagicMock()
+    mock_coord.client = MagicMock()
+    mock_coord.client.disconnect = AsyncMock()
+    mock_coord.async_flush_storage = AsyncMock()
+    return mock_coord
+
+
+async def test_warm_start_from_cache_runs_degraded_when_cloud_down(
+    hass: HomeAssistant, hass_storage
+):
+    """A cached login sets the entry up without waiting for the cloud; an
+    unreachable cloud leaves it running on the cached certificate."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "user", CONF_PASSWORD: "pass"},
+        entry_id="warm_entry",
+    )
+    config_entry.add_to_hass(hass)
+    devices = [{"deviceId": "test_device_id", "deviceName": "Test Vac"}]
+    _cached_login_storage(hass_storage, "warm_entry", devices)
+
+    with patch("custom_components.robovac_mqtt.EufyLogin") as mock_login_cls, patch(
+        "custom_components.robovac_mqtt.EufyCleanCoordinator"
+    ) as mock_coord_cls, patch(
+        "custom_components.robovac_mqtt.login_cache_usable", return_value=True
+    ), patch("custom_components.robovac_mqtt._REVALIDATE_RETRY", 3600):
+        mock_login = mock_login_cls.return_value
+        mock_login.mqtt_devices = devices
+        mock_login.cloud_devices = []
+        mock_login.init = AsyncMock(side_effect=aiohttp.ClientError("offline"))
+        _coordinator_mock(mock_coord_cls)
+
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=False)
+
+        assert config_entry.state == ConfigEntryState.LOADED
+        mock_login_cls.assert_any_call(
+            "user", "pass", "cached-udid", websession=unittest.mock.ANY
+        )
+        mock_login.restore_state.assert_called_once()
+        assert mock_login.restore_state.call_args[0][0]["mqtt_devices"] == devices
+        for _ in range(3):
+            await asyncio.sleep(0)
+        mock_login.init.assert_called_once()  # background revalidation
+        assert mock_login.login_state == "degraded"
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_revalidation_reloads_on_device_change_and_refreshes_cache(
+    hass: HomeAssistant, hass_storage
+):
+    """A successful background login refreshes the cache and reloads the entry
+    when discovery now differs from the cached device list."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "user", CONF_PASSWORD: "pass"},
+        entry_id="reval_entry",
+    )
+    config_entry.add_to_hass(hass)
+    _cached_login_storage(hass_storage, "reval_entry", [{"deviceId": "test_device_id"}])
+
+    with patch("custom_components.robovac_mqtt.EufyLogin") as mock_login_cls, patch(
+        "custom_components.robovac_mqtt.EufyCleanCoordinator"
+    ) as mock_coord_cls, patch(
+        "custom_components.robovac_mqtt.login_cache_usable", return_value=True
+    ), patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        mock_login = mock_login_cls.return_value
+        mock_login.mqtt_devices = [{"deviceId": "test_device_id", "deviceName": "Vac"}]
+        mock_login.cloud_devices = []
+        mock_login.init = AsyncMock()
+        mock_login.export_state.return_value = {"openudid": "fresh", "mqtt_devices": []}
+        mock_login.device_signature.side_effect = [["new"], ["old"]]
+        _coordinator_mock(mock_coord_cls)
+
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        reload.assert_called_once_with("reval_entry")
+        assert mock_login.login_state == "online"
+        assert hass_storage["robovac_mqtt.reval_entry.login"]["data"]["openudid"] == "fresh"
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_devices_initialize_concurrently_and_failures_retry(hass: HomeAssistant):
+    """A device that hangs past its timeout neither delays the others nor fails
+    setup; it is retried in the background and joins the running entry once it
+    answers, without reloading the other devices."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "user", CONF_PASSWORD: "pass"},
+        entry_id="parallel_entry",
+    )
+    config_entry.add_to_hass(hass)
+    names = ["fast_1", "hung", "fast_2"]
+    started: list[str] = []
+    hung_attempts = 0
+    made: list[MagicMock] = []
+
+    def make_coordinator(*args, **kwargs):
+        device_id = args[2]["deviceId"]
+        coord = _coordinator_mock(MagicMock())
+        coord.device_id = device_id
+        coord.device_name = device_id
+        coord.device_info = {"identifiers": {(DOMAIN, device_id)}, "name": device_id}
+        made.append(coord)
+
+        async def initialize():
+            nonlocal hung_attempts
+            started.append(device_id)
+            if device_id == "hung":
+                hung_attempts += 1
+                if hung_attempts == 1:
+                    await asyncio.sleep(3600)
+
+        coord.initialize = initialize
+        return coord
+
+    with patch("custom_components.robovac_mqtt.EufyLogin") as mock_login_cls, patch(
+        "custom_components.robovac_mqtt.EufyCleanCoordinator",
+        side_effect=make_coordinator,
+    ), patch("custom_components.robovac_mqtt._INIT_TIMEOUT", 0.05), patch(
+        "custom_components.robovac_mqtt._INIT_RETRY_MIN", 0
+    ), patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        mock_login = mock_login_cls.return_value
+        mock_login.init = AsyncMock()
+        mock_login.export_state.return_value = {}
+        mock_login.mqtt_devices = [{"deviceId": n, "deviceName": n} for n in names]
+        mock_login.cloud_devices = []
+
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert started[:3] == names  # all started before the hung one gave up
+        coordinators = hass.data[DOMAIN]["parallel_entry"]["coordinators"]
+        assert [c.device_id for c in coordinators] == ["fast_1", "fast_2", "hung"]
+        assert hung_attempts == 2
+        reload.assert_not_called()
+
+        timed_out = made[1]
+        timed_out.async_shutdown_timers.assert_called_once()
+        timed_out.async_flush_storage.assert_awaited_once()
+        timed_out.client.disconnect.assert_awaited_once()
+        assert coordinators[2] is made[3]
+        made[3].client.disconnect.assert_not_called()
+        assert hass.states.get("binary_sensor.hung_charging") is not None
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,47 @@
+"""Tests for the warm-start login cache."""
+
+from datetime import datetime, timedelta, timezone
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from custom_components.robovac_mqtt.login_cache import (
+    login_cache_usable,
+    mqtt_certificate_valid,
+)
+
+
+def _cert_pem(not_after: datetime) -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "eufy")])
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(not_after - timedelta(days=365))
+        .not_valid_after(not_after)
+        .sign(key, hashes.SHA256())
+    )
+    return cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def test_mqtt_certificate_validity():
+    """Only a parseable certificate that outlives the safety margin counts."""
+    now = datetime.now(timezone.utc)
+    assert mqtt_certificate_valid({"certificate_pem": _cert_pem(now + timedelta(days=30))})
+    assert not mqtt_certificate_valid({"certificate_pem": _cert_pem(now + timedelta(minutes=5))})
+    assert not mqtt_certificate_valid({"certificate_pem": "not a certificate"})
+    assert not mqtt_certificate_valid(None)
+
+
+def test_login_cache_usable():
+    """MQTT devices need a valid certificate; Tuya-only caches need devices."""
+    valid = {"certificate_pem": _cert_pem(datetime.now(timezone.utc) + timedelta(days=1))}
+    assert login_cache_usable({"mqtt_devices": [{}], "mqtt_credentials": valid})
+    assert not login_cache_usable({"mqtt_devices": [{}], "mqtt_credentials": None})
+    assert login_cache_usable({"mqtt_devices": [], "cloud_devices": [{}]})
+    assert not login_cache_usable({"mqtt_devices": [], "cloud_devices": []})
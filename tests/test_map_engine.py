@@ -0,0 +1,126 @@
+"""Tests for the optional process-pool map engine."""
+
+import asyncio
+import json
+import os
+import signal
+
+from custom_components.robovac_mqtt.api.map_stream import (
+    MapData,
+    TrailBuffer,
+    apply_map_patch,
+    render_map_png,
+)
+from custom_components.robovac_mqtt.map_engine import (
+    MapEngine,
+    RemoteMapLayer,
+    _pool,
+    _worker_layers,
+    decode_biz_timed,
+    render_in_worker,
+    shutdown_pool,
+)
+
+
+def _map(width: int = 40, height: int = 30, value: int = 1) -> MapData:
+    byte = value | value << 2 | value << 4 | value << 6
+    return MapData(raw_pixels=bytearray([byte]) * (width * height // 4), width=width, height=height)
+
+
+def _patch(map_data: MapData, x: int, y: int, value: int = 2) -> tuple[int, int, int, int]:
+    byte = value | value << 2 | value << 4 | value << 6
+    patch = MapData(raw_pixels=bytes([byte]) * 4, width=4, height=4,
+                    origin_x=x * 5, origin_y=y * 5, incremental=True)
+    return apply_map_patch(map_data, patch)
+
+
+def test_remote_layer_folds_dirty_boxes_into_sequence():
+    """Each job carries the union of boxes since the previous job."""
+    map_data = _map()
+    layer = RemoteMapLayer(map_data, 64)
+    assert layer.matches(map_data, 64) and not layer.matches(_map(), 64)
+    assert layer.take() == (layer.serial, -1, 0, None)
+    layer.invalidate((0, 0, 4, 4))
+    layer.invalidate((8, 8, 12, 12))
+    assert layer.take() == (layer.serial, 0, 2, (0, 0, 12, 12))
+    assert layer.take() == (layer.serial, 2, 2, None)
+    assert RemoteMapLayer(map_data, 64).serial != layer.serial
+
+
+def test_worker_patches_its_layer_and_matches_a_fresh_render():
+    """The worker reuses its layer across patches; stale sequences rebuild it."""
+    _worker_layers.clear()
+    map_data = _map()
+    layer = RemoteMapLayer(map_data, 64)
+    trail = TrailBuffer()
+    trail.append(2, 2)
+    trail.append(30, 20)
+    overlays = {"robot_pixel": (30, 20), "robot_trail": trail, "dock_pixel": (2, 2)}
+
+    render_in_worker("dev", layer.take(), map_data, 64, overlays)
+    cached = _worker_layers[("dev", 64)][2]
+    layer.invalidate(_patch(map_data, 8, 8))
+    png = render_in_worker("dev", layer.take(), map_data, 64, overlays)
+    assert _worker_layers[("dev", 64)][2] is cached
+    assert png == render_map_png(map_data, max_px=64, **overlays)
+
+    # Unchanged layer: the map is not shipped, the worker uses its copy.
+    assert render_in_worker("dev", layer.take(), None, 64, overlays) == png
+
+    # A job from another layer generation (e.g. a dropped one) rebuilds...
+    other = RemoteMapLayer(map_data, 64)
+    render_in_worker("dev", other.take(), map_data, 64, overlays)
+    assert _worker_layers[("dev", 64)][2] is not cached
+    # ...and without a copy of the map the worker asks for it.
+    _worker_layers.clear()
+    assert render_in_worker("dev", other.take(), None, 64, overlays) is None
+
+
+def test_engine_decodes_and_renders_in_a_worker_process():
+    """Round trip through a real spawned worker gives the in-process results."""
+    engine = MapEngine("dev")
+    try:
+        map_data = _map()
+        layer = RemoteMapLayer(map_data, 64)
+        overlays = {"robot_pixel": (10, 10)}
+        png = asyncio.run(engine.async_render(layer, map_data, overlays))
+        assert png == render_map_png(map_data, max_px=64, **overlays)
+        # Pose-only render: the map stays in the worker.
+        overlays = {"robot_pixel": (20, 12)}
+        png = asyncio.run(engine.async_render(layer, map_data, overlays))
+        assert png == render_map_png(map_data, max_px=64, **overlays)
+        # A restarted pool has no copy of the layer; the map is resent.
+        shutdown_pool(wait=True)
+        png = asyncio.run(engine.async_render(layer, map_data, overlays))
+        assert png == render_map_png(map_data, max_px=64, **overlays)
+
+        payload = json.dumps({"channel_id": 9, "data": "00"}).encode()
+        frame, seconds = asyncio.run(engine.async_decode(payload, {}, None, {}))
+        assert frame == decode_biz_timed(payload, {}, None, {})[0]
+        assert seconds >= 0
+    finally:
+        shutdown_pool(wait=True)
+        engine.close()
+
+
+def test_engine_replaces_a_crashed_worker():
+    """A killed worker breaks its pool; the slot respawns it and the job retries."""
+    engine = MapEngine("dev")
+    try:
+        map_data = _map()
+        layer = RemoteMapLayer(map_data, 64)
+        overlays = {"robot_pixel": (10, 10)}
+        asyncio.run(engine.async_render(layer, map_data, overlays))
+        broken = _pool.executors[engine._slot]
+        for pid in list(broken._processes):
+            os.kill(pid, signal.SIGKILL)
+
+        png = asyncio.run(engine.async_render(layer, map_data, overlays))
+        assert png == render_map_png(map_data, max_px=64, **overlays)
+        assert _pool.executors[engine._slot] not in (None, broken)
+
+        payload = json.dumps({"channel_id": 9, "data": "00"}).encode()
+        assert asyncio.run(engine.async_decode(payload, {}, None, {}))[0] is None
+    finally:
+        shutdown_pool(wait=True)
+        engine.close()
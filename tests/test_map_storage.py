@@ -0,0 +1,116 @@
+"""Tests for the binary map file format."""
+
+import zlib
+
+import pytest
+
+from custom_components.robovac_mqtt.api.map_stream import (
+    PATH_BREAK,
+    PATH_MOP,
+    MapData,
+    TrailBuffer,
+)
+from custom_components.robovac_mqtt.map_storage import (
+    _HEADER,
+    _MAGIC,
+    _MAGIC_V1,
+    _write_trail_log,
+    decode_map_blob,
+    decode_trail_log,
+    encode_map_blob,
+    map_data_from_store,
+    map_geometry,
+    map_meta_to_store,
+)
+
+
+def test_map_blob_round_trip_is_compact():
+    """Pixels, room mask and geometry come back intact; a typical map
+    compresses well."""
+    raw = bytes([0xAA] * 40_000 + [0x55] * 20_000)
+    room = bytes([4] * 100_000 + [8] * 140_000)
+    md = MapData(raw_pixels=raw, width=480, height=500, origin_x=-1200, origin_y=-35,
+                 room_pixels=room, room_outline_width=480, room_outline_height=500,
+                 room_outline_origin_x=-1200, room_outline_origin_y=-35)
+
+    blob = encode_map_blob(raw, room, map_geometry(md))
+    assert len(blob) < (len(raw) + len(room)) // 50
+    got_raw, got_room, got_trail, geometry = decode_map_blob(blob)
+    assert (got_raw, got_room) == (raw, room)
+    assert not got_trail
+    assert geometry == map_geometry(md)
+    assert geometry["origin_x"] == -1200
+
+    assert decode_map_blob(encode_map_blob(raw, None, geometry))[1] is None
+
+
+def test_legacy_map_blob_trail_is_still_read():
+    """Files written before the trail log carried the trail after the pixels
+    (and no geometry)."""
+    raw, room = b"\x01\x02\x03\x04", b"\x05\x06"
+    trail = TrailBuffer()
+    for i in range(20):
+        trail.append(i, 2 * i, PATH_MOP if i % 5 == 0 else 0)
+    packed = trail.to_bytes()
+    blob = _HEADER.pack(_MAGIC_V1, len(raw), len(room), len(packed)) + zlib.compress(
+        raw + room + packed
+    )
+
+    got_raw, got_room, got_trail, geometry = decode_map_blob(blob)
+    assert (got_raw, got_room) == (raw, room)
+    assert got_trail.to_list() == trail.to_list()
+    assert geometry is None
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [b"", b"NOTAMAP!" + bytes(12) + zlib.compress(b""),
+     _HEADER.pack(_MAGIC, 4, 0, 0) + zlib.compress(b"abcd"),
+     _HEADER.pack(_MAGIC_V1, 4, 0, 0) + zlib.compress(b"abc")],
+)
+def test_bad_map_blob_raises_value_error(blob):
+    """Truncated, foreign or inconsistent files are rejected."""
+    with pytest.raises(ValueError):
+        decode_map_blob(blob)
+
+
+def test_map_metadata_round_trip():
+    """Metadata plus file pixels rebuild the same MapData."""
+    md = MapData(raw_pixels=b"\x55" * 4, width=4, height=4, origin_x=-20, resolution=5,
+                 room_pixels=b"\x04" * 16, room_outline_width=4, room_outline_height=4,
+                 room_names={3: "Hall"}, virtual_walls=[((0, 0), (10, 10))],
+                 forbidden_zones=[[(1, 1), (2, 2), (3, 3), (4, 4)]])
+    meta = map_meta_to_store(md)
+    assert "raw_pixels" not in meta and "room_pixels" not in meta
+    assert map_data_from_store(meta, md.raw_pixels, md.room_pixels) == md
+
+
+def test_trail_log_append_and_replay(tmp_path):
+    """Batches append after one header; a torn last record is skipped on replay
+    and compaction keeps only what is passed."""
+    path = str(tmp_path / "trail.bin")
+    trail = TrailBuffer(max_points=8)
+    for i in range(6):
+        trail.append(i, 100 + i, PATH_MOP if i == 3 else 0)
+    _write_trail_log(path, 4, trail.pack_since(0), compact=False)
+    mark = trail.end
+    for i in range(6, 12):  # overflows: the oldest half is dropped
+        trail.append(i, 100 + i)
+    assert len(trail.pack_since(mark)) == 6 * 5
+    _write_trail_log(path, 4, trail.pack_since(mark), compact=False)
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    map_id, replayed = decode_trail_log(data + b"\x01\x02")
+    assert map_id == 4 and replayed.end == trail.end == 12
+    assert [p[:2] for p in replayed.to_list()] == [[i, 100 + i] for i in range(12)]
+    assert replayed.to_list()[3][2] == PATH_MOP
+    assert replayed.to_list()[0][2] & PATH_BREAK
+
+    _write_trail_log(path, 5, trail.pack_since(0), compact=True)
+    with open(path, "rb") as fh:
+        map_id, compacted = decode_trail_log(fh.read())
+    assert map_id == 5 and compacted.to_list() == trail.to_list()
+
+    with pytest.raises(ValueError):
+        decode_trail_log(b"EUFYMAP\x01" + bytes(4))
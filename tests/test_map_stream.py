@@ -1,17 +1,42 @@
 """Unit tests for api/map_stream.py: protocol parsing, LZ4 decompression, map render."""
+import io
 import json
+import random
 
+import numpy as np
 import pytest
+from PIL import Image
 
+from custom_components.robovac_mqtt.api import map_stream
 from custom_components.robovac_mqtt.api.map_stream import (
+    _COLOR_TABLE,
+    _PALETTE,
+    _PIXEL_COLORS,
+    _ROOM_PALETTE,
+    _TRAIL_COLORS,
+    PATH_BREAK,
+    PATH_MOP,
+    PATH_SHOW_TRAJECTORY,
+    MapBaseLayer,
     MapData,
+    TrailBuffer,
     _lz4_block_decompress,
+    _lz4_block_decompress_py,
+    _overlay_sprite,
+    _pack_2bpp,
+    _pixel_indices,
+    _unpack_2bpp,
+    apply_map_patch,
+    decode_biz_frame,
     parse_biz_protocol41,
     render_map_png,
+    try_extract_channel_table,
     try_extract_map_data,
     try_extract_map_description,
+    try_extract_map_fields,
+    try_extract_path_points,
 )
-from custom_components.robovac_mqtt.proto.cloud import stream_pb2
+from custom_components.robovac_mqtt.proto.cloud import clean_record_pb2, stream_pb2
 from custom_components.robovac_mqtt.utils import encode_varint
 
 # ---------------------------------------------------------------------------
@@ -34,6 +59,33 @@ def _make_map_hex(width: int, height: int) -> str:
     return prefixed.hex()
 
 
+def _pack(values: list[int]) -> bytes:
+    """Pack 2bpp pixel values LSB-first (the Map.pixels layout)."""
+    values = values + [0] * (-len(values) % 4)
+    return bytes(
+        values[i] | values[i + 1] << 2 | values[i + 2] << 4 | values[i + 3] << 6
+        for i in range(0, len(values), 4)
+    )
+
+
+def _make_p_frame_hex(width: int, height: int, origin: tuple[int, int], value: int) -> str:
+    """Return hex of a varint-prefixed incremental (P) Map covering one block."""
+    pixels = _pack([value] * (width * height))
+    map_proto = stream_pb2.Map(
+        frame=stream_pb2.Map.P,
+        pixels=pixels,
+        pixel_size=len(pixels),
+        info=stream_pb2.MapInfo(
+            width=width,
+            height=height,
+            resolution=5,
+            origin={"x": origin[0], "y": origin[1]},
+        ),
+    )
+    body = map_proto.SerializeToString()
+    return (encode_varint(len(body)) + body).hex()
+
+
 def _biz_payload(channel_id: int, hex_data: str) -> bytes:
     """Build a minimal biz/ MQTT JSON payload bytes."""
     return json.dumps(
@@ -103,6 +155,149 @@ def test_lz4_overlapping_backreference():
     assert _lz4_block_decompress(b"\x11Z\x01\x00", 6) == b"ZZZZZZ"
 
 
+def _lz4_ext(value: int) -> bytes:
+    out = bytearray()
+    while value >= 255:
+        out.append(255)
+        value -= 255
+    out.append(value)
+    return bytes(out)
+
+
+def _lz4_compress(src: bytes) -> bytes:
+    """Greedy spec-conformant LZ4 block encoder (test helper, no dependency)."""
+    out = bytearray()
+    table: dict[bytes, int] = {}
+    i = anchor = 0
+    n = len(src)
+    while i < n - 12:
+        key = src[i:i + 4]
+        cand = table.get(key)
+        table[key] = i
+        if cand is None or i - cand > 0xFFFF:
+            i += 1
+            continue
+        m = 4
+        while i + m < n - 5 and src[cand + m] == src[i + m]:
+            m += 1
+        lit = src[anchor:i]
+        out.append((min(len(lit), 15) << 4) | min(m - 4, 15))
+        if len(lit) >= 15:
+            out += _lz4_ext(len(lit) - 15)
+        out += lit + (i - cand).to_bytes(2, "little")
+        if m - 4 >= 15:
+            out += _lz4_ext(m - 4 - 15)
+        i = anchor = i + m
+    lit = src[anchor:]
+    out.append(min(len(lit), 15) << 4)
+    if len(lit) >= 15:
+        out += _lz4_ext(len(lit) - 15)
+    return bytes(out + lit)
+
+
+def _legacy_lz4_decompress(data: bytes) -> bytes:
+    """Byte-at-a-time decoder the slice-copy version replaced (reference)."""
+    output = bytearray()
+    pos, n = 0, len(data)
+    while pos < n:
+        token = data[pos]
+        pos += 1
+        lit_len = token >> 4
+        if lit_len == 15:
+            while pos < n:
+                lit_len += data[pos]
+                pos += 1
+                if data[pos - 1] != 255:
+                    break
+        output.extend(data[pos:pos + lit_len])
+        pos += lit_len
+        if pos >= n:
+            break
+        offset = data[pos] | (data[pos + 1] << 8)
+        pos += 2
+        match_len = (token & 0xF) + 4
+        if (token & 0xF) == 15:
+            while pos < n:
+                match_len += data[pos]
+                pos += 1
+                if data[pos - 1] != 255:
+                    break
+        start = len(output) - offset
+        for k in range(match_len):
+            output.append(output[start + k])
+    return bytes(output)
+
+
+def _frame_corpus() -> list[bytes]:
+    """Map-shaped payloads: 2bpp runs of unknown/free/wall and room-id outlines."""
+    rng = random.Random(41)
+    corpus = [b"", b"x", bytes(range(256)) * 3, bytes(rng.randrange(256) for _ in range(5000))]
+    for _ in range(6):
+        grid = bytearray()
+        while len(grid) < rng.randrange(2000, 40000):
+            grid += bytes([rng.choice((0x00, 0xAA, 0x55, 0xA5, 0xFF))]) * rng.randrange(1, 700)
+            grid += bytes(rng.randrange(256) for _ in range(rng.randrange(0, 40)))
+        corpus.append(bytes(grid))
+    for _ in range(3):
+        corpus.append(b"".join(
+            bytes([rng.randrange(0, 64) << 2]) * rng.randrange(1, 300) for _ in range(200)
+        ))
+    return corpus
+
+
+@pytest.mark.parametrize("index", range(13))
+def test_lz4_matches_legacy_decoder_on_corpus(index):
+    """Slice-copy decoder output is identical to the legacy byte loop and the source."""
+    src = _frame_corpus()[index]
+    block = _lz4_compress(src)
+    assert _legacy_lz4_decompress(block) == src
+    assert _lz4_block_decompress_py(block, len(src)) == src
+    assert _lz4_block_decompress(block, len(src)) == src
+
+
+def test_lz4_long_overlapping_run():
+    """A 1-byte-offset match far longer than the window doubles correctly."""
+    block = b"\x1f" + b"Q" + b"\x01\x00" + _lz4_ext(5000 - 15 - 4) + b"\x50ABCDE"
+    assert _lz4_block_decompress_py(block, 5006) == b"Q" * 5001 + b"ABCDE"
+
+
+def test_lz4_offset_outside_window_raises():
+    """A back-reference before the start of the output is rejected, not wrapped."""
+    with pytest.raises(ValueError):
+        _lz4_block_decompress_py(b"\x12AB\x05\x00", 8)
+
+
+def test_lz4_prefers_native_backend_and_falls_back(monkeypatch):
+    """The lz4 C extension is used when present; blocks it rejects use pure Python."""
+
+    class _Native:
+        class LZ4BlockError(Exception):
+            pass
+
+        calls: list[int] = []
+
+        @classmethod
+        def decompress(cls, data, uncompressed_size):
+            cls.calls.append(uncompressed_size)
+            if data == b"native":
+                return b"from-native"
+            raise cls.LZ4BlockError("strict")
+
+    monkeypatch.setattr(map_stream, "lz4_block", _Native)
+    assert _lz4_block_decompress(b"native", 11) == b"from-native"
+    assert _lz4_block_decompress(b"\x32ABC\x03\x00", 9) == b"ABCABCABC"
+    assert _Native.calls == [11, 9]
+
+
+def test_lz4_native_backend_agrees_on_corpus():
+    """When the lz4 package is installed it decodes the corpus identically."""
+    lz4_block = pytest.importorskip("lz4.block")
+    for src in _frame_corpus():
+        if src:
+            block = _lz4_compress(src)
+            assert lz4_block.decompress(block, uncompressed_size=len(src)) == src
+
+
 # ---------------------------------------------------------------------------
 # try_extract_map_data
 # ---------------------------------------------------------------------------
@@ -137,6 +332,203 @@ def test_try_extract_map_data_raw_pixels_correct():
     assert result.raw_pixels == b"\xaa" * 4  # 16 pixels at 2bpp = 4 bytes
 
 
+def test_try_extract_map_data_tracks_frame_type():
+    """Full maps are I-frames; a Map with frame=P is flagged incremental."""
+    assert try_extract_map_data(_make_map_hex(4, 4)).incremental is False
+    patch = try_extract_map_data(_make_p_frame_hex(3, 2, (10, 5), 1))
+    assert patch is not None
+    assert patch.incremental is True
+    assert (patch.width, patch.height, patch.origin_x, patch.origin_y) == (3, 2, 10, 5)
+
+
+# ---------------------------------------------------------------------------
+# P-frame patching
+# ---------------------------------------------------------------------------
+
+
+def _grid_map(width: int, height: int, seed: int) -> tuple[MapData, list[int]]:
+    rng = random.Random(seed)
+    values = [rng.randrange(4) for _ in range(width * height)]
+    return MapData(raw_pixels=_pack(values), width=width, height=height), values
+
+
+@pytest.mark.parametrize("x0,y0,w,h", [(0, 0, 3, 2), (5, 3, 6, 4), (10, 8, 1, 1), (0, 0, 11, 9)])
+def test_apply_map_patch_writes_block(x0, y0, w, h):
+    """The P-frame block lands at its origin offset; every other pixel is untouched."""
+    base, values = _grid_map(11, 9, x0 + y0)
+    patch = MapData(raw_pixels=_pack([3] * (w * h)), width=w, height=h,
+                    origin_x=x0 * 5, origin_y=y0 * 5, incremental=True)
+
+    assert apply_map_patch(base, patch) == (x0, y0, x0 + w, y0 + h)
+
+    for y in range(h):
+        for x in range(w):
+            values[(y0 + y) * 11 + x0 + x] = 3
+    assert bytes(base.raw_pixels) == _pack(values)
+
+
+def test_apply_map_patch_leaves_previous_buffer_intact():
+    """The patch lands in a new buffer, so a render reading the old one is unaffected."""
+    base, values = _grid_map(11, 9, 3)
+    before = base.raw_pixels
+    patch = MapData(raw_pixels=_pack([3] * 4), width=2, height=2, origin_x=10, origin_y=10)
+
+    assert apply_map_patch(base, patch) == (2, 2, 4, 4)
+    assert base.raw_pixels is not before
+    assert bytes(before) == _pack(values)
+
+
+def test_apply_map_patch_pads_truncated_base():
+    """A truncated base buffer is zero-extended before the patch is written."""
+    base = MapData(raw_pixels=b"\xff", width=4, height=4)
+    patch = MapData(raw_pixels=_pack([2, 2]), width=2, height=1, origin_x=10, origin_y=15)
+    assert apply_map_patch(base, patch) == (2, 3, 4, 4)
+    assert bytes(base.raw_pixels) == _pack([3] * 4 + [0] * 10 + [2, 2])
+
+
+@pytest.mark.parametrize(
+    "origin,size,resolution",
+    [((-5, 0), (2, 2), 5), ((0, 0), (12, 2), 5), ((3, 0), (2, 2), 5), ((0, 0), (2, 2), 10)],
+)
+def test_apply_map_patch_rejects_misfit(origin, size, resolution):
+    """Blocks outside the grid, off the pixel lattice or at another resolution -> None."""
+    base, values = _grid_map(11, 9, 1)
+    patch = MapData(raw_pixels=_pack([3] * (size[0] * size[1])), width=size[0],
+                    height=size[1], origin_x=origin[0], origin_y=origin[1],
+                    resolution=resolution)
+    assert apply_map_patch(base, patch) is None
+    assert bytes(base.raw_pixels) == _pack(values)
+
+
+@pytest.mark.parametrize("max_px", [4000, 20])
+def test_base_layer_patch_matches_full_render(max_px):
+    """Re-sampling only the dirty box matches a full re-render (LANCZOS +-1)."""
+    map_data = _random_room_map(3, 2, 1)
+    map_data.room_names = {}
+    # A no-go zone across the patched box must survive the patch.
+    x, y = map_data.origin_x, map_data.origin_y
+    map_data.forbidden_zones = [[(x + 50, y + 150), (x + 200, y + 150),
+                                 (x + 200, y + 220), (x + 50, y + 220)]]
+    layer = MapBaseLayer(map_data, max_px)
+    layer.refresh()
+
+    patch = MapData(raw_pixels=_pack([1] * 30), width=6, height=5,
+                    origin_x=map_data.origin_x + 20, origin_y=map_data.origin_y + 35)
+    layer.invalidate(apply_map_patch(map_data, patch))
+    patched = layer.refresh()
+    full = MapBaseLayer(map_data, max_px).refresh()
+
+    assert patched.size == full.size
+    diff = max(
+        abs(a - b)
+        for pa, pb in zip(patched.getdata(), full.getdata())
+        for a, b in zip(pa, pb)
+    )
+    assert diff <= (0 if max_px >= 4000 else 1)
+    assert (_unpack_2bpp(map_data.raw_pixels, map_data.width, map_data.height)[7:12, 4:10] == 1).all()
+
+
+def test_cached_base_layer_renders_like_a_fresh_one():
+    """Pose-only renders on a reused static layer match a from-scratch render."""
+    map_data = _random_room_map(5, 0, 0)
+    x, y = map_data.origin_x, map_data.origin_y
+    map_data.ban_mop_zones = [[(x, y), (x + 100, y), (x + 100, y + 100), (x, y + 100)]]
+    map_data.virtual_walls = [((x, y), (x + 300, y + 200))]
+    layer = MapBaseLayer(map_data, 40)
+    assert layer.refresh() is not layer.refresh()  # callers draw on copies
+    assert layer.labels
+
+    trail = TrailBuffer()
+    for px in range(0, map_data.width, 4):
+        trail.append(px, map_data.height // 2)
+    for robot in [(3, 4), (9, 9)]:
+        kw = dict(robot_pixel=robot, robot_trail=trail, dock_pixel=(1, 1), max_px=40)
+        cached = render_map_png(map_data, base=layer, **kw)
+        assert cached == render_map_png(map_data, **kw)
+
+
+def test_overlay_sprites_are_built_once_per_kind_and_mode():
+    """Dock/robot/badge sprites and label tiles come from module-level caches."""
+    map_data = _random_room_map(3, 0, 0)
+    kw = dict(robot_pixel=(10, 10), dock_pixel=(3, 3), robot_status="washing", max_px=40)
+    render_map_png(map_data, **kw)
+    before = _overlay_sprite.cache_info()
+    render_map_png(map_data, **kw)
+    after = _overlay_sprite.cache_info()
+    assert after.misses == before.misses and after.hits == before.hits + 3
+    first, second = MapBaseLayer(map_data, 40), MapBaseLayer(map_data, 40)
+    first.refresh()
+    second.refresh()
+    assert first.labels and first.labels[0][1] is second.labels[0][1]
+
+    for kind in ("dock", "googly", "dot", "washing"):
+        rgba, mask = _overlay_sprite(kind, False)
+        indexed, indexed_mask = _overlay_sprite(kind, True)
+        assert indexed.mode == "P" and mask.tobytes() == indexed_mask.tobytes()
+        assert indexed.convert("RGB").tobytes() == Image.composite(
+            rgba, Image.new("RGBA", rgba.size, _PALETTE[0]), mask
+        ).convert("RGB").tobytes()
+
+
+def _house_map(width: int, height: int, cols: int = 3, rows: int = 2) -> MapData:
+    """Walled grid of named rectangular rooms with furniture speckle."""
+    pv = np.zeros((height, width), np.uint8)
+    pv[20:height - 20, 20:width - 20] = 2
+    rooms = np.zeros((height, width), np.uint8)
+    names = {}
+    for i in range(cols):
+        for j in range(rows):
+            x0, x1 = 20 + i * (width - 40) // cols, 20 + (i + 1) * (width - 40) // cols
+            y0, y1 = 20 + j * (height - 40) // rows, 20 + (j + 1) * (height - 40) // rows
+            rid = 1 + i * rows + j
+            rooms[y0:y1, x0:x1] = rid << 2
+            pv[y0:y1, x0:x0 + 2] = 1
+            pv[y0:y0 + 2, x0:x1] = 1
+            names[rid] = f"Room {rid}"
+    pv[(np.arange(height)[:, None] * 7 + np.arange(width)) % 97 == 0] = 1
+    return MapData(
+        raw_pixels=_pack_2bpp(pv), width=width, height=height,
+        room_pixels=rooms.tobytes(), room_outline_width=width,
+        room_outline_height=height, room_names=names,
+    )
+
+
+def test_palette_layer_renders_indexed_png_and_patches_exactly():
+    """Palette output is a P-mode PNG on _PALETTE; a patched layer matches a fresh one."""
+    map_data = _house_map(200, 150)
+    map_data.forbidden_zones = [[(100, 100), (300, 100), (300, 300), (100, 300)]]
+    layer = MapBaseLayer(map_data, 128, palette=True)
+    assert not layer.matches(map_data, 128)
+    kw = dict(robot_pixel=(50, 50), dock_pixel=(30, 30), robot_status="charging",
+              max_px=128, palette=True)
+    img = Image.open(io.BytesIO(render_map_png(map_data, base=layer, **kw)))
+    assert img.mode == "P" and img.size == (128, 96)
+    rgb = img.convert("RGB")
+    assert {c for _, c in rgb.getcolors()} <= set(_PALETTE)
+    assert len(img.getpalette()) // 3 == len(_PALETTE)  # nothing appended
+
+    patch = MapData(raw_pixels=b"\x55" * 100, width=20, height=20, origin_x=250,
+                    origin_y=250, incremental=True)
+    layer.invalidate(apply_map_patch(map_data, patch))
+    assert render_map_png(map_data, base=layer, **kw) == render_map_png(map_data, **kw)
+
+
+def test_palette_output_is_smaller():
+    """Indexed PNG is well under the RGB one on a 900x700 map at 512 and 1024 px.
+
+    Encode times are compared by ``scripts/bench_map_palette.py``.
+    """
+    map_data = _house_map(900, 700)
+    for max_px in (512, 1024):
+        sizes = {}
+        for palette in (False, True):
+            buf = io.BytesIO()
+            img = MapBaseLayer(map_data, max_px, palette).refresh()
+            img.save(buf, format="PNG", optimize=False, compress_level=3)
+            sizes[palette] = len(buf.getvalue())
+        assert sizes[True] < sizes[False] * 0.75
+
+
 # ---------------------------------------------------------------------------
 # render_map_png
 # ---------------------------------------------------------------------------
@@ -169,6 +561,79 @@ def test_render_map_png_with_robot_and_dock():
     assert result[:4] == b"\x89PNG"
 
 
+def _reference_colors(map_data: MapData):
+    """Per-pixel colour list + centroids, as the original scalar renderer built them."""
+    width, height = map_data.width, map_data.height
+    raw, room_px = map_data.raw_pixels, map_data.room_pixels
+    res = map_data.resolution or 5
+    ro_w, ro_h = map_data.room_outline_width, map_data.room_outline_height
+    has_rooms = room_px is not None and ro_w and ro_h
+    ro_dx = round((map_data.origin_x - map_data.room_outline_origin_x) / res)
+    ro_dy = round((map_data.origin_y - map_data.room_outline_origin_y) / res)
+    colors, centroids = [], {}
+    for py in range(height):
+        for px_x in range(width):
+            i = py * width + px_x
+            pv = (raw[i >> 2] >> ((i & 3) * 2)) & 3 if (i >> 2) < len(raw) else 0
+            rx, ry = px_x - ro_dx, py - ro_dy
+            rid = sub_type = 0
+            if has_rooms and 0 <= rx < ro_w and 0 <= ry < ro_h:
+                rid, sub_type = room_px[ry * ro_w + rx] >> 2, room_px[ry * ro_w + rx] & 3
+            if rid > 0 and (sub_type == 0 or pv in (2, 3)):
+                colors.append(_ROOM_PALETTE[1 + (rid - 1) % (len(_ROOM_PALETTE) - 1)])
+            else:
+                colors.append(_PIXEL_COLORS[pv])
+            if has_rooms and map_data.room_names and rid in map_data.room_names:
+                acc = centroids.setdefault(rid, [0, 0, 0])
+                acc[0] += px_x
+                acc[1] += py
+                acc[2] += 1
+    return colors, centroids
+
+
+def _random_room_map(seed: int, dx: int, dy: int) -> MapData:
+    rng = random.Random(seed)
+    width, height, ro_w, ro_h = 37, 23, 30, 26
+    return MapData(
+        raw_pixels=bytes(rng.randrange(256) for _ in range((width * height) // 4 - 3)),
+        width=width,
+        height=height,
+        origin_x=100,
+        origin_y=-50,
+        resolution=5,
+        room_pixels=bytes(rng.choice((0, 0, 4, 5, 7, 9, 40, 41, 255)) for _ in range(ro_w * ro_h)),
+        room_outline_width=ro_w,
+        room_outline_height=ro_h,
+        room_outline_origin_x=100 - dx * 5,
+        room_outline_origin_y=-50 - dy * 5,
+        room_names={1: "Hall", 2: "Kitchen", 10: "Study", 63: "Attic"},
+    )
+
+
+@pytest.mark.parametrize("dx,dy", [(0, 0), (4, -3), (-6, 5), (40, 0)])
+def test_pixel_indices_match_scalar_renderer(dx, dy):
+    """Vectorised colouring (incl. truncated frames and mask offsets) is pixel-identical."""
+    map_data = _random_room_map(dx * 31 + dy, dx, dy)
+    indices, centroids = _pixel_indices(map_data)
+    colors, ref_centroids = _reference_colors(map_data)
+
+    assert [tuple(c) for c in _COLOR_TABLE[indices].reshape(-1, 3).tolist()] == colors
+    assert centroids == ref_centroids
+    assert list(centroids) == list(ref_centroids)  # label draw order
+
+
+def test_render_map_png_rooms_pixel_identical():
+    """Unscaled render of a room map matches the scalar colour list (Y-flipped)."""
+    map_data = _random_room_map(7, 2, 1)
+    map_data.room_names = {}
+    png = render_map_png(map_data, max_px=4000)
+    img = Image.open(io.BytesIO(png)).convert("RGB")
+    colors, _ = _reference_colors(map_data)
+    w = map_data.width
+    rows = [colors[y * w:(y + 1) * w] for y in range(map_data.height)]
+    assert list(img.getdata()) == [c for row in reversed(rows) for c in row]
+
+
 def test_render_map_png_rejects_oversized():
     """render_map_png raises ValueError for dimensions exceeding 4000x4000.
 
@@ -225,3 +690,208 @@ def test_map_description_strips_whitespace():
         6,
         "The main floor",
     )
+
+
+# ---------------------------------------------------------------------------
+# Channel table (Metadata.ChanIds) + routed channel decoders
+# ---------------------------------------------------------------------------
+
+
+def _hex(message) -> str:
+    body = message.SerializeToString()
+    return (encode_varint(len(body)) + body).hex()
+
+
+def test_channel_table_from_metadata():
+    """Metadata.ChanIds yields {channel_id: kind}, skipping unset channels."""
+    meta = stream_pb2.Metadata(
+        chan_ids={"map_info": 1, "path": 2, "dynamic_data": 6, "map_data": 9}
+    )
+    assert try_extract_channel_table(_hex(meta)) == {
+        1: "map_info", 2: "path", 6: "dynamic_data", 9: "map_data",
+    }
+
+
+@pytest.mark.parametrize(
+    "hex_data",
+    [
+        _hex(stream_pb2.Metadata(chan_ids={"map_data": 9})),  # a single channel
+        _hex(stream_pb2.Metadata(chan_ids={"path": 4, "map_data": 4})),  # duplicate ids
+        _hex(stream_pb2.Metadata(versions={"map_data": 3})),  # no chan_ids
+        _hex(stream_pb2.DynamicData(cur_pose={"x": 120, "y": -40})),
+        "zznothex",
+    ],
+)
+def test_channel_table_rejects_non_tables(hex_data):
+    """Frames that only happen to parse as Metadata are not taken as a table."""
+    assert try_extract_channel_table(hex_data) is None
+
+
+def test_map_fields_room_params():
+    """RoomParams names; unnamed rooms fall back to the scene label."""
+    params = stream_pb2.RoomParams(
+        rooms=[{"id": 1, "name": " Office "}, {"id": 2, "scene": {"type": 4}}]
+    )
+    assert try_extract_map_fields("room_params", _hex(params)) == {
+        "room_names": {1: "Office", 2: "KITCHEN"}
+    }
+
+
+def test_map_fields_restricted_zone():
+    """RestrictedZone walls and quads become MapData zone fields."""
+    quad = {"p0": {"x": 0, "y": 0}, "p1": {"x": 9, "y": 0}, "p2": {"x": 9, "y": 9}, "p3": {"x": 0, "y": 9}}
+    rz = stream_pb2.RestrictedZone(
+        virtual_walls=[{"p0": {"x": 1, "y": 2}, "p1": {"x": 3, "y": 4}}],
+        forbidden_zones=[quad],
+    )
+    assert try_extract_map_fields("restricted_zone", _hex(rz)) == {
+        "virtual_walls": [((1, 2), (3, 4))],
+        "forbidden_zones": [[(0, 0), (9, 0), (9, 9), (0, 9)]],
+        "ban_mop_zones": [],
+    }
+
+
+def test_map_fields_room_outline_decompresses():
+    """RoomOutline pixels are LZ4-decompressed when pixel_size says so."""
+    mask = bytes([4] * 40 + [8] * 40)
+    ro = stream_pb2.RoomOutline(
+        width=10, height=8, origin={"x": -5, "y": 15},
+        pixels=_lz4_compress(mask), pixel_size=len(mask),
+    )
+    assert try_extract_map_fields("room_outline", _hex(ro)) == {
+        "room_pixels": mask,
+        "room_outline_width": 10,
+        "room_outline_height": 8,
+        "room_outline_origin_x": -5,
+        "room_outline_origin_y": 15,
+    }
+
+
+def test_map_fields_unrouted_kind_or_empty():
+    """Unknown kinds and empty outlines give None."""
+    assert try_extract_map_fields("obstacle_info", _hex(stream_pb2.RoomOutline())) is None
+    assert try_extract_map_fields("room_outline", _hex(stream_pb2.RoomOutline())) is None
+
+
+def test_map_channel_decode_still_accepts_backup():
+    """backup_first=False tries plain Map first but still decodes a MapBackup."""
+    backup = stream_pb2.MapBackup(
+        map={"pixels": b"\xaa" * 4, "pixel_size": 4, "info": {"width": 4, "height": 4}},
+        room_params={"rooms": [{"id": 3, "name": "Den"}]},
+    )
+    result = try_extract_map_data(_hex(backup), backup_first=False)
+    assert result is not None
+    assert result.room_names == {3: "Den"}
+    assert try_extract_map_data(_make_map_hex(4, 4), backup_first=False).width == 4
+
+
+# ---------------------------------------------------------------------------
+# Path channel + TrailBuffer
+# ---------------------------------------------------------------------------
+
+
+def _xy(x: int, y: int) -> int:
+    return (x & 0xFFFF) | (y & 0xFFFF) << 16
+
+
+def test_path_points_decode_signed_xy():
+    """PathPoint.xy packs two signed 16-bit coordinates; flags pass through."""
+    path = clean_record_pb2.CleanRecordData.PathData(
+        points=[
+            {"xy": _xy(120, -40), "flags": PATH_SHOW_TRAJECTORY},
+            {"xy": _xy(-300, 25), "flags": PATH_SHOW_TRAJECTORY | PATH_BREAK | PATH_MOP},
+        ]
+    )
+    assert try_extract_path_points(_hex(path)) == [
+        (120, -40, PATH_SHOW_TRAJECTORY),
+        (-300, 25, PATH_SHOW_TRAJECTORY | PATH_BREAK | PATH_MOP),
+    ]
+
+
+def test_path_points_rejects_empty_and_garbage():
+    assert try_extract_path_points(_hex(clean_record_pb2.CleanRecordData.PathData())) is None
+    assert try_extract_path_points("zznothex") is None
+
+
+def test_trail_buffer_segments_split_on_break_and_type():
+    """Breaks start a new polyline; a type change continues from the last point."""
+    trail = TrailBuffer()
+    for p in [(1, 1), (2, 1), (3, 1)]:
+        trail.append(*p)
+    trail.append(9, 9, PATH_BREAK)
+    trail.append(9, 10, PATH_MOP)
+    assert trail.segments() == [
+        (0, [(1, 1), (2, 1), (3, 1)]),
+        (0, [(9, 9)]),
+        (PATH_MOP, [(9, 9), (9, 10)]),
+    ]
+    assert trail.last() == (9, 10)
+
+
+def test_trail_buffer_round_trip_and_legacy_pairs():
+    trail = TrailBuffer()
+    trail.append(4000, 3000, PATH_MOP)
+    trail.append(5, 6, PATH_BREAK)
+    restored = TrailBuffer.from_list(trail.to_list())
+    assert restored.to_list() == trail.to_list() == [
+        [4000, 3000, PATH_MOP | PATH_BREAK], [5, 6, PATH_BREAK],
+    ]
+    assert TrailBuffer.from_list([[1, 2], [3, 4]]).segments() == [(0, [(1, 2), (3, 4)])]
+
+
+def test_trail_buffer_drops_oldest_half_when_full():
+    trail = TrailBuffer(max_points=10)
+    for i in range(11):
+        trail.append(i, 0)
+    assert len(trail) == 6
+    assert trail.segments() == [(0, [(i, 0) for i in range(5, 11)])]
+
+
+def test_render_trail_honours_breaks_and_colors():
+    """Broken segments are not joined and mop segments use the mop colour."""
+    map_data = MapData(raw_pixels=b"\xaa" * 100, width=20, height=20, resolution=5)
+    trail = TrailBuffer()
+    trail.append(2, 2)
+    trail.append(6, 2)
+    trail.append(14, 2, PATH_BREAK | PATH_MOP)
+    trail.append(18, 2, PATH_MOP)
+    img = Image.open(io.BytesIO(render_map_png(map_data, robot_trail=trail, max_px=20)))
+    img = img.convert("RGB")
+    row = 19 - 2  # render flips Y
+    assert img.getpixel((4, row)) == _TRAIL_COLORS[0]
+    assert img.getpixel((10, row)) == _PIXEL_COLORS[2]
+    assert img.getpixel((16, row)) == _TRAIL_COLORS[PATH_MOP]
+
+
+# ---------------------------------------------------------------------------
+# decode_biz_frame
+# ---------------------------------------------------------------------------
+
+
+def _payload(channel_id: int, message) -> bytes:
+    return _biz_payload(channel_id, _hex(message))
+
+
+def test_decode_biz_frame_routes_by_channel_table():
+    channels = {4: "room_params", 6: "dynamic_data", 9: "map_data"}
+    pose = decode_biz_frame(_payload(6, stream_pb2.DynamicData(cur_pose={"x": 5, "y": 7})), channels)
+    assert (pose.kind, pose.value[:2], pose.fingerprint) == ("dynamic_data", (5, 7), None)
+
+    names = decode_biz_frame(_payload(4, stream_pb2.RoomParams(rooms=[{"id": 1, "name": "Hall"}])), channels)
+    assert names.kind == "room_params"
+    assert names.value == {"room_names": {1: "Hall"}}
+    assert names.fingerprint is not None
+
+
+def test_decode_biz_frame_learns_table_and_skips_repeats():
+    table = decode_biz_frame(
+        _payload(0, stream_pb2.Metadata(chan_ids={"path": 2, "map_data": 9})), {}
+    )
+    assert (table.kind, table.value) == ("channels", {2: "path", 9: "map_data"})
+
+    payload = _payload(9, stream_pb2.Map(pixels=b"\xaa" * 64, pixel_size=64, info={"width": 16, "height": 16}))
+    frame = decode_biz_frame(payload, table.value)
+    assert frame.kind == "map"
+    assert frame.value.width == 16
+    repeat = decode_biz_frame(payload, table.value, fingerprints={"map": frame.fingerprint})
+    assert (repeat.kind, repeat.value) == ("repeat", "map")
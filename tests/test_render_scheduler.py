@@ -0,0 +1,108 @@
+"""Tests for the per-device map render scheduler."""
+
+import asyncio
+import threading
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.robovac_mqtt.render_scheduler import RenderScheduler
+
+
+class _Recorder:
+    """Snapshot/result callbacks that record what the scheduler did."""
+
+    def __init__(self, render_time: float = 0.0) -> None:
+        self.state = 0
+        self.render_time = render_time
+        self.starts: list[float] = []
+        self.threads: list[str] = []
+        self.results: list[bytes] = []
+        self.done = asyncio.Event()
+
+    def snapshot(self):
+        state = self.state
+
+        def _job() -> bytes:
+            self.starts.append(time.monotonic())
+            self.threads.append(threading.current_thread().name)
+            time.sleep(self.render_time)
+            return str(state).encode()
+
+        return _job
+
+    def on_result(self, png: bytes) -> None:
+        self.results.append(png)
+        self.done.set()
+
+
+async def _settle(scheduler: RenderScheduler) -> None:
+    while scheduler.busy:
+        await asyncio.sleep(0.01)
+
+
+async def test_burst_collapses_into_one_trailing_render(hass: HomeAssistant):
+    """Requests made during a render produce one more render of the latest state."""
+    rec = _Recorder(render_time=0.05)
+    scheduler = RenderScheduler(hass, "test_map", rec.snapshot, rec.on_result, max_fps=0)
+    scheduler.request()
+    await asyncio.sleep(0.01)  # first render is now in flight
+    for i in range(1, 6):
+        rec.state = i
+        scheduler.request()
+    await _settle(scheduler)
+
+    assert rec.results == [b"0", b"5"]
+    assert scheduler.renders == 2
+    assert scheduler.requests == 6
+    assert all(name.startswith("test_map") for name in rec.threads)
+    scheduler.shutdown()
+
+
+async def test_frame_rate_cap_spaces_render_starts(hass: HomeAssistant):
+    """A trailing render waits until 1/max_fps after the previous start."""
+    rec = _Recorder()
+    scheduler = RenderScheduler(hass, "test_map", rec.snapshot, rec.on_result, max_fps=10)
+    scheduler.request()
+    await rec.done.wait()
+    scheduler.request()
+    await _settle(scheduler)
+
+    assert len(rec.starts) == 2
+    assert rec.starts[1] - rec.starts[0] >= 0.099
+    scheduler.shutdown()
+
+
+async def test_failed_render_and_skipped_snapshot_keep_serving(hass: HomeAssistant):
+    """A render error is logged and a None snapshot is skipped; later requests run."""
+    rec = _Recorder()
+    jobs = iter([None, lambda: 1 / 0, rec.snapshot()])
+    scheduler = RenderScheduler(hass, "test_map", lambda: next(jobs), rec.on_result, max_fps=0)
+    for _ in range(3):
+        scheduler.request()
+        await _settle(scheduler)
+
+    assert rec.results == [b"0"]
+    assert scheduler.renders == 2
+    scheduler.shutdown()
+    assert not scheduler.busy
+
+
+async def test_coroutine_job_is_awaited_on_the_loop(hass: HomeAssistant):
+    """A coroutine job (worker-process render) is awaited, not run on the thread."""
+    rec = _Recorder()
+
+    def snapshot():
+        async def _job() -> bytes:
+            rec.threads.append(threading.current_thread().name)
+            return b"remote"
+
+        return _job
+
+    scheduler = RenderScheduler(hass, "test_map", snapshot, rec.on_result, max_fps=0)
+    scheduler.request()
+    await _settle(scheduler)
+
+    assert rec.results == [b"remote"]
+    assert rec.threads == [threading.main_thread().name]
+    scheduler.shutdown()
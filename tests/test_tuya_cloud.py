@@ -497,3 +497,29 @@ def test_encrypt_password_matches_upstream_js(case):
         f"encrypt_password mismatch for {case['name']}: "
         f"Python={result}, JS={case['expected_hex']}"
     )
+
+
+@pytest.mark.asyncio
+async def test_get_device_list_caches_group_ids():
+    """The group (home) list is fetched once; later listings only request the
+    group and shared device lists."""
+    client = TuyaCloudClient("EU", websession=MagicMock())
+    client.sid = "test_sid"
+    results = {
+        "tuya.m.location.list": [{"groupId": "g1"}, {"groupId": "g2"}],
+        "tuya.m.my.group.device.list": [{"devId": "dev1"}],
+        "tuya.m.my.shared.device.list": [{"devId": "dev2"}],
+    }
+
+    async def request(action, **kwargs):
+        return results[action]
+
+    with patch.object(client, "request", side_effect=request) as mock_req:
+        first = await client.get_device_list()
+        second = await client.get_device_list()
+
+    assert first == second == [{"devId": "dev1"}, {"devId": "dev2"}]
+    actions = [c.args[0] for c in mock_req.call_args_list]
+    assert actions.count("tuya.m.location.list") == 1
+    assert actions.count("tuya.m.my.group.device.list") == 2  # first group only
+    assert mock_req.call_args_list[1].kwargs == {"gid": "g1"}